@@ -0,0 +1,102 @@
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tomllib
+from importlib import metadata
+
+import pytest
+
+from agent_test.src.agent_utils.discovery_index import default_cache_dir
+
+BENCHMARK_ENV = "AGENT_TEST_BENCHMARK"
+OUTPUT_ENV = "AGENT_TEST_BENCHMARK_OUTPUT"
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: framework overhead benchmark (set AGENT_TEST_BENCHMARK=1 to run)")
+
+
+def pytest_collection_modifyitems(config, items):
+    # Benchmarks only run in isolation, so timing never slows down or skews the regular suite
+    if os.environ.get(BENCHMARK_ENV, "").lower() in ("1", "true", "yes"):
+        return
+    skip = pytest.mark.skip(reason=f"benchmarks run with {BENCHMARK_ENV}=1")
+    for item in items:
+        if "benchmarks" in item.nodeid.split("/"):
+            item.add_marker(skip)
+
+
+def _version():
+    try:
+        return metadata.version("agentic-testing")
+    except metadata.PackageNotFoundError:
+        pass
+    # Running from a source checkout: read the version the checkout would build
+    pyproject = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, "pyproject.toml")
+    try:
+        with open(pyproject, "rb") as f:
+            return tomllib.load(f)["project"]["version"]
+    except (OSError, KeyError, tomllib.TOMLDecodeError):
+        return "unknown"
+
+
+class BenchmarkRecorder:
+    """Times benchmark bodies and collects the results written at the end of the session."""
+
+    def __init__(self):
+        self.results = []
+
+    def run(self, name, func, rounds=5, warmup=1, setup=None, operations=1, **params):
+        """
+        Times func over rounds (after warmup untimed calls). setup, if given, runs untimed
+        before each call and its return value is passed to func. operations is the number
+        of units of work per call, used to report throughput.
+        """
+        for _ in range(warmup):
+            func(setup()) if setup else func()
+        timings = []
+        for _ in range(rounds):
+            arg = setup() if setup else None
+            start = time.perf_counter()
+            func(arg) if setup else func()
+            timings.append(time.perf_counter() - start)
+        result = {
+            "name": name,
+            "params": params,
+            "rounds": rounds,
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "mean": statistics.mean(timings),
+            "max": max(timings),
+            "ops_per_sec": operations / statistics.median(timings) if statistics.median(timings) else None,
+        }
+        self.results.append(result)
+        return result
+
+
+_recorder = BenchmarkRecorder()
+
+
+@pytest.fixture
+def benchmark():
+    return _recorder
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _recorder.results:
+        return
+    version = _version()
+    path = os.environ.get(OUTPUT_ENV) or os.path.join(default_cache_dir(), "benchmarks", f"results-{version}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": version,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "results": _recorder.results,
+        }, f, indent=2)
+    session.config.get_terminal_writer().line(f"benchmark results written to {path}")
@@ -0,0 +1,116 @@
+import copy
+import sys
+import uuid
+import pytest
+from agent_test.src.agent_utils.models.global_metadata import GlobalMetadata
+from agent_test.src.agent_utils.models.api_mock_type import APIMockType
+from agent_test.src.fixture.cassette import CassettePlayer, CassetteWriter, load_cassette
+from agent_test.src.fixture.fixture_class import FixtureLibrary
+from agent_test.src.fixture.state_diff import mismatch_report
+from agent_test.src.fixture.state_snapshot import Snapshotter
+
+@pytest.fixture
+def write_package(tmp_path, monkeypatch):
+    """Writes generated bench_pkg_* packages under tmp_path, importable for the test only."""
+    names = []
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    def write(n_modules, agents_per_module=1):
+        names.append(_write_package(tmp_path, n_modules, agents_per_module))
+        return names[-1]
+    yield write
+    for modname in [m for m in sys.modules if m.split(".", 1)[0] in names]:
+        del sys.modules[modname]
+
+def _write_package(root, n_modules, agents_per_module=1):
+    name = f"bench_pkg_{n_modules}_{uuid.uuid4().hex[:8]}"
+    package = root / name
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    for i in range(n_modules):
+        # RunnableLambda rather than RemoteRunnable: building an HTTP client per agent would dominate the timings
+        lines = ["from langchain_core.runnables import RunnableLambda"]
+        lines += [f"agent_{i}_{j} = RunnableLambda(lambda state: state)" for j in range(agents_per_module)]
+        (package / f"module_{i}.py").write_text("\n".join(lines) + "\n")
+    return name
+
+@pytest.mark.parametrize("mode", ["import", "static", "index"])
+@pytest.mark.parametrize("n_modules", [10, 100, 1000])
+def test_bench_fixture_construction(benchmark, tmp_path, monkeypatch, write_package, n_modules, mode):
+    monkeypatch.setenv("AGENT_TEST_CACHE_DIR", str(tmp_path / "cache"))
+    package = write_package(n_modules)
+    options = dict(share_discovery=False, static=mode == "static", use_index=mode == "index")
+    fixture = FixtureLibrary(root_path=package, **options)
+    assert len(fixture.agent_info_dict) == n_modules
+    benchmark.run("fixture_construction", lambda: FixtureLibrary(root_path=package, **options),
+                  rounds=3, n_modules=n_modules, mode=mode)
+    benchmark.run("fixture_construction_shared", lambda: FixtureLibrary(root_path=package),
+                  rounds=20, n_modules=n_modules, mode=mode)
+
+@pytest.mark.parametrize("n_agents", [10, 100])
+def test_bench_patch_start_stop(benchmark, write_package, n_agents):
+    package = write_package(1, agents_per_module=n_agents)
+    fixture = FixtureLibrary(root_path=package)
+    for agent_name in fixture.agent_info_dict:
+        fixture.mock_agent_response(agent_name, {"messages": []})
+
+    def start_stop():
+        with fixture:
+            pass
+    benchmark.run("patch_start_stop", start_stop, rounds=20, operations=n_agents * 3, n_agents=n_agents)
+
+@pytest.mark.parametrize("n_calls", [100, 10000])
+def test_bench_was_agent_method_called(benchmark, write_package, n_calls):
+    package = write_package(1)
+    fixture = FixtureLibrary(root_path=package).mock_agent_response("agent_0_0", {"messages": []})
+    module = sys.modules.get(f"{package}.module_0") or __import__(f"{package}.module_0", fromlist=["agent_0_0"])
+    with fixture:
+        for i in range(n_calls):
+            module.agent_0_0.invoke({"messages": [{"role": "user", "content": f"m{i}"}]})
+    state = {"messages": [{"role": "user", "content": f"m{n_calls - 1}"}]}
+    benchmark.run("was_agent_method_called", lambda: fixture.was_agent_method_called("agent_0_0", "invoke", 1, state),
+                  rounds=50, n_calls=n_calls)
+
+def test_bench_identify_patcher_type(benchmark):
+    def cold():
+        GlobalMetadata._api_patcher_registry = {}
+        GlobalMetadata.identify_patcher_type(APIMockType.HTTPX)
+    benchmark.run("identify_patcher_type", cold, rounds=10, state="cold")
+    benchmark.run("identify_patcher_type", lambda: GlobalMetadata.identify_patcher_type(APIMockType.HTTPX),
+                  rounds=1000, state="warm")
+
+def test_bench_cassette_replay(benchmark, tmp_path):
+    path = str(tmp_path / "bench.cassette")
+    writer = CassetteWriter(path)
+    for i in range(10000):
+        writer.record("agent1", "invoke", {"messages": [{"role": "user", "content": f"m{i}"}]}, {"messages": [{"n": i}]})
+    writer.close()
+    player = CassettePlayer(load_cassette(path))
+    request = {"messages": [{"role": "user", "content": "m9999"}]}
+    benchmark.run("cassette_replay", lambda: player.response("agent1", "invoke", request), rounds=1000, records=10000)
+
+@pytest.mark.parametrize("history", [100, 10000])
+def test_bench_call_snapshot(benchmark, history):
+    state = {"messages": [{"role": "user", "content": f"m{i}", "meta": {"n": i}} for i in range(history)]}
+    snapshotter = Snapshotter()
+
+    def grow_and_snapshot():
+        state["messages"].append({"role": "agent", "content": "reply"})
+        snapshotter.snapshot(state)
+    benchmark.run("call_snapshot", grow_and_snapshot, rounds=20, history=history, mode="snapshot")
+    benchmark.run("call_snapshot", lambda: copy.deepcopy(state), rounds=20, history=history, mode="deepcopy")
+
+@pytest.mark.parametrize("history", [100, 10000])
+def test_bench_mismatch_report(benchmark, history):
+    snapshotter = Snapshotter()
+    state = {"messages": []}
+    recorded = []
+    for i in range(history):
+        state["messages"].append({"role": "user", "content": f"m{i}"})
+        if i % (history // 10) == 0:
+            recorded.append(snapshotter.snapshot(state))
+    expected = {"messages": [dict(message) for message in state["messages"]]}
+    expected["messages"][history // 2]["content"] = "changed"
+    recorded.append(snapshotter.snapshot(state))
+    benchmark.run("mismatch_report", lambda: mismatch_report(expected, recorded), rounds=10,
+                  history=history, calls=len(recorded))
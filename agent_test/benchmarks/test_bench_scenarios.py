@@ -0,0 +1,45 @@
+import asyncio
+from agent_test.src.agent_utils.models.api_mock_type import APIMockType
+from agent_test.src.fixture.concurrent_runner import ainvoke_concurrently
+from agent_test.src.fixture.fixture_class import FixtureLibrary
+from agent_test.src.fixture.patch_session import PatchSession
+
+N_SCENARIOS = 50
+
+def _scenario(root_path, session):
+    return (
+        FixtureLibrary(root_path=root_path, patch_session=session)
+        .mock_api_call("httpx.post", {"url": "http://127.0.0.1:8004/api1/getdata1"}, {"content": "hello"}, APIMockType.HTTPX)
+        .when_input_state({"messages": [{"role": "user", "content": "hello"}]})
+        .mock_agent_response("agent1", {"messages": [{"role": "agent1", "content": "response1"}]})
+        .mock_agent_response("agent2", {"messages": [{"role": "agent2", "content": "response2"}]})
+        .mock_agent_response("agent3", {"messages": [{"role": "agent3", "content": "response3"}]})
+    )
+
+def test_bench_sync_graph_scenarios(benchmark):
+    from examples.langgraph.simple_graph.synchronous.orchestrator_code import orchestrator_graph
+    root_path = "examples.langgraph.simple_graph.synchronous"
+    session = PatchSession()
+
+    def run():
+        for _ in range(N_SCENARIOS):
+            _scenario(root_path, session).invoke_graph(orchestrator_graph)
+    try:
+        benchmark.run("scenario_throughput", run, rounds=3, operations=N_SCENARIOS, orchestrator="simple_graph.synchronous")
+    finally:
+        session.close()
+
+def test_bench_async_graph_scenarios(benchmark):
+    from examples.langgraph.simple_graph.asynchronous.orchestrator_code import builder, build_orchestrator_graph
+    root_path = "examples.langgraph.simple_graph.asynchronous"
+    graph = build_orchestrator_graph(builder)
+    session = PatchSession()
+
+    def run():
+        fixtures = [_scenario(root_path, session) for _ in range(N_SCENARIOS)]
+        asyncio.run(ainvoke_concurrently(fixtures, graph, max_concurrency=10))
+    try:
+        benchmark.run("scenario_throughput", run, rounds=3, operations=N_SCENARIOS,
+                      orchestrator="simple_graph.asynchronous", concurrency=10)
+    finally:
+        session.close()
@@ -0,0 +1,236 @@
+import ast
+import hashlib
+import json
+import os
+
+from agent_test.src.agent_utils.models.agent_info import AgentInfo
+
+INDEX_VERSION = 2
+DEFAULT_CACHE_DIR = ".agent_test_cache"
+INDEX_FILE_NAME = "discovery_index.json"
+
+
+def default_cache_dir():
+    """
+    Returns the project cache dir, .agent_test_cache under the working directory.
+    It can be overridden with the AGENT_TEST_CACHE_DIR environment variable.
+    """
+    return os.environ.get("AGENT_TEST_CACHE_DIR") or os.path.join(os.getcwd(), DEFAULT_CACHE_DIR)
+
+
+def default_index_path():
+    """Returns the index file path under the project cache dir."""
+    return os.path.join(default_cache_dir(), INDEX_FILE_NAME)
+
+
+def _file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _imports_any(tree, names):
+    """
+    True if the parsed source binds one of names through an import statement, or has a
+    star import. Such members are defined in another module.
+    """
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name == "*" or (alias.asname or alias.name.split(".", 1)[0]) in names:
+                    return True
+    return False
+
+
+def _package_root(modname, source_path):
+    """The sys.path entry modname was found under, derived from its source path."""
+    depth = modname.count(".") + (os.path.basename(source_path) == "__init__.py")
+    root = os.path.dirname(os.path.abspath(source_path))
+    for _ in range(depth):
+        root = os.path.dirname(root)
+    return root
+
+
+def _module_file(root, modname):
+    base = os.path.join(root, *modname.split("."))
+    for candidate in (base + ".py", os.path.join(base, "__init__.py")):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def _imported_modules(modname, source_path, tree):
+    """Names of the modules (and their parent packages) imported by the parsed source."""
+    package = modname if os.path.basename(source_path) == "__init__.py" else modname.rpartition(".")[0]
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            targets = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            parts = package.split(".") if package else []
+            if node.level > 1:
+                parts = parts[:len(parts) - node.level + 1]
+            base = ".".join(parts) if node.level else ""
+            if node.module:
+                base = f"{base}.{node.module}" if base else node.module
+            if not base:
+                continue
+            targets = [base] + [f"{base}.{alias.name}" for alias in node.names if alias.name != "*"]
+        else:
+            continue
+        for target in targets:
+            pieces = target.split(".")
+            names.update(".".join(pieces[:i]) for i in range(1, len(pieces) + 1))
+    return names
+
+
+def _stamp(path, digest=None):
+    stat = os.stat(path)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest or _file_digest(path)}
+
+
+def _local_dependencies(modname, source_path, tree):
+    """
+    {path: stamp} for every module under the same root that the source imports,
+    directly or through other local modules. Members such as make_agent(...) or
+    RemoteRunnable(config.URL) depend on those files as much as on the source itself.
+    """
+    root = _package_root(modname, source_path)
+    source_path = os.path.abspath(source_path)
+    dependencies = {}
+    pending = [(modname, source_path, tree)]
+    while pending:
+        current, path, current_tree = pending.pop()
+        for name in _imported_modules(current, path, current_tree):
+            dependency = _module_file(root, name)
+            if dependency is None or dependency == source_path or dependency in dependencies:
+                continue
+            with open(dependency, "rb") as f:
+                data = f.read()
+            dependencies[dependency] = _stamp(dependency, hashlib.sha256(data).hexdigest())
+            try:
+                pending.append((name, dependency, ast.parse(data)))
+            except (SyntaxError, ValueError):
+                pass
+    return dependencies
+
+
+class DiscoveryIndex:
+    """
+    Persistent per-module cache of discovered agents and tools.
+    Entries are keyed by module name and validated against the source file's
+    path, mtime and size, falling back to a content hash when only the mtime moved.
+    The local modules a source imports are stamped in its entry and validated the same way.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_index_path()
+        self._entries = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == INDEX_VERSION:
+            self._entries = data.get("modules", {})
+
+    def lookup(self, modname, source_path, mode="import"):
+        """
+        Returns (agents, tools) lists of AgentInfo for modname if the cached entry
+        is still valid for source_path, else None. Entries produced by import-based
+        discovery are valid for every mode; static entries only for static lookups.
+        """
+        entry = self._entries.get(modname)
+        if entry is None or source_path is None or entry.get("source_path") != source_path:
+            return None
+        if entry.get("mode", "import") not in ("import", mode):
+            return None
+        try:
+            stat = os.stat(source_path)
+        except OSError:
+            return None
+        if not self._still_valid(entry, source_path, stat):
+            return None
+        for path, stamp in entry.get("dependencies", {}).items():
+            try:
+                if not self._still_valid(stamp, path, os.stat(path)):
+                    return None
+            except OSError:
+                return None
+        return (
+            [AgentInfo(**info) for info in entry.get("agents", [])],
+            [AgentInfo(**info) for info in entry.get("tools", [])],
+        )
+
+    def _still_valid(self, stamp, path, stat):
+        if stamp.get("mtime_ns") != stat.st_mtime_ns or stamp.get("size") != stat.st_size:
+            if stamp.get("sha256") != _file_digest(path):
+                return False
+            # Content unchanged (e.g. touched or checked out again): refresh the stamp.
+            stamp["mtime_ns"] = stat.st_mtime_ns
+            stamp["size"] = stat.st_size
+            self._dirty = True
+        return True
+
+    def store(self, modname, source_path, agents, tools, mode="import"):
+        """
+        Records the scan result of modname, stamped with its current source state and
+        that of the local modules it imports. Results holding members the module imports
+        from elsewhere (re-exports) are not kept: the defining module may not be local.
+        """
+        if source_path is None:
+            return
+        try:
+            stat = os.stat(source_path)
+            with open(source_path, "rb") as f:
+                source = f.read()
+        except OSError:
+            return
+        try:
+            tree = ast.parse(source)
+            reexports = _imports_any(tree, {info.agent_name for info in list(agents) + list(tools)})
+            dependencies = None if reexports else _local_dependencies(modname, source_path, tree)
+        except (SyntaxError, ValueError, OSError):
+            dependencies = None
+        if dependencies is None:
+            if self._entries.pop(modname, None) is not None:
+                self._dirty = True
+            return
+        self._entries[modname] = {
+            "source_path": source_path,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": hashlib.sha256(source).hexdigest(),
+            "mode": mode,
+            "dependencies": dependencies,
+            "agents": [info.model_dump() for info in agents],
+            "tools": [info.model_dump() for info in tools],
+        }
+        self._dirty = True
+
+    def prune(self, package_name, seen_modules):
+        """Drops entries under package_name that no longer exist on disk."""
+        prefix = package_name + "."
+        for modname in [m for m in self._entries if m.startswith(prefix) and m not in seen_modules]:
+            del self._entries[modname]
+            self._dirty = True
+
+    def save(self):
+        """Writes the index atomically if anything changed. Failures are non-fatal."""
+        if not self._dirty:
+            return
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "modules": self._entries}, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,67 @@
+from types import MappingProxyType
+
+from agent_test.src.agent_utils.models.agent_info import AgentInfo
+
+
+class DiscoveryRegistry:
+    """
+    Result of a single discovery pass over a package: agents and tools by name,
+    plus indexes by agent_type and by module.
+    """
+
+    def __init__(self, package_name: str):
+        self.package_name = package_name
+        self.agents: dict[str, AgentInfo] = {}
+        self.tools: dict[str, AgentInfo] = {}
+        self._modules: dict[str, list[AgentInfo]] = {}
+        self._types = None
+        self.frozen = False
+        # False when the discovery pass stopped early; the registry then misses modules
+        self.complete = True
+
+    def add_module(self, modname: str, agents: list[AgentInfo], tools: list[AgentInfo]):
+        """Registers the members found in modname. Later modules win on name clashes, as before."""
+        if self.frozen:
+            raise RuntimeError(f"DiscoveryRegistry for '{self.package_name}' is frozen.")
+        for info in agents:
+            self.agents[info.agent_name] = info
+        for info in tools:
+            self.tools[info.agent_name] = info
+        self._modules[modname] = list(agents) + list(tools)
+        self._types = None
+
+    def get_agent(self, agent_name: str):
+        return self.agents.get(agent_name)
+
+    def get_tool(self, tool_name: str):
+        return self.tools.get(tool_name)
+
+    def by_type(self, agent_type: str) -> list[AgentInfo]:
+        """Returns the registered agents/tools whose agent_type matches (tools use 'tool')."""
+        if self._types is None:
+            types = {}
+            for info in list(self.agents.values()) + list(self.tools.values()):
+                types.setdefault(info.agent_type, []).append(info)
+            self._types = types
+        return list(self._types.get(agent_type, []))
+
+    def by_module(self, modname: str) -> list[AgentInfo]:
+        """Returns every agent and tool found in modname."""
+        return list(self._modules.get(modname, []))
+
+    def freeze(self):
+        """
+        Makes the registry read-only so it can be shared between FixtureLibrary instances.
+        agents and tools become read-only mappings. Returns self.
+        """
+        if not self.frozen:
+            self.agents = MappingProxyType(self.agents)
+            self.tools = MappingProxyType(self.tools)
+            self.by_type("")  # build the type index before sharing
+            self.frozen = True
+        return self
+
+    @property
+    def modules(self) -> list[str]:
+        """Scanned module names, in discovery order."""
+        return list(self._modules)
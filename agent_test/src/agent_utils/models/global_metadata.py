@@ -1,11 +1,45 @@
 
 from abc import abstractmethod
+import threading
 
 from agent_test.src.agent_utils.models.api_mock_type import APIMockType
+from agent_test.src.common.agent_test_logger import AgentTestLogger
 
 
 class GlobalMetadata:
     _api_patcher_registry = {}
+    _discovery_registry = {}
+    _discovery_lock = threading.Lock()
+
+    @classmethod
+    def get_discovery(cls, root_path: str, use_index: bool = None, static: bool = None, workers: int = None):
+        """
+        Returns the process-wide, frozen DiscoveryRegistry for root_path and the discovery
+        options (use_index, static, workers), running discovery on first use. A registry
+        whose discovery failed is returned but not kept, so the next use retries.
+        """
+        from agent_test.src.agent_utils.remoterunnable_utils import discover_package, resolve_discovery_options
+        key = (root_path, *resolve_discovery_options(use_index, static, workers))
+        registry = cls._discovery_registry.get(key)
+        if registry is not None:
+            return registry
+        with cls._discovery_lock:
+            registry = cls._discovery_registry.get(key)
+            if registry is None:
+                registry = discover_package(root_path, use_index, static, workers).freeze()
+                if registry.complete:
+                    cls._discovery_registry[key] = registry
+        return registry
+
+    @classmethod
+    def clear_discovery(cls, root_path: str = None):
+        """Drops the shared registries for root_path, or all of them, so the next use rediscovers."""
+        with cls._discovery_lock:
+            if root_path is None:
+                cls._discovery_registry.clear()
+            else:
+                for key in [key for key in cls._discovery_registry if key[0] == root_path]:
+                    del cls._discovery_registry[key]
 
     @classmethod
     def identify_patcher_type(cls, api_type: APIMockType = APIMockType.REQUESTS):
@@ -31,7 +65,7 @@ class GlobalMetadata:
                 try:
                     importlib.import_module(module_name)
                 except Exception as e:
-                    print(f"GlobalMetadata: Failed to import {module_name}: {e}")
+                    AgentTestLogger.get_logger().warning("GlobalMetadata: Failed to import %s: %s", module_name, e)
 
         # print("GlobalMetadata: Building API patcher registry...")
         # print("GlobalMetadata: Found subclasses of BaseAPIMock:", BaseAPIMock.__subclasses__())
@@ -1,72 +1,230 @@
-from langchain.tools import tool as tool_decorator
 import inspect
 import pkgutil
 import importlib
-import inspect
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor
 from langserve import RemoteRunnable
 from langchain_core.runnables import Runnable, RunnableLambda
+from langchain_core.tools import BaseTool
 from mcp import Tool
 from agent_test.src.agent_utils.models.agent_info import AgentInfo
+from agent_test.src.agent_utils.models.discovery_registry import DiscoveryRegistry
+from agent_test.src.agent_utils.discovery_index import DiscoveryIndex
+from agent_test.src.agent_utils.static_discovery import scan_file
+from agent_test.src.common.agent_test_logger import AgentTestLogger, debug_event
+from agent_test.src.common.workers import resolve_workers
+
+logger = AgentTestLogger.get_logger()
 
 # List of supported runnable types
 RUNNABLE_TYPES = [RemoteRunnable, Runnable, RunnableLambda]
-TOOL_TYPES = [Tool, tool_decorator]
+# BaseTool is what the langchain @tool decorator produces
+TOOL_TYPES = [Tool, BaseTool]
+
+
+def _flag_enabled(value, env_var):
+    """Resolves an optional discovery flag, defaulting to the given environment variable."""
+    if value is None:
+        return os.environ.get(env_var, "").lower() in ("1", "true", "yes")
+    return bool(value)
 
-def find_all_tools(package_name):
+
+def _iter_package_modules(paths, package_name):
     """
-    Scans the given package and returns a dict of tool_name to AgentInfo
-    for all @tool-decorated functions found in the package and its submodules.
+    Yields (modname, source_path) for every submodule of the package, depth first,
+    in the same order as pkgutil.walk_packages but without importing the submodules.
     """
-    tools = {}
-    try:
-        package = importlib.import_module(package_name)
-    except Exception as e:
-        print(f"find_all_tools: Could not import package '{package_name}': {e}")
-        return tools
-    for _, modname, _ in pkgutil.walk_packages(package.__path__, package.__name__ + "."):
+    seen = set()
+
+    def walk(paths, prefix):
+        for module_info in pkgutil.iter_modules(paths, prefix):
+            if module_info.name in seen:
+                continue
+            seen.add(module_info.name)
+            try:
+                spec = module_info.module_finder.find_spec(module_info.name)
+            except Exception:
+                spec = None
+            source_path = spec.origin if spec is not None and spec.has_location else None
+            yield module_info.name, source_path
+            if module_info.ispkg and spec is not None and spec.submodule_search_locations:
+                yield from walk(spec.submodule_search_locations, module_info.name + ".")
+
+    yield from walk(paths, package_name + ".")
+
+
+def _scan_module(modname):
+    """
+    Imports modname and returns (agents, tools) lists of AgentInfo for its members.
+    Each member is classified against RUNNABLE_TYPES and TOOL_TYPES in the same pass.
+    """
+    module = importlib.import_module(modname)
+    agents = []
+    tools = []
+    for name, obj in inspect.getmembers(module):
+        if isinstance(obj, tuple(RUNNABLE_TYPES)):
+            agents.append(AgentInfo(
+                agent_name=name,
+                agent_path=f"{modname}.{name}",
+                agent_type=type(obj).__name__,
+                agent_module_path=modname
+            ))
+        if isinstance(obj, tuple(TOOL_TYPES)):
+            tools.append(AgentInfo(
+                agent_name=name,
+                agent_path=f"{modname}.{name}",
+                agent_type="tool",
+                agent_module_path=modname
+            ))
+    return agents, tools
+
+
+def _package_paths(package_name, static):
+    """
+    Returns the submodule search locations of package_name. Static discovery only
+    resolves the spec so that the package itself is not imported.
+    """
+    if static:
+        spec = importlib.util.find_spec(package_name)
+        if spec is None or spec.submodule_search_locations is None:
+            raise ImportError(f"No package named '{package_name}'")
+        return list(spec.submodule_search_locations)
+    return importlib.import_module(package_name).__path__
+
+
+def _resolve_workers(workers):
+    """Resolves the discovery worker count, defaulting to AGENT_TEST_DISCOVERY_WORKERS (serial if unset)."""
+    return resolve_workers(workers, "AGENT_TEST_DISCOVERY_WORKERS", default=0)
+
+
+def _scan_module_chunk(modnames):
+    """
+    Process-pool worker: imports each module of the shard and returns picklable
+    (modname, agents, tools) records, with None in place of modules that failed to import.
+    """
+    records = []
+    for modname in modnames:
         try:
-            module = importlib.import_module(modname)
-            for name, obj in inspect.getmembers(module):
-                # Check for langchain.tools.tool-decorated functions
-                if isinstance(obj, tuple(TOOL_TYPES)):
-                    info = AgentInfo(
-                        agent_name=name,
-                        agent_path=f"{modname}.{name}",
-                        agent_type="tool",
-                        agent_module_path=modname
-                    )
-                    tools[name] = info
+            agents, tools = _scan_module(modname)
         except Exception:
-            pass
-    print(f"find_all_tools: Found tools: {tools}")
+            records.append((modname, None, None))
+            continue
+        records.append((
+            modname,
+            [info.model_dump() for info in agents],
+            [info.model_dump() for info in tools],
+        ))
+    return records
+
+
+def _scan_modules_parallel(modnames, workers):
+    """
+    Shards modnames into contiguous chunks, scans them across a process pool and
+    returns {modname: (agents, tools)} for the modules that imported cleanly.
+    """
+    # Several chunks per worker keep the pool busy when import times are uneven.
+    chunk_size = max(1, -(-len(modnames) // (workers * 4)))
+    chunks = [modnames[i:i + chunk_size] for i in range(0, len(modnames), chunk_size)]
+    results = {}
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        for records in executor.map(_scan_module_chunk, chunks):
+            for modname, agents, tools in records:
+                if agents is not None:
+                    results[modname] = (
+                        [AgentInfo(**info) for info in agents],
+                        [AgentInfo(**info) for info in tools],
+                    )
+    return results
+
+
+def _scan_package(package_name, use_index=None, static=None, workers=None):
+    """
+    Yields (modname, agents, tools) per submodule of package_name. When the discovery index is
+    enabled, modules whose source did not change are served from the on-disk index.
+    In static mode modules are classified from their AST and only imported when that is ambiguous.
+    With workers > 1 the modules left to import are scanned in a process pool; results are
+    always yielded in walk order.
+    """
+    static = _flag_enabled(static, "AGENT_TEST_STATIC_DISCOVERY")
+    workers = _resolve_workers(workers)
+    mode = "static" if static else "import"
+    paths = _package_paths(package_name, static)
+    index = DiscoveryIndex() if _flag_enabled(use_index, "AGENT_TEST_DISCOVERY_INDEX") else None
+    modules = list(_iter_package_modules(paths, package_name))
+    results = {}
+    pending = []
+    for modname, source_path in modules:
+        cached = index.lookup(modname, source_path, mode) if index is not None else None
+        if cached is None and static:
+            cached = scan_file(modname, source_path)
+            if cached is not None and index is not None:
+                index.store(modname, source_path, *cached, "static")
+        if cached is not None:
+            results[modname] = cached
+        else:
+            pending.append((modname, source_path))
+    if workers > 1 and len(pending) > 1:
+        scanned = _scan_modules_parallel([modname for modname, _ in pending], workers)
+    else:
+        scanned = {}
+        for modname, _ in pending:
+            try:
+                scanned[modname] = _scan_module(modname)
+            except Exception:
+                pass
+    for modname, source_path in pending:
+        if modname in scanned and index is not None:
+            index.store(modname, source_path, *scanned[modname], "import")
+    results.update(scanned)
+    if index is not None:
+        index.prune(package_name, {modname for modname, _ in modules})
+        index.save()
+    for modname, _ in modules:
+        if modname in results:
+            yield (modname, *results[modname])
+
+
+def discover_package(package_name, use_index=None, static=None, workers=None):
+    """
+    Walks and imports the package once and returns a DiscoveryRegistry holding
+    both the runnables and the tools found in its submodules.
+    With static=True (or AGENT_TEST_STATIC_DISCOVERY=1) modules are parsed instead of imported.
+    With workers > 1 (or AGENT_TEST_DISCOVERY_WORKERS) module imports run in a process pool;
+    workers=-1 uses one worker per CPU.
+    """
+    registry = DiscoveryRegistry(package_name)
+    try:
+        for modname, agents, tools in _scan_package(package_name, use_index, static, workers):
+            registry.add_module(modname, agents, tools)
+    except Exception as e:
+        logger.warning("discover_package: Could not import package '%s': %s", package_name, e)
+        registry.complete = False
+    return registry
+
+
+def resolve_discovery_options(use_index=None, static=None, workers=None):
+    """(use_index, static, workers) as discover_package applies them, with None read from the AGENT_TEST_* env vars."""
+    return (_flag_enabled(use_index, "AGENT_TEST_DISCOVERY_INDEX"), _flag_enabled(static, "AGENT_TEST_STATIC_DISCOVERY"),
+            _resolve_workers(workers))
+
+
+def find_all_tools(package_name, use_index=None, static=None, workers=None):
+    """
+    Scans the given package and returns a dict of tool_name to AgentInfo
+    for all @tool-decorated functions found in the package and its submodules.
+    """
+    tools = dict(discover_package(package_name, use_index, static, workers).tools)
+    debug_event(logger, "find_all_tools", package_name=package_name, tools=list(tools))
     return tools
 
-def find_all_remoterunnables(package_name):
+def find_all_remoterunnables(package_name, use_index=None, static=None, workers=None):
     """
     Scans the given package and returns a dict of agent_name to RemoteRunnableInfo
     for all RemoteRunnable objects found in the package and its submodules.
     """
-    remoterunnables = {}
-    try:
-        package = importlib.import_module(package_name)
-    except Exception as e:
-        print(f"find_all_remoterunnables: Could not import package '{package_name}': {e}")
-        return remoterunnables
-    for _, modname, _ in pkgutil.walk_packages(package.__path__, package.__name__ + "."):
-        try:
-            module = importlib.import_module(modname)
-            for name, obj in inspect.getmembers(module):
-                if isinstance(obj, tuple(RUNNABLE_TYPES)):
-                    info = AgentInfo(
-                        agent_name=name,
-                        agent_path=f"{modname}.{name}",
-                        agent_type=type(obj).__name__,
-                        agent_module_path=modname
-                    )
-                    remoterunnables[name] = info
-        except Exception:
-            pass
-    print(f"find_all_remoterunnables: Found remoterunnables: {remoterunnables}")
+    remoterunnables = dict(discover_package(package_name, use_index, static, workers).agents)
+    debug_event(logger, "find_all_remoterunnables", package_name=package_name, agents=list(remoterunnables))
     return remoterunnables
 
 def find_async_nodes_in_graph(graph):
@@ -75,5 +233,5 @@ def find_async_nodes_in_graph(graph):
     for node_name, node_func in getattr(graph, 'nodes', {}).items():
         if inspect.iscoroutinefunction(node_func):
             async_nodes.append(node_name)
-    print(f"find_async_nodes_in_graph: Found async nodes: {async_nodes}")
+    debug_event(logger, "find_async_nodes_in_graph", async_nodes=async_nodes)
     return async_nodes
@@ -0,0 +1,295 @@
+import ast
+import builtins
+import sys
+
+from agent_test.src.agent_utils.models.agent_info import AgentInfo
+
+# Top-level packages whose objects may be runnables or tools
+RUNNABLE_ROOTS = {
+    "langserve", "langchain", "langchain_core", "langchain_community",
+    "langchain_openai", "langgraph", "crewai", "mcp",
+}
+# Constructors whose instances are recorded as agents, with their class name as agent_type
+RUNNABLE_CONSTRUCTORS = {"RemoteRunnable", "Runnable", "RunnableLambda"}
+# Base classes that make a locally defined class a runnable. Instances of a BaseTool
+# subclass are tools as well, so such classes are left to import-based discovery.
+RUNNABLE_BASES = {"Runnable", "RunnableSerializable", "RemoteRunnable", "RunnableLambda"}
+# langchain tool classes are runnables as well as tools; mcp.Tool is only a tool
+TOOL_CONSTRUCTORS = {"Tool", "StructuredTool"}
+TOOL_DECORATOR = "tool"
+# Lowercase members of the runnable libraries known to be functions; importing any other
+# lowercase member may bring a runnable instance into the module, so the module is imported
+KNOWN_FUNCTIONS = {TOOL_DECORATOR, "add_routes", "add_messages"}
+# agent_type reported by import-based discovery for @tool-decorated functions
+TOOL_DECORATOR_AGENT_TYPE = "StructuredTool"
+
+
+class _Ambiguous(Exception):
+    """Raised when a module cannot be classified without importing it."""
+
+
+def _root(qualified_name):
+    return qualified_name.split(".", 1)[0]
+
+
+def _is_stdlib(qualified_name):
+    return _root(qualified_name) in sys.stdlib_module_names
+
+
+class _ModuleScanner:
+    """Classifies the module-level names of one module from its AST."""
+
+    def __init__(self, modname, is_package):
+        self.modname = modname
+        self.package = modname if is_package else modname.rpartition(".")[0]
+        self.top_package = modname.split(".", 1)[0]
+        self.imports = {}          # local alias -> qualified name
+        self.classes = {}          # local class -> True (runnable) / False / None (unknown)
+        self.functions = set()     # locally defined functions
+        self.variables = set()     # other module-level names
+        self.agents = {}           # name -> agent_type
+        self.tools = set()
+
+    # --- name resolution ---------------------------------------------------
+
+    def _resolve_relative(self, module, level):
+        if level == 0:
+            return module
+        parts = self.package.split(".")
+        base = parts[: len(parts) - (level - 1)] if level > 1 else parts
+        return ".".join(base + ([module] if module else []))
+
+    def _is_local_module(self, qualified_name):
+        return _root(qualified_name) == self.top_package
+
+    def _qualify(self, node):
+        """Returns the qualified name of a Name/Attribute chain rooted at an import, else None."""
+        attrs = []
+        while isinstance(node, ast.Attribute):
+            attrs.append(node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name) or node.id not in self.imports:
+            return None
+        return ".".join([self.imports[node.id]] + list(reversed(attrs)))
+
+    def _base_name(self, node):
+        while isinstance(node, ast.Attribute):
+            node = node.value
+        return node.id if isinstance(node, ast.Name) else None
+
+    # --- classification ----------------------------------------------------
+
+    def _classify_base(self, base):
+        if isinstance(base, ast.Subscript):
+            base = base.value
+        if isinstance(base, ast.Name) and base.id in self.classes:
+            return self.classes[base.id]
+        qualified = self._qualify(base)
+        if qualified is None:
+            # Builtins such as object or Exception
+            return False if isinstance(base, ast.Name) and hasattr(builtins, base.id) else None
+        if _root(qualified) in RUNNABLE_ROOTS:
+            return True if qualified.rpartition(".")[2] in RUNNABLE_BASES else None
+        return None if self._is_local_module(qualified) else False
+
+    def _classify_call(self, call):
+        """Returns ('agent', type) / ('tool', None) / ('agent_tool', type) / None for a module-level call."""
+        func = call.func
+        if isinstance(func, ast.Name):
+            if func.id in self.classes:
+                status = self.classes[func.id]
+                if status is None:
+                    raise _Ambiguous(f"class {func.id} has unresolved bases")
+                return ("agent", func.id) if status else None
+            if func.id in self.functions or func.id in self.variables:
+                raise _Ambiguous(f"call to local callable {func.id}")
+            if func.id not in self.imports:
+                return None
+        qualified = self._qualify(func)
+        if qualified is None:
+            base = self._base_name(func)
+            if base in self.agents or base in self.tools or base in self.functions or base in self.classes:
+                raise _Ambiguous(f"call on local object {base}")
+            return None
+        if self._is_local_module(qualified):
+            raise _Ambiguous(f"call to package callable {qualified}")
+        if _root(qualified) not in RUNNABLE_ROOTS:
+            return None
+        name = qualified.rpartition(".")[2]
+        if name in TOOL_CONSTRUCTORS:
+            return ("tool", None) if _root(qualified) == "mcp" else ("agent_tool", name)
+        if name in RUNNABLE_CONSTRUCTORS:
+            return ("agent", name)
+        raise _Ambiguous(f"call to {qualified}")
+
+    def _is_tool_decorator(self, decorator):
+        target = decorator.func if isinstance(decorator, ast.Call) else decorator
+        qualified = self._qualify(target)
+        if qualified is None:
+            name = self._base_name(target)
+            if name in self.functions or name in self.variables or name in self.classes:
+                raise _Ambiguous(f"local decorator {name}")
+            return False
+        if _root(qualified) in RUNNABLE_ROOTS:
+            if qualified.rpartition(".")[2] == TOOL_DECORATOR:
+                return True
+            raise _Ambiguous(f"decorator {qualified}")
+        if self._is_local_module(qualified):
+            raise _Ambiguous(f"package decorator {qualified}")
+        return False
+
+    def _record(self, name, result):
+        self.agents.pop(name, None)
+        self.tools.discard(name)
+        if result is None:
+            self.variables.add(name)
+            return
+        kind, agent_type = result
+        if kind in ("agent", "agent_tool"):
+            self.agents[name] = agent_type
+        if kind in ("tool", "agent_tool"):
+            self.tools.add(name)
+
+    # --- statements --------------------------------------------------------
+
+    def _visit_import(self, node):
+        for alias in node.names:
+            if alias.asname:
+                self.imports[alias.asname] = alias.name
+            else:
+                top = alias.name.split(".", 1)[0]
+                self.imports[top] = top
+
+    def _visit_import_from(self, node):
+        module = self._resolve_relative(node.module, node.level)
+        for alias in node.names:
+            if alias.name == "*":
+                raise _Ambiguous(f"star import from {module}")
+            if node.level or self._is_local_module(module):
+                # Re-exported members of the package itself may be runnables
+                raise _Ambiguous(f"import from package module {module}")
+            if _root(module) in RUNNABLE_ROOTS and alias.name[:1].islower() and alias.name not in KNOWN_FUNCTIONS:
+                # Import mode records runnables imported from a library too
+                raise _Ambiguous(f"import of {module}.{alias.name}")
+            self.imports[alias.asname or alias.name] = f"{module}.{alias.name}"
+
+    def _visit_assign(self, targets, value):
+        names = [t.id for t in targets if isinstance(t, ast.Name)]
+        if isinstance(value, ast.Call):
+            result = self._classify_call(value)
+        elif isinstance(value, ast.Name) and (value.id in self.agents or value.id in self.tools):
+            result = (
+                "agent_tool" if value.id in self.tools and value.id in self.agents
+                else "tool" if value.id in self.tools else "agent",
+                self.agents.get(value.id),
+            )
+        elif isinstance(value, (ast.Name, ast.Attribute)) and self._qualify(value) is not None \
+                and _root(self._qualify(value)) in RUNNABLE_ROOTS:
+            raise _Ambiguous("alias of an imported runnable-library member")
+        else:
+            result = None
+        if len(names) != len(targets) and result is not None:
+            raise _Ambiguous("runnable assigned to a non-name target")
+        for name in names:
+            self._record(name, result)
+
+    def _is_main_guard(self, node):
+        test = node.test
+        return (
+            isinstance(test, ast.Compare)
+            and isinstance(test.left, ast.Name)
+            and test.left.id == "__name__"
+        )
+
+    def visit_body(self, body):
+        for node in body:
+            if isinstance(node, ast.Import):
+                self._visit_import(node)
+            elif isinstance(node, ast.ImportFrom):
+                self._visit_import_from(node)
+            elif isinstance(node, ast.ClassDef):
+                statuses = [self._classify_base(base) for base in node.bases]
+                if any(status is True for status in statuses):
+                    self.classes[node.name] = True
+                elif any(status is None for status in statuses):
+                    self.classes[node.name] = None
+                else:
+                    self.classes[node.name] = False
+                if node.decorator_list:
+                    self.classes[node.name] = None
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                if node.name == "__getattr__":
+                    raise _Ambiguous("module-level __getattr__")
+                if any(self._is_tool_decorator(d) for d in node.decorator_list):
+                    self._record(node.name, ("agent_tool", TOOL_DECORATOR_AGENT_TYPE))
+                else:
+                    self._record(node.name, None)
+                    self.functions.add(node.name)
+            elif isinstance(node, ast.Assign):
+                self._visit_assign(node.targets, node.value)
+            elif isinstance(node, ast.AnnAssign) and node.value is not None:
+                self._visit_assign([node.target], node.value)
+            elif isinstance(node, ast.If):
+                if not self._is_main_guard(node):
+                    self.visit_body(node.body)
+                    self.visit_body(node.orelse)
+            elif isinstance(node, ast.Try):
+                self.visit_body(node.body)
+                for handler in node.handlers:
+                    self.visit_body(handler.body)
+                self.visit_body(node.orelse)
+                self.visit_body(node.finalbody)
+            elif isinstance(node, (ast.With, ast.For, ast.While)):
+                self.visit_body(node.body)
+
+    def result(self):
+        agents = [
+            AgentInfo(
+                agent_name=name,
+                agent_path=f"{self.modname}.{name}",
+                agent_type=agent_type,
+                agent_module_path=self.modname,
+            )
+            for name, agent_type in sorted(self.agents.items())
+        ]
+        tools = [
+            AgentInfo(
+                agent_name=name,
+                agent_path=f"{self.modname}.{name}",
+                agent_type="tool",
+                agent_module_path=self.modname,
+            )
+            for name in sorted(self.tools)
+        ]
+        return agents, tools
+
+
+def scan_source(modname, source, is_package=False):
+    """
+    Statically classifies module-level runnables and tools of modname from its source.
+    Returns (agents, tools) lists of AgentInfo, or None when the module is ambiguous
+    (star imports, re-exports from the package, calls whose result type is unknown, ...)
+    and has to be imported instead.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+    scanner = _ModuleScanner(modname, is_package)
+    try:
+        scanner.visit_body(tree.body)
+    except _Ambiguous:
+        return None
+    return scanner.result()
+
+
+def scan_file(modname, source_path):
+    """Reads source_path and runs scan_source on it. Returns None for non-Python sources."""
+    if source_path is None or not source_path.endswith(".py"):
+        return None
+    try:
+        with open(source_path, "rb") as f:
+            source = f.read()
+    except OSError:
+        return None
+    return scan_source(modname, source, is_package=source_path.endswith("__init__.py"))
@@ -1,22 +1,98 @@
+import json
 import logging
+import os
+import warnings
+
+DEFAULT_LEVEL = "WARNING"
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class _EventFields:
+    """Formats the fields of an event only when a handler actually renders the record."""
+    __slots__ = ("fields",)
+
+    def __init__(self, fields):
+        self.fields = fields
+
+    def __str__(self):
+        return ", ".join(f"{key}={value!r}" for key, value in self.fields.items())
+
+
+class StructuredFormatter(logging.Formatter):
+    """Renders records as one JSON object per line; event records keep their fields under "fields"."""
+
+    def format(self, record):
+        data = {
+            "time": self.formatTime(record),
+            "logger": record.name,
+            "level": record.levelname,
+        }
+        event = getattr(record, "event", None)
+        if event is not None:
+            data["event"] = event
+            # Nested, so fields named e.g. "time" or "level" cannot overwrite the envelope
+            data["fields"] = record.fields
+        else:
+            data["message"] = record.getMessage()
+        return json.dumps(data, default=repr)
+
+
+def _env_level():
+    level = os.environ.get("AGENT_TEST_LOG_LEVEL", DEFAULT_LEVEL).upper()
+    if not isinstance(logging.getLevelName(level), int):
+        warnings.warn(f"Invalid AGENT_TEST_LOG_LEVEL '{level}'; using {DEFAULT_LEVEL}.", stacklevel=3)
+        return DEFAULT_LEVEL
+    return level
+
 
 class AgentTestLogger:
+    """
+    Shared logger of the library. The level defaults to WARNING, so debug events cost a
+    level check only; set AGENT_TEST_LOG_LEVEL (e.g. DEBUG) or call set_level to see them.
+    AGENT_TEST_LOG_FORMAT=json (or set_structured(True)) emits events as JSON records.
+    """
     _logger = None
+    _handler = None
 
     @staticmethod
     def get_logger(name: str = "agent_test_logger"):
         if AgentTestLogger._logger is None:
             logger = logging.getLogger(name)
-            logger.setLevel(logging.DEBUG)
+            logger.setLevel(_env_level())
             if not logger.handlers:
                 handler = logging.StreamHandler()
-                formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-                handler.setFormatter(formatter)
+                handler.setFormatter(logging.Formatter(TEXT_FORMAT))
                 logger.addHandler(handler)
+                AgentTestLogger._handler = handler
             AgentTestLogger._logger = logger
+            if os.environ.get("AGENT_TEST_LOG_FORMAT", "").lower() == "json":
+                AgentTestLogger.set_structured(True)
         return AgentTestLogger._logger
-    
+
     @staticmethod
     def set_logger(logger):
         """Set a custom logger instance."""
         AgentTestLogger._logger = logger
+
+    @staticmethod
+    def set_level(level):
+        AgentTestLogger.get_logger().setLevel(level)
+
+    @staticmethod
+    def set_structured(enabled=True):
+        """Switches the library's own handler between JSON records and plain text."""
+        AgentTestLogger.get_logger()
+        if AgentTestLogger._handler is not None:
+            formatter = StructuredFormatter() if enabled else logging.Formatter(TEXT_FORMAT)
+            AgentTestLogger._handler.setFormatter(formatter)
+
+
+def debug_event(logger, event, **fields):
+    """
+    Logs a debug event with its fields attached to the record (record.event, record.fields).
+    Nothing is formatted unless debug is enabled and a handler renders the record,
+    so passing large agent states is cheap when debug logging is off.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s: %s", event, _EventFields(fields),
+                     extra={"event": event, "fields": fields}, stacklevel=2)
@@ -0,0 +1,134 @@
+import bisect
+import math
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+# kind: 'discovery', 'patch_start', 'patch_stop', 'agent_call', 'api_call' or 'invoke'.
+# start and end are time.perf_counter() readings, in seconds.
+TimelineEvent = namedtuple("TimelineEvent", ["kind", "name", "start", "end"])
+
+# Kinds of events that stand for mocked dependencies rather than orchestrator code
+DEPENDENCY_KINDS = ("agent_call", "api_call")
+
+
+class Histogram:
+    """Durations of one (kind, name) series, with power-of-two microsecond buckets."""
+
+    def __init__(self, durations):
+        self.durations = sorted(durations)
+
+    @property
+    def count(self):
+        return len(self.durations)
+
+    @property
+    def total(self):
+        return sum(self.durations)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.durations else 0.0
+
+    def percentile(self, p):
+        """Nearest-rank percentile, p in [0, 100]."""
+        if not self.durations:
+            return 0.0
+        rank = max(1, math.ceil(p / 100 * len(self.durations)))
+        return self.durations[rank - 1]
+
+    def buckets(self):
+        """{upper bound in seconds: count} for bounds 1us, 2us, 4us, ..."""
+        counts = {}
+        for duration in self.durations:
+            micros = max(duration * 1e6, 1.0)
+            bound = 2 ** math.ceil(math.log2(micros)) / 1e6
+            counts[bound] = counts.get(bound, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.mean,
+            "min": self.durations[0] if self.durations else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": self.durations[-1] if self.durations else 0.0,
+        }
+
+
+class Timeline:
+    """
+    Monotonic timings of one scenario, recorded by an instrumented FixtureLibrary.
+    Events can be filtered by kind and name, aggregated into histograms, and split into
+    time spent in mocked dependencies versus the orchestrator's own code.
+    """
+
+    def __init__(self):
+        self._events = []
+
+    def record(self, kind, name, start, end):
+        self._events.append(TimelineEvent(kind, name, start, end))
+
+    @contextmanager
+    def span(self, kind, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._events.append(TimelineEvent(kind, name, start, time.perf_counter()))
+
+    def events(self, kind=None, name=None):
+        """Recorded events in start order, optionally only those of a kind and/or name."""
+        return sorted(
+            (event for event in self._events
+             if (kind is None or event.kind == kind) and (name is None or event.name == name)),
+            key=lambda event: event.start,
+        )
+
+    def total(self, kind=None, name=None):
+        return sum(event.end - event.start for event in self.events(kind, name))
+
+    def histograms(self, kind=None):
+        """{(kind, name): Histogram}, e.g. one per mocked agent method."""
+        series = {}
+        for event in self.events(kind):
+            series.setdefault((event.kind, event.name), []).append(event.end - event.start)
+        return {key: Histogram(durations) for key, durations in series.items()}
+
+    def dependency_time(self, start=None, end=None):
+        """
+        Wall time spent inside mocked agent/tool/API calls, within [start, end] if given.
+        Overlapping calls (e.g. parallel graph nodes) are counted once.
+        """
+        intervals = []
+        for event in self._events:
+            if event.kind not in DEPENDENCY_KINDS:
+                continue
+            lo = event.start if start is None else max(event.start, start)
+            hi = event.end if end is None else min(event.end, end)
+            if hi > lo:
+                bisect.insort(intervals, (lo, hi))
+        covered = 0.0
+        current_lo = current_hi = None
+        for lo, hi in intervals:
+            if current_hi is None or lo > current_hi:
+                if current_hi is not None:
+                    covered += current_hi - current_lo
+                current_lo, current_hi = lo, hi
+            else:
+                current_hi = max(current_hi, hi)
+        if current_hi is not None:
+            covered += current_hi - current_lo
+        return covered
+
+    def orchestrator_overhead(self):
+        """Time of the invoke_* calls not spent in mocked dependencies: the orchestrator's own cost."""
+        return sum(
+            (event.end - event.start) - self.dependency_time(event.start, event.end)
+            for event in self.events("invoke")
+        )
+
+    def clear(self):
+        self._events = []
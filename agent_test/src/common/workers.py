@@ -0,0 +1,19 @@
+import os
+
+
+def resolve_workers(workers, env_var, default=0):
+    """
+    Resolves a worker count: workers itself, else the env_var environment variable, else default.
+    A negative count means one worker per CPU. Raises ValueError for a value that is not an integer.
+    """
+    source = "workers"
+    if workers is None:
+        source = env_var
+        workers = os.environ.get(env_var) or default
+    try:
+        workers = int(workers)
+    except (TypeError, ValueError):
+        raise ValueError(
+            f"Invalid worker count {workers!r} from {source}: expected an integer (negative for one per CPU)."
+        ) from None
+    return (os.cpu_count() or 1) if workers < 0 else workers
@@ -0,0 +1,189 @@
+import pkgutil
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+from agent_test.src.fixture.latency import REAL_CLOCK
+
+# Unpacks like a mock `call` (args, kwargs = call) and exposes .args / .kwargs
+StubCall = namedtuple("StubCall", ["args", "kwargs"])
+
+_NO_KWARGS = MappingProxyType({})
+
+
+class AgentMethodStub:
+    """
+    Lightweight stand-in for a patched agent/tool method (invoke, batch, ...).
+    Returns return_value (or the result of side_effect) and records each call as a
+    StubCall. It exposes the called / call_count / call_args / call_args_list surface
+    that the FixtureLibrary assertions use, without MagicMock's attribute machinery.
+    With snapshot (e.g. Snapshotter.snapshot_call) the arguments are recorded as
+    call-time snapshots rather than references to objects the caller may mutate.
+    With recording off (load tests) calls are answered but neither recorded nor timed.
+    """
+    __slots__ = ("return_value", "side_effect", "call_args_list", "snapshot", "recording")
+
+    def __init__(self, return_value=None, side_effect=None, snapshot=None):
+        self.return_value = return_value
+        self.side_effect = side_effect
+        self.call_args_list = []
+        self.snapshot = snapshot
+        self.recording = True
+
+    def _record(self, args, kwargs):
+        if not self.recording:
+            return
+        if self.snapshot is not None:
+            args, kwargs = self.snapshot(args, kwargs)
+        self.call_args_list.append(StubCall(args, kwargs or _NO_KWARGS))
+
+    def __call__(self, *args, **kwargs):
+        self._record(args, kwargs)
+        if self.side_effect is not None:
+            return self.side_effect(*args, **kwargs)
+        return self.return_value
+
+    @property
+    def called(self):
+        return bool(self.call_args_list)
+
+    @property
+    def call_count(self):
+        return len(self.call_args_list)
+
+    @property
+    def call_args(self):
+        return self.call_args_list[-1] if self.call_args_list else None
+
+    def reset_mock(self):
+        # A fresh list, so indexes built over the old one can tell it was reset
+        self.call_args_list = []
+
+    def __repr__(self):
+        return f"<{type(self).__name__} calls={len(self.call_args_list)}>"
+
+
+class AsyncAgentMethodStub(AgentMethodStub):
+    """Awaitable variant of AgentMethodStub for ainvoke. side_effect may be a coroutine function."""
+    __slots__ = ()
+
+    async def __call__(self, *args, **kwargs):
+        self._record(args, kwargs)
+        if self.side_effect is not None:
+            return await self.side_effect(*args, **kwargs)
+        return self.return_value
+
+
+class TimedAgentMethodStub(AgentMethodStub):
+    """AgentMethodStub that also records each call's duration on a Timeline as an 'agent_call' event."""
+    __slots__ = ("timeline", "name")
+
+    def __init__(self, return_value=None, side_effect=None, timeline=None, name=None, snapshot=None):
+        super().__init__(return_value, side_effect, snapshot)
+        self.timeline = timeline
+        self.name = name
+
+    def __call__(self, *args, **kwargs):
+        if not self.recording:
+            return super().__call__(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return super().__call__(*args, **kwargs)
+        finally:
+            self.timeline.record("agent_call", self.name, start, time.perf_counter())
+
+
+class TimedAsyncAgentMethodStub(AsyncAgentMethodStub):
+    __slots__ = ("timeline", "name")
+
+    def __init__(self, return_value=None, side_effect=None, timeline=None, name=None, snapshot=None):
+        super().__init__(return_value, side_effect, snapshot)
+        self.timeline = timeline
+        self.name = name
+
+    async def __call__(self, *args, **kwargs):
+        if not self.recording:
+            return await super().__call__(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return await super().__call__(*args, **kwargs)
+        finally:
+            self.timeline.record("agent_call", self.name, start, time.perf_counter())
+
+
+def delayed_response(method, response, latency, clock=REAL_CLOCK):
+    """A side_effect returning response after a delay drawn from latency, awaited on clock for ainvoke."""
+    if method in ["ainvoke"]:
+        async def respond(*args, **kwargs):
+            await clock.asleep(latency.sample())
+            return response
+        return respond
+
+    def respond(*args, **kwargs):
+        clock.sleep(latency.sample())
+        return response
+    return respond
+
+
+def create_method_stub(method, return_value=None, side_effect=None, timeline=None, name=None,
+                       latency=None, clock=REAL_CLOCK, snapshot=None):
+    """
+    Returns the async stub for ainvoke and the sync stub for every other method.
+    With a timeline, the stub records each call's duration under name (e.g. 'agent1.invoke').
+    With a latency model, each call returns return_value after a delay on clock.
+    snapshot records the call arguments as call-time snapshots.
+    """
+    if latency is not None and side_effect is None:
+        side_effect = delayed_response(method, return_value, latency, clock)
+    if timeline is not None:
+        stub_class = TimedAsyncAgentMethodStub if method in ["ainvoke"] else TimedAgentMethodStub
+        return stub_class(return_value=return_value, side_effect=side_effect, timeline=timeline, name=name,
+                          snapshot=snapshot)
+    stub_class = AsyncAgentMethodStub if method in ["ainvoke"] else AgentMethodStub
+    return stub_class(return_value=return_value, side_effect=side_effect, snapshot=snapshot)
+
+
+class StubPatcher:
+    """
+    Installs a stub as `method` on the object at module_path, with the start()/stop()
+    interface of unittest.mock patchers. Unlike mock.patch it also works on pydantic
+    based objects such as langchain tools, which reject setting non-field attributes.
+    """
+    __slots__ = ("module_path", "method", "stub", "_target", "_original", "_had_own")
+
+    def __init__(self, module_path, method, stub):
+        self.module_path = module_path
+        self.method = method
+        self.stub = stub
+        self._target = None
+        self._original = None
+        self._had_own = False
+
+    def start(self):
+        target = pkgutil.resolve_name(self.module_path)
+        own = getattr(target, "__dict__", {})
+        self._had_own = self.method in own
+        self._original = own.get(self.method)
+        self._set(target, self.stub)
+        self._target = target
+        return self.stub
+
+    def stop(self):
+        target = self._target
+        if target is None:
+            return
+        self._target = None
+        if self._had_own:
+            self._set(target, self._original)
+            return
+        try:
+            delattr(target, self.method)
+        except (AttributeError, TypeError, ValueError):
+            target.__dict__.pop(self.method, None)
+
+    def _set(self, target, value):
+        try:
+            setattr(target, self.method, value)
+        except (AttributeError, TypeError, ValueError):
+            # pydantic models only accept field assignment; write the instance dict directly
+            object.__setattr__(target, self.method, value)
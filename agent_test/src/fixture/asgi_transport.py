@@ -0,0 +1,259 @@
+import asyncio
+import pkgutil
+import threading
+from unittest.mock import patch
+
+import httpx
+
+from agent_test.src.fixture.agent_stub import StubPatcher
+
+# Hosts that all reach the local machine: apps registered for one answer the others
+LOOPBACK_HOSTS = {"localhost", "127.0.0.1", "0.0.0.0", "::1"}
+HTTPX_FUNCTIONS = ("get", "post", "put", "patch", "delete")
+
+# Event loop running in a daemon thread, on which sync clients await the ASGI apps
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def origin(url):
+    """'scheme://host:port' of url, with every loopback host spelled 'localhost'."""
+    url = httpx.URL(str(url))
+    host = "localhost" if url.host in LOOPBACK_HOSTS else url.host
+    port = url.port or {"http": 80, "https": 443}.get(url.scheme)
+    return f"{url.scheme}://{host}:{port}"
+
+
+def _background_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="agent-test-asgi", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+class InProcessApps:
+    """
+    FastAPI/Starlette apps standing in for services, keyed by the origin they would be
+    served on, e.g. {"http://localhost:8001": "examples.common.worker1.main:app"}.
+    Requests to those origins are handed to the app through httpx.ASGITransport:
+    no sockets, ports or server processes. Sync clients (RemoteRunnable.invoke/batch,
+    requests, httpx.post) run the app on a background event loop and wait for it.
+    Lifespan (startup/shutdown) events are not sent.
+    """
+
+    def __init__(self, apps):
+        self._transports = {}
+        for url, app in apps.items():
+            if isinstance(app, str):
+                app = pkgutil.resolve_name(app)
+            self._transports[origin(url)] = httpx.ASGITransport(app=app)
+        self.sync_transport = _SyncRoutingTransport(lambda: self)
+        self.async_transport = _AsyncRoutingTransport(lambda: self)
+
+    def __contains__(self, url):
+        return origin(url) in self._transports
+
+    def transport_for(self, request):
+        transport = self._transports.get(origin(request.url))
+        if transport is None:
+            raise httpx.ConnectError(
+                f"No in-process app serves {origin(request.url)} (apps: {sorted(self._transports)}).",
+                request=request,
+            )
+        return transport
+
+    def served_runnables(self, agent_info_dict):
+        """agent_path of each RemoteRunnable of agent_info_dict whose URL one of the apps serves."""
+        from langserve import RemoteRunnable
+        paths = []
+        for agent_info in agent_info_dict.values():
+            runnable = pkgutil.resolve_name(agent_info.agent_path)
+            if isinstance(runnable, RemoteRunnable) and runnable.url in self:
+                paths.append(agent_info.agent_path)
+        return paths
+
+    def patchers(self, agent_info_dict):
+        """
+        Patchers rewiring the RemoteRunnables of agent_info_dict whose URL is served by an
+        app, and the module-level httpx functions and requests sessions, to these apps.
+        Other URLs keep going to the network. The clients they create are closed when
+        the patchers stop.
+        """
+        resolve = lambda: self
+        return runnable_patchers(resolve, self.served_runnables(agent_info_dict)) + module_patchers(resolve)
+
+
+def runnable_patchers(resolve, agent_paths):
+    """
+    Patchers replacing the sync_client/async_client of the RemoteRunnables at agent_paths
+    with clients sending to the InProcessApps returned by resolve() at request time.
+    While it returns None, requests go through the runnable's own clients.
+    """
+    patchers = []
+    for agent_path in agent_paths:
+        runnable = pkgutil.resolve_name(agent_path)
+        original_sync, original_async = runnable.sync_client, runnable.async_client
+        sync_client = httpx.Client(base_url=original_sync.base_url, headers=original_sync.headers,
+                                   timeout=original_sync.timeout,
+                                   transport=_SyncRoutingTransport(resolve, original_sync))
+        async_client = httpx.AsyncClient(base_url=original_async.base_url, headers=original_async.headers,
+                                         timeout=original_async.timeout,
+                                         transport=_AsyncRoutingTransport(resolve, original_async))
+        patchers.append(_ClientPatcher(agent_path, "sync_client", sync_client))
+        patchers.append(_ClientPatcher(agent_path, "async_client", async_client))
+    return patchers
+
+
+def module_patchers(resolve):
+    """
+    Patchers routing httpx's module functions and requests sessions to the InProcessApps
+    returned by resolve() at call time, for the URLs they serve; other calls are untouched.
+    """
+    client = httpx.Client(transport=_SyncRoutingTransport(resolve))
+    patchers = [_ClientCloser(client)]
+    for name in HTTPX_FUNCTIONS:
+        patchers.append(patch.object(httpx, name, _httpx_function(resolve, client, name, getattr(httpx, name))))
+    patchers.append(patch.object(httpx, "request", _httpx_request(resolve, client, httpx.request)))
+    patchers.extend(_requests_patchers(resolve))
+    return patchers
+
+
+def _served(resolve, url):
+    apps = resolve()
+    return apps is not None and url in apps
+
+
+def _httpx_function(resolve, client, method, original):
+    def call(url, *args, **kwargs):
+        if not _served(resolve, url):
+            return original(url, *args, **kwargs)
+        return client.request(method.upper(), url, *args, **_client_request_kwargs(kwargs))
+    return call
+
+
+def _httpx_request(resolve, client, original):
+    def request(method, url, *args, **kwargs):
+        if not _served(resolve, url):
+            return original(method, url, *args, **kwargs)
+        return client.request(method, url, *args, **_client_request_kwargs(kwargs))
+    return request
+
+
+def _requests_patchers(resolve):
+    try:
+        import requests
+    except ImportError:
+        return []
+    adapter = _requests_adapter(requests, _SyncRoutingTransport(resolve))
+    original = requests.sessions.Session.get_adapter
+
+    def get_adapter(session, url):
+        return adapter if _served(resolve, url) else original(session, url)
+    return [patch.object(requests.sessions.Session, "get_adapter", get_adapter)]
+
+
+def close_client(client):
+    if isinstance(client, httpx.AsyncClient):
+        # Only the routing transport is closed, which holds no connections: any loop will do
+        asyncio.run_coroutine_threadsafe(client.aclose(), _background_loop()).result()
+    else:
+        client.close()
+
+
+class _ClientPatcher(StubPatcher):
+    """StubPatcher installing an httpx client it created, and closing it when stopped."""
+    __slots__ = ()
+
+    def stop(self):
+        super().stop()
+        close_client(self.stub)
+
+
+class _ClientCloser:
+    """Closes a client shared by other patchers when the patchers stop."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def start(self):
+        return self.client
+
+    def stop(self):
+        close_client(self.client)
+
+
+def _client_request_kwargs(kwargs):
+    # Options of httpx's module functions that configure a client rather than a request
+    return {key: value for key, value in kwargs.items() if key not in ("verify", "cert", "trust_env", "proxy")}
+
+
+class _SyncRoutingTransport(httpx.BaseTransport):
+    # resolve() returns the InProcessApps to send to; while it returns None, requests go to fallback (a client)
+    def __init__(self, resolve, fallback=None):
+        self._resolve = resolve
+        self._fallback = fallback
+
+    def handle_request(self, request):
+        apps = self._resolve()
+        if apps is None:
+            return self._fallback.send(request, stream=True)
+        if threading.current_thread().name == "agent-test-asgi":
+            raise RuntimeError("A sync client was called from inside an in-process app; use the async client there.")
+        transport = apps.transport_for(request)
+        loop = _background_loop()
+        # The body is read here, in the caller's thread: a sync request stream cannot be awaited
+        forwarded = httpx.Request(request.method, request.url, headers=request.headers, content=request.read(),
+                                  extensions=request.extensions)
+        status_code, headers, content = asyncio.run_coroutine_threadsafe(_send(transport, forwarded), loop).result()
+        return httpx.Response(status_code, headers=headers, content=content)
+
+
+class _AsyncRoutingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, resolve, fallback=None):
+        self._resolve = resolve
+        self._fallback = fallback
+
+    async def handle_async_request(self, request):
+        apps = self._resolve()
+        if apps is None:
+            return await self._fallback.send(request, stream=True)
+        return await apps.transport_for(request).handle_async_request(request)
+
+
+async def _send(transport, request):
+    response = await transport.handle_async_request(request)
+    content = await response.aread()
+    return response.status_code, response.headers, content
+
+
+def _requests_adapter(requests, transport):
+    from requests.utils import get_encoding_from_headers
+    from requests.structures import CaseInsensitiveDict
+
+    class ASGIAdapter(requests.adapters.BaseAdapter):
+        """requests transport adapter sending prepared requests to the in-process apps."""
+
+        def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+            body = request.body or b""
+            if isinstance(body, str):
+                body = body.encode("utf-8")
+            response = transport.handle_request(
+                httpx.Request(request.method, request.url, headers=dict(request.headers), content=body)
+            )
+            result = requests.Response()
+            result.status_code = response.status_code
+            result.headers = CaseInsensitiveDict(response.headers)
+            result._content = response.read()
+            result.reason = response.reason_phrase
+            result.encoding = get_encoding_from_headers(result.headers)
+            result.url = request.url
+            result.request = request
+            return result
+
+        def close(self):
+            pass
+
+    return ASGIAdapter()
@@ -0,0 +1,109 @@
+import contextlib
+
+from pydantic import BaseModel
+
+from agent_test.src.fixture.state_snapshot import FrozenDict, FrozenList, Snapshotter
+
+# Leaf types hashed directly, ahead of the container checks
+_ATOMIC = frozenset({str, int, float, bool, bytes, type(None)})
+
+
+def structural_hash(value):
+    """
+    Hash of a nested dict/list/tuple/set/pydantic value that is consistent with ==:
+    equal values always hash equal (dict key order is ignored, 1 == 1.0 hash alike).
+    Unhashable leaf objects hash by type, so they only narrow the candidates.
+    Snapshots (FrozenDict/FrozenList) hash once and reuse it, subtrees included.
+    """
+    if type(value) in _ATOMIC:
+        return hash(value)
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return hash(value)
+    if isinstance(value, dict):
+        return hash(("dict", frozenset((key, structural_hash(item)) for key, item in value.items())))
+    if isinstance(value, list):
+        return hash(("list", tuple(structural_hash(item) for item in value)))
+    if isinstance(value, tuple):
+        return hash(("tuple", tuple(structural_hash(item) for item in value)))
+    if isinstance(value, (set, frozenset)):
+        return hash(("set", frozenset(structural_hash(item) for item in value)))
+    if isinstance(value, BaseModel):
+        return hash(("model", type(value), structural_hash(dict(value))))
+    try:
+        return hash(value)
+    except TypeError:
+        return hash(("object", type(value)))
+
+
+class CallLedger:
+    """
+    Recorded agent/tool calls indexed by (agent_name, method), plus a structural-hash
+    index of the single positional input of each call. The hash index is built lazily
+    and incrementally on the first query, so recording stays O(1) per call and a
+    count with input_args only compares full states on hash hits.
+    Stubs record their arguments through snapshotter, as they were at call time even
+    if the orchestrator mutates the state afterwards.
+    """
+
+    def __init__(self):
+        self._stubs = {}    # (agent_name, method) -> stub holding call_args_list
+        self._indexes = {}  # (agent_name, method) -> [call_args_list, indexed_upto, {hash: [state, ...]}]
+        self.snapshotter = Snapshotter()
+
+    def track(self, agent_name, method, stub):
+        """Registers the stub whose calls are recorded for (agent_name, method)."""
+        self._stubs[(agent_name, method)] = stub
+        self._indexes.pop((agent_name, method), None)
+
+    def get(self, agent_name, method):
+        return self._stubs.get((agent_name, method))
+
+    @contextlib.contextmanager
+    def recording(self, enabled):
+        """Turns call recording of every tracked stub on or off for the duration of the block."""
+        previous = {key: stub.recording for key, stub in self._stubs.items()}
+        for stub in self._stubs.values():
+            stub.recording = enabled
+        try:
+            yield
+        finally:
+            for key, value in previous.items():
+                self._stubs[key].recording = value
+
+    def calls(self, agent_name, method):
+        stub = self.get(agent_name, method)
+        return list(stub.call_args_list) if stub is not None else []
+
+    def _index(self, key):
+        calls = self._stubs[key].call_args_list
+        entry = self._indexes.get(key)
+        if entry is None or entry[0] is not calls or entry[1] > len(calls):
+            # New or reset call list: start over
+            entry = [calls, 0, {}]
+            self._indexes[key] = entry
+        buckets = entry[2]
+        for args, _ in calls[entry[1]:]:
+            if args and len(args) == 1:
+                buckets.setdefault(structural_hash(args[0]), []).append(args[0])
+        entry[1] = len(calls)
+        return buckets
+
+    def matching(self, agent_name, method, input_args):
+        """Returns the recorded single-argument inputs equal to input_args."""
+        key = (agent_name, method)
+        if key not in self._stubs:
+            return []
+        bucket = self._index(key).get(structural_hash(input_args), [])
+        return [state for state in bucket if state == input_args]
+
+    def count(self, agent_name, method, input_args=None):
+        """Number of calls to (agent_name, method), optionally only those whose single input equals input_args."""
+        if input_args is None:
+            stub = self.get(agent_name, method)
+            return stub.call_count if stub is not None else 0
+        return len(self.matching(agent_name, method, input_args))
+
+    def clear(self):
+        self._stubs = {}
+        self._indexes = {}
+        self.snapshotter = Snapshotter()
@@ -0,0 +1,294 @@
+import copy
+import hashlib
+import json
+import mmap
+import os
+import pkgutil
+import threading
+import weakref
+from contextvars import ContextVar
+
+CASSETTE_VERSION = 2
+INDEX_SUFFIX = ".idx"
+# Every cassette line is "<KEY_LENGTH hex chars>\t<json record>\n", so the file can be
+# indexed by reading the key prefixes alone
+KEY_LENGTH = 32
+
+# Process-wide cassettes keyed by absolute path, reopened when the file changes
+_cassettes = {}
+_cassettes_lock = threading.Lock()
+
+# Set while a recorded call runs, so calls the agent makes to itself (batch -> invoke) are not recorded
+_recording = ContextVar("agent_test_cassette_recording", default=False)
+
+
+class CassetteMiss(ValueError):
+    """Raised in replay mode when an agent is called with a request that was never recorded."""
+
+
+def _encode(value):
+    # langchain objects (messages, documents) are stored in their serialized form
+    from langchain_core.load import dumpd
+    from langchain_core.load.serializable import Serializable
+    if isinstance(value, Serializable):
+        return dumpd(value)
+    raise TypeError(f"Object of type {type(value).__name__} cannot be stored in a cassette.")
+
+
+def canonical_json(value):
+    """JSON with sorted keys and no whitespace: equal requests always serialize to the same bytes."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=_encode)
+
+
+def request_key(agent_name, method, request):
+    """Stable hash of one agent call; the same in every process and Python version."""
+    payload = canonical_json([agent_name, method, request]).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=KEY_LENGTH // 2).hexdigest()
+
+
+def call_request(args, kwargs):
+    """The part of an invoke/ainvoke/batch call that identifies it: its input, not its config."""
+    return args[0] if args else kwargs.get("input", kwargs.get("inputs"))
+
+
+class CassetteWriter:
+    """
+    Appends recorded calls to a cassette file. close() writes the sidecar index
+    ({key: [line offsets]} and {key: [agent, method]}), stamped with the cassette
+    size it describes.
+    Safe to share between threads recording concurrently.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._index = None
+        self._calls = None
+        self._lock = threading.Lock()
+
+    def record(self, agent_name, method, request, response):
+        key = request_key(agent_name, method, request)
+        record = {"agent": agent_name, "method": method, "request": request, "response": response}
+        try:
+            text = json.dumps(record, sort_keys=True, separators=(",", ":"))
+        except TypeError:
+            # Flag the record so replay revives langchain objects only where there are some
+            record["langchain"] = True
+            text = canonical_json(record)
+        line = key + "\t" + text + "\n"
+        with self._lock:
+            if self._file is None:
+                self._open()
+            offset = self._file.tell()
+            self._file.write(line.encode("utf-8"))
+            self._file.flush()
+            self._index.setdefault(key, []).append(offset)
+            self._calls[key] = [agent_name, method]
+
+    def _open(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._index = {}
+        self._calls = {}
+        if os.path.exists(self.path):
+            existing = Cassette(self.path)
+            self._index = existing.index
+            self._calls = {key: list(call) for key, call in existing.calls().items()}
+            existing.close()
+        self._file = open(self.path, "ab")
+
+    def close(self):
+        with self._lock:
+            if self._file is None:
+                return
+            size = self._file.tell()
+            self._file.close()
+            self._file = None
+            tmp_path = f"{self.path}{INDEX_SUFFIX}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"version": CASSETTE_VERSION, "size": size, "keys": self._index, "calls": self._calls}, f)
+                os.replace(tmp_path, self.path + INDEX_SUFFIX)
+            except OSError:
+                # Without the index the cassette is still readable: it is rebuilt from the key prefixes
+                pass
+
+
+class Cassette:
+    """
+    Read-only view of a recorded cassette. The file is memory-mapped and only the
+    lines that are replayed get decoded, so large recordings open quickly; the key
+    index and the agent/method of each key come from the sidecar file when it matches
+    the cassette, or are rebuilt by scanning the line prefixes and decoding one line
+    per key.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        stat = os.stat(path)
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self._calls = None   # key -> (agent, method)
+        self._file = open(path, "rb")
+        # mmap cannot map an empty file
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        # Closes the mapping and file when the cassette is closed or garbage collected
+        self._release = weakref.finalize(self, _release, self._data, self._file)
+        self.index = self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.path + INDEX_SUFFIX, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("version") == CASSETTE_VERSION and cached.get("size") == self.size:
+                self._calls = {key: tuple(call) for key, call in cached["calls"].items()}
+                return cached["keys"]
+        except (OSError, ValueError, KeyError):
+            pass
+        index = {}
+        data = self._data
+        offset = 0
+        while offset < self.size:
+            end = data.find(b"\n", offset)
+            end = self.size if end < 0 else end
+            if end - offset > KEY_LENGTH:
+                index.setdefault(data[offset:offset + KEY_LENGTH].decode("ascii"), []).append(offset)
+            offset = end + 1
+        return index
+
+    def record_at(self, offset):
+        """The decoded record of the line at offset; a fresh object on every call."""
+        end = self._data.find(b"\n", offset)
+        line = self._data[offset + KEY_LENGTH + 1: self.size if end < 0 else end]
+        return json.loads(line)
+
+    def records(self):
+        """Every recorded call, in recording order."""
+        offsets = sorted(offset for offsets in self.index.values() for offset in offsets)
+        return [self.record_at(offset) for offset in offsets]
+
+    def calls(self):
+        """{key: (agent, method)} of every recorded request."""
+        if self._calls is None:
+            self._calls = {}
+            for key, offsets in self.index.items():
+                record = self.record_at(offsets[0])
+                self._calls[key] = (record["agent"], record["method"])
+        return self._calls
+
+    def agents(self):
+        """{agent name: set of recorded methods}."""
+        agents = {}
+        for agent_name, method in self.calls().values():
+            agents.setdefault(agent_name, set()).add(method)
+        return agents
+
+    def count(self, agent_name, method):
+        """Number of recorded agent_name.method calls."""
+        return sum(len(self.index[key]) for key, call in self.calls().items() if call == (agent_name, method))
+
+    def __len__(self):
+        return sum(len(offsets) for offsets in self.index.values())
+
+    def close(self):
+        self._release()
+
+
+def _release(data, file):
+    if isinstance(data, mmap.mmap):
+        data.close()
+    file.close()
+
+
+def load_cassette(path):
+    """The shared Cassette for path, reopened when the file has changed since it was loaded."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    with _cassettes_lock:
+        cassette = _cassettes.get(path)
+        if cassette is None or (cassette.size, cassette.mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            # Players may still replay the outdated copy: it is released once the last one drops it
+            cassette = _cassettes[path] = Cassette(path)
+        return cassette
+
+
+class CassettePlayer:
+    """
+    Answers agent calls from a Cassette for one scenario. A request recorded several
+    times is answered with its responses in recording order, then keeps returning the
+    last one.
+    """
+
+    def __init__(self, cassette):
+        self.cassette = cassette
+        self._played = {}   # key -> responses served so far
+        self._lock = threading.Lock()
+
+    def response(self, agent_name, method, request):
+        key = request_key(agent_name, method, request)
+        offsets = self.cassette.index.get(key)
+        if not offsets:
+            raise CassetteMiss(self._miss_report(agent_name, method, request))
+        with self._lock:
+            played = self._played.get(key, 0)
+            self._played[key] = played + 1
+        record = self.cassette.record_at(offsets[min(played, len(offsets) - 1)])
+        if record.get("langchain"):
+            from langchain_core.load import load
+            return load(record["response"])
+        return record["response"]
+
+    def _miss_report(self, agent_name, method, request):
+        recorded = self.cassette.count(agent_name, method)
+        return (
+            f"No recorded {agent_name}.{method} call matches request {request!r} in cassette "
+            f"{self.cassette.path} ({recorded} {agent_name}.{method} calls recorded). Re-record the cassette."
+        )
+
+
+def unpatched_method(module_path, method):
+    """The object's method as its class defines it, bypassing stubs and session dispatchers set on the instance."""
+    target = pkgutil.resolve_name(module_path)
+    return getattr(type(target), method).__get__(target, type(target))
+
+
+def recording(writer, agent_name, method, original):
+    """side_effect calling the real method and recording the request/response pair of the outermost call."""
+    if method in ["ainvoke"]:
+        async def record(*args, **kwargs):
+            if _recording.get():
+                return await original(*args, **kwargs)
+            # Snapshot the request first: agents may mutate their input
+            request = copy.deepcopy(call_request(args, kwargs))
+            token = _recording.set(True)
+            try:
+                response = await original(*args, **kwargs)
+            finally:
+                _recording.reset(token)
+            writer.record(agent_name, method, request, response)
+            return response
+        return record
+
+    def record(*args, **kwargs):
+        if _recording.get():
+            return original(*args, **kwargs)
+        request = copy.deepcopy(call_request(args, kwargs))
+        token = _recording.set(True)
+        try:
+            response = original(*args, **kwargs)
+        finally:
+            _recording.reset(token)
+        writer.record(agent_name, method, request, response)
+        return response
+    return record
+
+
+def replaying(player, agent_name, method):
+    """side_effect answering from the cassette."""
+    if method in ["ainvoke"]:
+        async def replay(*args, **kwargs):
+            return player.response(agent_name, method, call_request(args, kwargs))
+        return replay
+
+    def replay(*args, **kwargs):
+        return player.response(agent_name, method, call_request(args, kwargs))
+    return replay
@@ -0,0 +1,68 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _check_fixtures(fixtures):
+    fixtures = list(fixtures)
+    sessions = {id(fixture._patch_session) for fixture in fixtures}
+    if any(fixture._patch_session is None for fixture in fixtures) or len(sessions) > 1:
+        raise ValueError("Concurrent scenarios must share one PatchSession (FixtureLibrary(patch_session=...)).")
+    if len({id(fixture) for fixture in fixtures}) != len(fixtures):
+        raise ValueError("Each concurrent scenario needs its own FixtureLibrary.")
+    return fixtures
+
+
+async def ainvoke_concurrently(fixtures, target, max_concurrency=None):
+    """
+    Runs many prepared FixtureLibrary scenarios against one async graph or coroutine
+    function on the current event loop, at most max_concurrency at a time.
+
+    Every fixture must be built with the same PatchSession: its targets are patched once
+    and each scenario's responses and call records live in a ScenarioScope bound to the
+    scenario's own task through a ContextVar, so overlapping calls such as
+    agent2.ainvoke are answered and recorded for the right scenario.
+
+    Returns one entry per fixture, in order: the fixture itself when it ran, or the
+    exception it raised (as asyncio.gather(return_exceptions=True) does).
+    """
+    fixtures = _check_fixtures(fixtures)
+    semaphore = asyncio.Semaphore(max_concurrency or len(fixtures) or 1)
+
+    async def run(fixture):
+        async with semaphore:
+            if hasattr(target, "ainvoke"):
+                return await fixture.ainvoke_graph(target)
+            return await fixture.ainvoke_function(target)
+
+    # Each coroutine becomes its own task, so each scenario's scope stays in its own context
+    return await asyncio.gather(*(run(fixture) for fixture in fixtures), return_exceptions=True)
+
+
+def run_concurrently(fixtures, target, max_concurrency=None):
+    """Synchronous entry point for ainvoke_concurrently, for callers without a running loop."""
+    return asyncio.run(ainvoke_concurrently(fixtures, target, max_concurrency))
+
+
+def invoke_threaded(fixtures, target, max_workers=None):
+    """
+    Runs many prepared FixtureLibrary scenarios against one sync graph or function in a
+    ThreadPoolExecutor. Each scenario activates its ScenarioScope in the worker thread
+    running it, so blocking orchestrators (e.g. run_llm_orchestrator) overlap their I/O
+    waits without the pickling cost of a process pool. As with ainvoke_concurrently all
+    fixtures must share one PatchSession. Threads the orchestrator starts itself only
+    see the scope if they copy the caller's context (LangGraph's executors do).
+
+    Returns one entry per fixture, in order: the fixture itself or the exception it raised.
+    """
+    fixtures = _check_fixtures(fixtures)
+
+    def run(fixture):
+        try:
+            if hasattr(target, "invoke"):
+                return fixture.invoke_graph(target)
+            return fixture.invoke_function(target)
+        except Exception as exc:  # noqa: BLE001 - reported per scenario
+            return exc
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(run, fixtures))
@@ -2,6 +2,7 @@
 import glob
 import pytest
 from agent_test.src.fixture.data_loader.json_feature_loader import JSONFeatureLoader
+from agent_test.src.fixture.data_loader.jsonl_feature_loader import JSONLFeatureLoader
 import pytest
 
 class FeatureLoader:
@@ -12,19 +13,27 @@ class FeatureLoader:
         self.file_list = file_list
         if loader_type == "json":
             self.loader = JSONFeatureLoader()
+        elif loader_type == "jsonl":
+            self.loader = JSONLFeatureLoader()
         else:
             raise ValueError(f"Unsupported loader type: {loader_type}")
 
     def load_all(self, file_list=None):
+        return list(self.iter_all(file_list))
+
+    def iter_all(self, file_list=None):
+        """Yields scenarios one at a time; with the jsonl loader no file is held in memory."""
         if file_list is None:
             file_list = self.file_list
-        all_scenarios = []
         for file in file_list or []:
-            for scenario in self.loader.parse(file):
+            if isinstance(self.loader, JSONLFeatureLoader):
+                scenarios = (scenario for _, _, scenario in self.loader.iter_entries(file))
+            else:
+                scenarios = self.loader.parse(file)
+            for scenario in scenarios:
                 if self.root_path:
                     scenario["root_path"] = self.root_path
-                all_scenarios.append(scenario)
-        return all_scenarios
+                yield scenario
 
 # Pytest fixture for FeatureLoader
 @pytest.fixture
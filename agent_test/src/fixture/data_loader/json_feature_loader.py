@@ -3,6 +3,11 @@ import json
 from agent_test.src.agent_utils.models.api_mock_type import APIMockType
 from agent_test.src.fixture.fixture_class import FixtureLibrary
 
+def _api_type(value):
+    # Compiled scenarios already hold the APIMockType member
+    return value if isinstance(value, APIMockType) else getattr(APIMockType, value)
+
+
 class JSONFeatureLoader():
     """Loads and parses test scenarios from JSON files."""
     def load_all(self, file_pattern):
@@ -16,14 +21,17 @@ class JSONFeatureLoader():
         with open(path, 'r', encoding='utf-8') as f:
             return json.load(f)
         
-    def execute_scenario(self, scenario_data, run_llm_orchestrator):
-        flib = FixtureLibrary(root_path=scenario_data.get("root_path", "examples.langgraph.prompt_agentic.synchronous"))
+    def execute_scenario(self, scenario_data, run_llm_orchestrator, patch_session=None):
+        flib = FixtureLibrary(
+            root_path=scenario_data.get("root_path", "examples.langgraph.prompt_agentic.synchronous"),
+            patch_session=patch_session
+        )
         for api_mock in scenario_data.get("mock_api_calls", []):
             flib.mock_api_call(
                 api_path=api_mock["api_path"],
                 payload=api_mock["payload"],
                 return_value=api_mock["return_value"],
-                api_type=getattr(APIMockType, api_mock.get("api_type", "REQUESTS"))
+                api_type=_api_type(api_mock.get("api_type", "REQUESTS"))
             )
         flib.when_input_state(scenario_data["input_state"])
         for agent_resp in scenario_data.get("agent_responses", []):
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+
+from agent_test.src.agent_utils.discovery_index import default_cache_dir
+from agent_test.src.fixture.data_loader.json_feature_loader import JSONFeatureLoader
+
+SCENARIO_INDEX_VERSION = 1
+SCENARIO_INDEX_DIR = "scenario_index"
+
+
+class DuplicateScenarioError(ValueError):
+    """Raised when two scenarios of a JSON Lines file share an id."""
+
+
+def scenario_id(scenario, ordinal):
+    """A scenario's "id" field, or its position in the file when it has none."""
+    value = scenario.get("id") if isinstance(scenario, dict) else None
+    return str(value) if value is not None else str(ordinal)
+
+
+class JSONLFeatureLoader(JSONFeatureLoader):
+    """
+    Loads scenarios from JSON Lines files: one scenario object per line, blank lines
+    ignored. parse and load_all return lists like JSONFeatureLoader; iter_entries streams
+    scenarios one at a time, so a file is never held in memory. An optional byte-offset
+    index, cached under the project cache dir and rebuilt when the file's mtime or size
+    changes, lets a single scenario be loaded by id with one seek.
+    """
+
+    def __init__(self, index_dir=None):
+        self.index_dir = index_dir
+
+    def parse(self, path):
+        return [scenario for _, _, scenario in self.iter_entries(path)]
+
+    def iter_entries(self, path):
+        """Yields (ordinal, byte offset, scenario) for every scenario line of path."""
+        ordinal = 0
+        with open(path, "rb") as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    yield ordinal, offset, json.loads(line)
+                    ordinal += 1
+                offset += len(line)
+
+    def _index_path(self, path):
+        digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+        index_dir = self.index_dir or os.path.join(default_cache_dir(), SCENARIO_INDEX_DIR)
+        return os.path.join(index_dir, f"{digest}.json")
+
+    def build_index(self, path):
+        """
+        Returns {scenario id: [ordinal, byte offset]} for path, from the cached index when
+        still valid. Raises DuplicateScenarioError when two lines share an id.
+        """
+        stat = os.stat(path)
+        stamp = {"version": SCENARIO_INDEX_VERSION, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        index_path = self._index_path(path)
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if all(cached.get(key) == value for key, value in stamp.items()):
+                return cached["offsets"]
+        except (OSError, ValueError, KeyError):
+            pass
+        offsets = {}
+        for ordinal, offset, scenario in self.iter_entries(path):
+            key = scenario_id(scenario, ordinal)
+            if key in offsets:
+                raise DuplicateScenarioError(
+                    f"Scenario id '{key}' is used by scenarios {offsets[key][0]} and {ordinal} of {path}."
+                )
+            offsets[key] = [ordinal, offset]
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(dict(stamp, offsets=offsets), f)
+            os.replace(tmp_path, index_path)
+        except OSError:
+            # The index is only a cache; a read-only checkout still works without it
+            pass
+        return offsets
+
+    def load_scenario(self, path, scenario_id, offsets=None):
+        """
+        Loads the scenario with the given id from path without parsing the rest of the file.
+        offsets, as returned by build_index, saves re-reading the index when loading many ids.
+        """
+        if offsets is None:
+            offsets = self.build_index(path)
+        entry = offsets.get(str(scenario_id))
+        if entry is None:
+            raise KeyError(f"Scenario '{scenario_id}' not found in {path}.")
+        with open(path, "rb") as f:
+            f.seek(entry[1])
+            return json.loads(f.readline())
@@ -0,0 +1,201 @@
+import ast
+import copy
+import hashlib
+import json
+import os
+import pickle
+import re
+
+from agent_test.src.agent_utils.discovery_index import default_cache_dir
+from agent_test.src.agent_utils.models.api_mock_type import APIMockType
+
+COMPILER_VERSION = 1
+COMPILED_DIR = "compiled_scenarios"
+
+# Quoted arguments of feature steps, e.g. '{"content": "hello"}'
+_STEP_LITERAL = re.compile(r"'(.*?)'(?=\s|$)")
+_STEP_KEYWORDS = ("Given", "When", "Then", "And", "But", "*")
+
+# Parsed step literals of the current process, shared by every feature step
+_literals = {}
+
+
+def literal(text):
+    """
+    ast.literal_eval with a process-wide memo of the parse, primed from compiled features.
+    Every call returns a fresh copy: orchestrators mutate the states they are given,
+    and the next scenario reusing the same step text must see the original value.
+    """
+    value = _literals.get(text, _literals)
+    if value is _literals:
+        value = ast.literal_eval(text)
+        _literals[text] = value
+    return copy.deepcopy(value)
+
+
+class ScenarioCompileError(ValueError):
+    """Raised when a scenario file does not describe valid scenarios."""
+
+
+class CompiledFeature:
+    """A .feature file: its scenarios as (name, [step text, ...]) and every parsed step literal."""
+    __slots__ = ("source", "scenarios", "literals")
+
+    def __init__(self, source, scenarios, literals):
+        self.source = source
+        self.scenarios = scenarios
+        self.literals = literals
+
+
+class ScenarioCompiler:
+    """
+    Compiles JSON and .feature scenario files into a validated form and caches it as a
+    pickle keyed by the source content hash. Warm runs load the pickle and skip parsing,
+    validation, APIMockType resolution and literal evaluation.
+    JSON scenarios come back as dicts in the shape execute_scenario reads, with every
+    default filled in and api_type resolved to an APIMockType. With resolve_agents the
+    agent and tool names are checked against the discovery registry of the scenario's
+    root_path at compile time.
+    """
+
+    def __init__(self, cache_dir=None, resolve_agents=False, default_root_path=None):
+        self.cache_dir = cache_dir or os.path.join(default_cache_dir(), COMPILED_DIR)
+        self.resolve_agents = resolve_agents
+        self.default_root_path = default_root_path
+
+    def load(self, path):
+        """Returns the compiled scenarios of path, compiling and caching them on a cache miss."""
+        with open(path, "rb") as f:
+            source = f.read()
+        digest = hashlib.sha256(source).hexdigest()
+        cache_path = os.path.join(self.cache_dir, f"{digest}.{COMPILER_VERSION}.{int(self.resolve_agents)}.pickle")
+        compiled = self._load_cached(cache_path)
+        if compiled is None:
+            compiled = self.compile(path, source)
+            self._store(cache_path, compiled)
+        elif self.resolve_agents and isinstance(compiled, list):
+            # The key covers the source, not the registry: agents may have been renamed or removed since
+            for index, scenario in enumerate(compiled):
+                self._check_agents(scenario, f"{path}[{index}]")
+        if isinstance(compiled, CompiledFeature):
+            _literals.update(compiled.literals)
+        return compiled
+
+    def _load_cached(self, cache_path):
+        try:
+            if not _trusted(cache_path):
+                return None
+            with open(cache_path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+    def parse(self, path):
+        """Loader interface: the compiled scenarios of a JSON file, in place of JSONFeatureLoader.parse."""
+        return self.load(path)
+
+    def compile(self, path, source):
+        if path.endswith(".feature"):
+            return self.compile_feature(path, source.decode("utf-8"))
+        try:
+            scenarios = json.loads(source)
+        except ValueError as exc:
+            raise ScenarioCompileError(f"{path}: invalid JSON ({exc})") from exc
+        if not isinstance(scenarios, list):
+            raise ScenarioCompileError(f"{path}: expected a list of scenarios")
+        return [self.compile_scenario(scenario, f"{path}[{index}]") for index, scenario in enumerate(scenarios)]
+
+    def compile_scenario(self, scenario, where):
+        if not isinstance(scenario, dict) or "input_state" not in scenario:
+            raise ScenarioCompileError(f"{where}: a scenario must be an object with an input_state")
+        compiled = dict(scenario)
+        compiled["mock_api_calls"] = [self._compile_api_mock(mock, where) for mock in scenario.get("mock_api_calls", [])]
+        compiled["agent_responses"] = [
+            {"agent_name": _required(resp, "agent_name", where), "response_state": _required(resp, "response_state", where)}
+            for resp in scenario.get("agent_responses", [])
+        ]
+        compiled["expect_agent_invocations"] = [
+            {
+                "agent_name": _required(expect, "agent_name", where),
+                "state": _required(expect, "state", where),
+                "agent_type": expect.get("agent_type", "invoke"),
+                "ntimes": expect.get("ntimes", 1),
+            }
+            for expect in scenario.get("expect_agent_invocations", [])
+        ]
+        if self.resolve_agents:
+            self._check_agents(compiled, where)
+        return compiled
+
+    def _compile_api_mock(self, api_mock, where):
+        api_type = api_mock.get("api_type", "REQUESTS")
+        if not isinstance(api_type, APIMockType):
+            try:
+                api_type = APIMockType[api_type]
+            except KeyError:
+                raise ScenarioCompileError(f"{where}: unknown api_type '{api_type}'") from None
+        return {
+            "api_path": _required(api_mock, "api_path", where),
+            "payload": _required(api_mock, "payload", where),
+            "return_value": _required(api_mock, "return_value", where),
+            "api_type": api_type,
+        }
+
+    def _check_agents(self, compiled, where):
+        from agent_test.src.agent_utils.models.global_metadata import GlobalMetadata
+        root_path = compiled.get("root_path") or self.default_root_path
+        if root_path is None:
+            raise ScenarioCompileError(f"{where}: resolve_agents needs a root_path")
+        registry = GlobalMetadata.get_discovery(root_path)
+        names = [resp["agent_name"] for resp in compiled["agent_responses"]]
+        names += [expect["agent_name"] for expect in compiled["expect_agent_invocations"]]
+        unknown = sorted({name for name in names if name not in registry.agents and name not in registry.tools})
+        if unknown:
+            raise ScenarioCompileError(f"{where}: unknown agents {unknown} in '{root_path}'")
+
+    def compile_feature(self, path, text):
+        scenarios = []
+        literals = {}
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            line = line.strip()
+            if line.startswith(("Scenario:", "Scenario Outline:")):
+                scenarios.append((line.split(":", 1)[1].strip(), []))
+            elif line.startswith(_STEP_KEYWORDS) and scenarios:
+                scenarios[-1][1].append(line)
+                for match in _STEP_LITERAL.finditer(line):
+                    try:
+                        literals[match.group(1)] = ast.literal_eval(match.group(1))
+                    except (ValueError, SyntaxError):
+                        # Not every quoted argument is a literal (e.g. plain words)
+                        continue
+        return CompiledFeature(path, scenarios, literals)
+
+    def _store(self, cache_path, compiled):
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Whatever the umask, only files no one else can write are trusted on load
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, cache_path)
+        except (OSError, pickle.PicklingError):
+            # The cache is an optimization; an unwritable cache dir must not fail the run
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def _trusted(cache_path):
+    """Only unpickle cache files written by this user and not writable by anyone else."""
+    stat = os.stat(cache_path)
+    if hasattr(os, "getuid") and stat.st_uid != os.getuid():
+        return False
+    return not stat.st_mode & 0o022
+
+
+def _required(entry, key, where):
+    if not isinstance(entry, dict) or key not in entry:
+        raise ScenarioCompileError(f"{where}: missing '{key}' in {entry!r}")
+    return entry[key]
@@ -0,0 +1,240 @@
+import argparse
+import glob
+import json
+import pkgutil
+import sys
+import time
+import traceback
+from collections import namedtuple
+import itertools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from agent_test.src.common.workers import resolve_workers
+from agent_test.src.fixture.data_loader.json_feature_loader import JSONFeatureLoader
+from agent_test.src.fixture.data_loader.jsonl_feature_loader import JSONLFeatureLoader, scenario_id
+from agent_test.src.fixture.data_loader.scenario_compiler import ScenarioCompiler
+from agent_test.src.fixture.patch_session import PatchSession
+
+# One executed scenario: source file, position in the file, outcome and wall time in seconds
+ScenarioResult = namedtuple("ScenarioResult", ["source", "index", "passed", "duration", "error"])
+
+# Per-process runner state, so each pool worker keeps its loader, orchestrator and patches warm
+_worker = {}
+
+
+class RunReport:
+    """Aggregated outcome of a scenario run."""
+
+    def __init__(self, results, wall_time):
+        self.results = sorted(results, key=lambda result: (result.source, result.index))
+        self.wall_time = wall_time
+
+    @property
+    def passed(self):
+        return [result for result in self.results if result.passed]
+
+    @property
+    def failed(self):
+        return [result for result in self.results if not result.passed]
+
+    @property
+    def ok(self):
+        return not self.failed
+
+    def summary(self):
+        lines = [
+            f"{len(self.results)} scenarios: {len(self.passed)} passed, {len(self.failed)} failed "
+            f"in {self.wall_time:.2f}s"
+        ]
+        for result in self.failed:
+            lines.append(f"FAILED {result.source}[{result.index}] ({result.duration:.3f}s): {result.error}")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return {
+            "total": len(self.results),
+            "passed": len(self.passed),
+            "failed": len(self.failed),
+            "wall_time": self.wall_time,
+            "scenarios": [result._asdict() for result in self.results],
+        }
+
+
+def expand_patterns(patterns):
+    """Files matching the glob patterns, sorted and without duplicates."""
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    files = set()
+    for pattern in patterns:
+        files.update(glob.glob(pattern, recursive=True))
+    return sorted(files)
+
+
+def _loader_for(source):
+    return JSONLFeatureLoader() if source.endswith(".jsonl") else JSONFeatureLoader()
+
+
+def iter_tasks(patterns, scenario_ids=None, compiled=False):
+    """
+    Yields (source, index, scenario) for the scenario files matching patterns, lazily.
+    With scenario_ids only those scenarios run; .jsonl files are then read through their
+    byte-offset index instead of being parsed in full. With compiled, .json files are
+    read from the ScenarioCompiler cache (validated on the first run).
+    """
+    wanted = {str(value) for value in scenario_ids} if scenario_ids is not None else None
+    compiler = ScenarioCompiler() if compiled else None
+    for source in expand_patterns(patterns):
+        loader = _loader_for(source)
+        if compiler is not None and source.endswith(".json"):
+            loader = compiler
+        if wanted is not None and isinstance(loader, JSONLFeatureLoader):
+            offsets = loader.build_index(source)
+            for value in sorted(wanted & offsets.keys(), key=lambda value: offsets[value][0]):
+                yield source, offsets[value][0], loader.load_scenario(source, value, offsets)
+            continue
+        if isinstance(loader, JSONLFeatureLoader):
+            entries = ((index, scenario) for index, _, scenario in loader.iter_entries(source))
+        else:
+            entries = enumerate(loader.parse(source))
+        for index, scenario in entries:
+            if wanted is None or scenario_id(scenario, index) in wanted:
+                yield source, index, scenario
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def _bounded_map(executor, fn, chunks, in_flight):
+    """executor.map that keeps at most in_flight chunks submitted, so tasks are read as they are consumed."""
+    pending = []
+    for chunk in chunks:
+        pending.append(executor.submit(fn, chunk))
+        if len(pending) >= in_flight:
+            yield pending.pop(0).result()
+    for future in pending:
+        yield future.result()
+
+
+def _resolve_orchestrator(orchestrator):
+    """Accepts a callable or a 'package.module:attr' path, e.g. 'pkg.orchestrator_code:orchestrator_graph.invoke'."""
+    if callable(orchestrator):
+        return orchestrator
+    return pkgutil.resolve_name(orchestrator)
+
+
+def _init_worker(orchestrator, root_path, use_session):
+    _worker["loader"] = JSONFeatureLoader()
+    _worker["orchestrator"] = _resolve_orchestrator(orchestrator)
+    _worker["root_path"] = root_path
+    _worker["session"] = PatchSession() if use_session else None
+
+
+def _close_worker():
+    session = _worker.pop("session", None)
+    if session is not None:
+        session.close()
+    _worker.clear()
+
+
+def _run_chunk(chunk):
+    """Executes [(source, index, scenario), ...] with the warm worker state."""
+    results = []
+    for source, index, scenario in chunk:
+        if _worker["root_path"] and "root_path" not in scenario:
+            scenario = dict(scenario, root_path=_worker["root_path"])
+        start = time.perf_counter()
+        try:
+            _worker["loader"].execute_scenario(scenario, _worker["orchestrator"], patch_session=_worker["session"])
+            error = None
+        except Exception as exc:  # noqa: BLE001 - a failing scenario must not stop the run
+            error = f"{type(exc).__name__}: {exc}"
+            if not isinstance(exc, AssertionError):
+                error += "\n" + traceback.format_exc(limit=5)
+        results.append(ScenarioResult(source, index, error is None, time.perf_counter() - start, error))
+    return results
+
+
+def _resolve_workers(workers):
+    """Resolves the scenario worker count, defaulting to AGENT_TEST_SCENARIO_WORKERS (one per CPU if unset)."""
+    return resolve_workers(workers, "AGENT_TEST_SCENARIO_WORKERS", default=-1)
+
+
+def run_scenarios(patterns, orchestrator, root_path=None, workers=None, use_session=True, mode="process",
+                  scenario_ids=None, chunk_size=None, compiled=False):
+    """
+    Runs every scenario in the JSON files matching patterns and returns a RunReport.
+
+    orchestrator is the function each scenario invokes with its input state, given as a
+    callable or as a 'package.module:attr' path (needed for process pools under spawn).
+    workers is the process count; None reads AGENT_TEST_SCENARIO_WORKERS, negative means
+    one per CPU, and 0 or 1 runs inline. Each worker keeps one loader and one PatchSession,
+    so agent patches and discovery are set up once per process rather than per scenario.
+    mode="thread" runs the workers as threads of this process sharing one PatchSession;
+    each scenario's mocks are bound to its own thread, which suits orchestrators that
+    mostly block on I/O. Thread mode requires use_session.
+    Scenario files are read lazily (.jsonl files line by line) and handed to workers in
+    chunks of chunk_size, so large corpora are never loaded whole. scenario_ids limits
+    the run to scenarios with those ids (their "id" field, else their position).
+    compiled reads .json files through the compiled scenario cache.
+    """
+    if mode not in ("process", "thread"):
+        raise ValueError(f"Unsupported mode '{mode}': use 'process' or 'thread'.")
+    if mode == "thread" and not use_session:
+        raise ValueError("Thread mode needs use_session: per-scenario patches are process-global.")
+    tasks = iter_tasks(patterns, scenario_ids, compiled)
+    workers = _resolve_workers(workers)
+    start = time.perf_counter()
+    results = []
+    if workers <= 1 or mode == "thread":
+        _init_worker(orchestrator, root_path, use_session)
+        try:
+            if workers <= 1:
+                results = _run_chunk(tasks)
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for chunk_results in _bounded_map(executor, _run_chunk, _chunks(tasks, chunk_size or 1), workers * 4):
+                        results.extend(chunk_results)
+        finally:
+            _close_worker()
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(orchestrator, root_path, use_session)
+        ) as executor:
+            for chunk_results in _bounded_map(executor, _run_chunk, _chunks(tasks, chunk_size or 8), workers * 4):
+                results.extend(chunk_results)
+    return RunReport(results, time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run JSON agent test scenarios across a process pool.")
+    parser.add_argument("patterns", nargs="+", help="Scenario file globs (.json or .jsonl), e.g. 'tests/test_scenarios*.json'")
+    parser.add_argument("--orchestrator", required=True, help="'package.module:attr' of the function to invoke")
+    parser.add_argument("--root-path", default=None, help="Package scanned for agents when a scenario sets none")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--mode", choices=["process", "thread"], default="process",
+                        help="Run workers as processes (default) or as threads sharing one PatchSession")
+    parser.add_argument("--id", dest="scenario_ids", action="append", default=None,
+                        help="Only run the scenario with this id (repeatable)")
+    parser.add_argument("--compiled", action="store_true",
+                        help="Read .json scenarios from the compiled scenario cache, compiling on a miss")
+    parser.add_argument("--no-session", action="store_true", help="Patch agents per scenario instead of per worker")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the full report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    report = run_scenarios(
+        args.patterns, args.orchestrator, root_path=args.root_path,
+        workers=args.workers, use_session=not args.no_session, mode=args.mode,
+        scenario_ids=args.scenario_ids, compiled=args.compiled,
+    )
+    print(report.summary())
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,37 @@
 # FixtureLibrary: Chainable test fixture builder for agent orchestration
 
+import contextlib
+import os
+import time
+
 import pytest
 from agent_test.src.agent_utils.models.api_mock_type import APIMockType
 from agent_test.src.agent_utils.models.global_metadata import GlobalMetadata
-from agent_test.src.common.agent_test_logger import AgentTestLogger
-from unittest.mock import AsyncMock, Mock, patch
-from agent_test.src.agent_utils.remoterunnable_utils import find_all_remoterunnables, find_all_tools
+from agent_test.src.common.agent_test_logger import AgentTestLogger, debug_event
+from agent_test.src.common.timeline import Timeline
+from agent_test.src.agent_utils.remoterunnable_utils import discover_package
 from agent_test.src.agent_utils.models.agent_info import AgentInfo
+from agent_test.src.fixture.patch_session import PatchSession, ScenarioScope
+from agent_test.src.fixture.agent_stub import StubPatcher, create_method_stub
+from agent_test.src.fixture.asgi_transport import InProcessApps
+from agent_test.src.fixture.call_ledger import CallLedger
+from agent_test.src.fixture.cassette import (
+    CassettePlayer, CassetteWriter, load_cassette, recording, replaying, unpatched_method,
+)
+from agent_test.src.fixture.latency import REAL_CLOCK, as_latency_model
+from agent_test.src.fixture.load_test import arun_load_test, run_load_test
+from agent_test.src.fixture.mock_llm import as_llm_script, llm_patchers
+from agent_test.src.fixture.state_diff import mismatch_report
+from agent_test.src.fixture.mock_api.route_table import RouteTable
 
 logger = AgentTestLogger.get_logger()
 
 
 
 class FixtureLibrary:
-    def __init__(self, root_path: str = None):
+    def __init__(self, root_path: str = None, use_index: bool = None, static: bool = None, workers: int = None,
+                 share_discovery: bool = True, patch_session: PatchSession = None, instrument: bool = None,
+                 clock=None):
         if root_path is None:
             # Use current package path if available, else fallback to 'orchestrator'
             root_path = __package__ if __package__ else "orchestrator"
@@ -24,51 +42,86 @@ class FixtureLibrary:
         self._patchers = []
         self.results = []
         self._root_path = root_path
-        # Load all agent info dict at initialization
-        self.agent_info_dict = find_all_remoterunnables(self._root_path)
-        self.tool_dict = find_all_tools(self._root_path)
-        logger.debug(f"__init__: Initialized FixtureLibrary with members: "
-                 f"_input_state={self._input_state}, "
-                 f"_api_mocks={self._api_mocks}, "
-                 f"_agent_invocations={self._agent_invocations}, "
-                 f"_agent_responses={self._agent_responses}, "
-                 f"_patchers={self._patchers}, "
-                 f"agent_info_dict keys={list(self.agent_info_dict.keys())}, "
-                 f"tool_dict keys={list(self.tool_dict.keys())}")
+        # In session mode agent/tool and API targets stay patched in the PatchSession and
+        # only this scope (stubs and route tables) is activated per scenario, for the
+        # current task/thread, so scenarios sharing a session can run concurrently.
+        self._patch_session = patch_session
+        self._scope = ScenarioScope() if patch_session is not None else None
+        self._scope_token = None
+        # (agent_name, method) -> stub, with a structural-hash index of recorded inputs
+        self._ledger = CallLedger()
+        # api_path -> RouteTable shared by every payload mocked for that path
+        self._api_routes = {}
+        # Cassettes being recorded; their index is written when the scenario exits
+        self._cassette_writers = []
+        # With instrument (or AGENT_TEST_INSTRUMENT=1) discovery, patching, every mocked
+        # agent/tool/API call and each invoke_* are timed on this scenario's timeline.
+        if instrument is None:
+            instrument = os.environ.get("AGENT_TEST_INSTRUMENT", "").lower() in ("1", "true", "yes")
+        self.timeline = Timeline() if instrument else None
+        # Mocks given a latency wait on this clock: real sleeps, or a VirtualClock's simulated time
+        self.clock = clock or REAL_CLOCK
+        # Scripted responder answering the LLM calls, set by mock_llm_response
+        self.llm = None
+        discovery_start = time.perf_counter()
+        # Load agents and tools in a single discovery pass; None flags defer to the AGENT_TEST_* env vars.
+        # By default the read-only registry is borrowed from the process-wide cache keyed by root_path and the options.
+        discovery_options = dict(use_index=use_index, static=static, workers=workers)
+        if share_discovery:
+            self.discovery = GlobalMetadata.get_discovery(self._root_path, **discovery_options)
+        else:
+            self.discovery = discover_package(self._root_path, **discovery_options)
+        if self.timeline is not None:
+            self.timeline.record("discovery", self._root_path, discovery_start, time.perf_counter())
+        self.agent_info_dict = self.discovery.agents
+        self.tool_dict = self.discovery.tools
+        debug_event(logger, "__init__", root_path=self._root_path,
+                    agents=list(self.agent_info_dict), tools=list(self.tool_dict))
 
     def when_input_state(self, state):
-        logger.debug(f"when_input_state: called with state={state}")
+        debug_event(logger, "when_input_state", state=state)
         self._input_state = state
-        logger.debug(f"when_input_state: _input_state set to {self._input_state}")
         return self
     
-    def mock_tool_response(self, tool_name, response_state):
-        logger.debug(
-            f"mock_tool_response: called with tool_name={tool_name}, response_state={response_state}"
-        )
+    def mock_tool_response(self, tool_name, response_state, latency=None):
+        debug_event(logger, "mock_tool_response", tool_name=tool_name, response_state=response_state)
+        latency = as_latency_model(latency)
         # Use tool_dict to infer the patch path for the tool
         tool_info = self._get_tool_info(tool_name)
         module_path = tool_info.agent_path
         for method in ["invoke", "ainvoke", "batch"]:
-            patcher = self._create_agent_patcher(module_path, method, response_state)
+            if self._patch_session is not None:
+                self._set_session_response(tool_name, module_path, method, response_state, latency)
+                continue
+            patcher = self._create_agent_patcher(tool_name, module_path, method, response_state, latency)
             self._patchers.append((patcher, tool_name, method))
-        logger.debug(f"mock_tool_response: _patchers updated: {self._patchers}")
         return self
 
-    def mock_api_call(self, api_path, payload, return_value, api_type:APIMockType=APIMockType.REQUESTS):
-        logger.debug(f"mock_api_call: called with api_path={api_path}, payload={payload}, return_value={return_value}")
-        patcher_class = GlobalMetadata.identify_patcher_type(api_type)
-        patcher = patcher_class().create_patcher(api_path, payload, return_value)
-        self._patchers.append((patcher, None, None))
+    def mock_api_call(self, api_path, payload, return_value, api_type:APIMockType=APIMockType.REQUESTS, latency=None):
+        debug_event(logger, "mock_api_call", api_path=api_path, payload=payload, return_value=return_value)
+        # One patch per api_path; every payload registered for it becomes a route in its table
+        route_table = self._api_routes.get(api_path)
+        if route_table is None:
+            patcher_class = GlobalMetadata.identify_patcher_type(api_type)
+            route_table = RouteTable(api_path, patcher_class())
+            route_table.timeline = self.timeline
+            route_table.clock = self.clock
+            self._api_routes[api_path] = route_table
+            if self._patch_session is not None:
+                self._patch_session.ensure_api_patched(api_path, route_table.api_mock)
+                self._scope.api_routes[api_path] = route_table
+            else:
+                self._patchers.append((route_table.create_patcher(), None, None))
+        elif route_table.api_mock.get_api_type() != api_type:
+            raise ValueError(
+                f"api_path '{api_path}' is already mocked as {route_table.api_mock.get_api_type()}, not {api_type}."
+            )
+        route_table.add(payload, return_value, as_latency_model(latency))
         self._api_mocks.append((api_path, payload, return_value))
-        logger.debug(f"mock_api_call: _patchers updated: {self._patchers}")
-        logger.debug(f"mock_api_call: _api_mocks updated: {self._api_mocks}")
         return self
 
     def expect_agent_invocation(self, agent_name, state, agent_type="invoke", ntimes=1):
-        logger.debug(
-            f"expect_agent_invocation: called with agent_name={agent_name}, state={state}"
-        )
+        debug_event(logger, "expect_agent_invocation", agent_name=agent_name, state=state)
         if (
             self.was_agent_method_called(
                 agent_name, agent_type, ntimes, input_args=state
@@ -80,62 +133,175 @@ class FixtureLibrary:
             )
         return self
 
-    def mock_agent_response(self, agent_name, response_state):
-        logger.debug(
-            f"mock_agent_response: called with agent_name={agent_name}, response_state={response_state}"
-        )
+    def mock_agent_response(self, agent_name, response_state, latency=None):
+        """
+        Mocks invoke, ainvoke and batch of agent_name to return response_state. latency (a
+        LatencyModel or seconds) delays each call: time.sleep for invoke/batch and
+        asyncio.sleep for ainvoke, or simulated time with a VirtualClock.
+        """
+        debug_event(logger, "mock_agent_response", agent_name=agent_name, response_state=response_state)
+        latency = as_latency_model(latency)
         # Use agent_info_dict to infer the patch path
         agent_info = self._get_agent_info(agent_name)
         module_path = agent_info.agent_path
         for method in ["invoke", "ainvoke", "batch"]:
-            patcher = self._create_agent_patcher(module_path, method, response_state)
+            if self._patch_session is not None:
+                self._set_session_response(agent_name, module_path, method, response_state, latency)
+                continue
+            patcher = self._create_agent_patcher(agent_name, module_path, method, response_state, latency)
             self._patchers.append((patcher, agent_name, method))
         self._agent_responses.append((agent_name, response_state))
-        logger.debug(f"mock_agent_response: _patchers updated: {self._patchers}")
-        logger.debug(f"mock_agent_response: _agent_responses updated: {self._agent_responses}")
         return self
 
+    def record_cassette(self, path, agent_names=None):
+        """
+        Record mode: the agents (default: every discovered agent) keep calling their real
+        workers, e.g. the examples/common workers run locally, and each invoke/ainvoke/batch
+        request and response is appended to the cassette at path.
+        """
+        debug_event(logger, "record_cassette", path=path, agent_names=agent_names)
+        writer = CassetteWriter(path)
+        self._cassette_writers.append(writer)
+        for agent_name in agent_names or list(self.agent_info_dict):
+            module_path = self._get_agent_or_tool_info(agent_name).agent_path
+            for method in ["invoke", "ainvoke", "batch"]:
+                original = unpatched_method(module_path, method)
+                self._stub_agent_method(agent_name, module_path, method, recording(writer, agent_name, method, original))
+        return self
+
+    def replay_cassette(self, path, agent_names=None):
+        """
+        Replay mode: the agents (default: every agent in the cassette) answer each request
+        with the response recorded for it, looked up by request hash in the memory-mapped
+        cassette, in place of mock_agent_response payloads. Unrecorded requests raise CassetteMiss.
+        """
+        debug_event(logger, "replay_cassette", path=path, agent_names=agent_names)
+        player = CassettePlayer(load_cassette(path))
+        for agent_name in agent_names or sorted(player.cassette.agents()):
+            module_path = self._get_agent_or_tool_info(agent_name).agent_path
+            for method in ["invoke", "ainvoke", "batch"]:
+                self._stub_agent_method(agent_name, module_path, method, replaying(player, agent_name, method))
+        return self
+
+    def serve_in_process(self, apps):
+        """
+        Integration mode: the real worker and API apps answer in-process instead of mocks.
+        apps maps the origin a service would listen on to its FastAPI app (or "module:attr"),
+        e.g. {"http://localhost:8001": "examples.common.worker1.main:app"}. Discovered
+        RemoteRunnables pointing at those origins, httpx's module functions and requests
+        are routed to the apps through an ASGI transport, without sockets or servers.
+        """
+        debug_event(logger, "serve_in_process", apps=list(apps))
+        apps = InProcessApps(apps)
+        if self._patch_session is not None:
+            # The session routes HTTP calls once and sends them to the active scope's apps
+            self._patch_session.ensure_apps_patched(apps, self.agent_info_dict)
+            self._scope.apps = apps
+            return self
+        for patcher in apps.patchers(self.agent_info_dict):
+            self._patchers.append((patcher, None, None))
+        return self
+
+    def mock_llm_response(self, script):
+        """
+        Answers OpenAI client chat completions and ChatOpenAI calls (including bind_tools)
+        from a script instead of the model: a list of replies in call order, a
+        {pattern: reply} rule table or RuleScript matched against the prompt, a
+        StateMachineScript, or a callable taking the prompt. A reply is routing JSON
+        (a dict, e.g. {"next_agent": "a1"}), plain text, {"tool_calls": [{"name": ..., "args": {...}}]}
+        or an LLMReply. Prompts without a reply raise LLMScriptError.
+        """
+        debug_event(logger, "mock_llm_response", script=type(script).__name__)
+        self.llm = as_llm_script(script)
+        if self._patch_session is not None:
+            # The session patches the LLM once and answers from the active scope's script
+            self._patch_session.ensure_llm_patched()
+            self._scope.llm = self.llm
+            return self
+        for patcher in llm_patchers(self.llm):
+            self._patchers.append((patcher, None, None))
+        return self
+
+    def expect_llm_calls(self, ntimes):
+        if self.llm is None:
+            raise ValueError("No scripted LLM; call mock_llm_response first.")
+        call_count = len(self.llm.prompts)
+        assert call_count == ntimes, f"Expected {ntimes} LLM calls, but got {call_count}"
+        return self
+
+    def _get_agent_or_tool_info(self, name):
+        if name in self.agent_info_dict:
+            return self.agent_info_dict[name]
+        return self._get_tool_info(name) if name in self.tool_dict else self._get_agent_info(name)
+
     def _get_agent_info(self, agent_name):
         agent_info: AgentInfo = self.agent_info_dict.get(agent_name)
         if agent_info is None:
             raise ValueError(f"Agent '{agent_name}' not found in agent_info_dict.")
-        logger.debug(f"_get_agent_info: Found agent_info: {agent_info}  for agent_name: {agent_name}")
+        debug_event(logger, "_get_agent_info", agent_name=agent_name, agent_info=agent_info)
         return agent_info
     
     def _get_tool_info(self, tool_name):
         tool_info: AgentInfo = self.tool_dict.get(tool_name)
         if tool_info is None:
             raise ValueError(f"Tool '{tool_name}' not found in tool_dict.")
-        logger.debug(f"_get_tool_info: Found tool_info: {tool_info}  for tool_name: {tool_name}")
+        debug_event(logger, "_get_tool_info", tool_name=tool_name, tool_info=tool_info)
         return tool_info
 
-    def _create_agent_patcher(self, module_path, method, response_state):
-        patch_path = f"{module_path}.{method}"
-        if method in ["ainvoke"]:
-            # Patch async methods to return a coroutine resolved to response_state
-            async_mock = AsyncMock()
-            async_mock.return_value = response_state
-            return patch(patch_path, new=async_mock)
+    def _set_session_response(self, agent_name, module_path, method, response_state, latency=None):
+        patch_path = self._patch_session.ensure_patched(module_path, method)
+        stub = create_method_stub(method, return_value=response_state, timeline=self.timeline,
+                                  name=f"{agent_name}.{method}", latency=latency, clock=self.clock,
+                                  snapshot=self._ledger.snapshotter.snapshot_call)
+        self._scope.stubs[patch_path] = stub
+        self._ledger.track(agent_name, method, stub)
+
+    def _create_agent_patcher(self, agent_name, module_path, method, response_state, latency=None):
+        # ainvoke gets an awaitable stub resolving to response_state
+        stub = create_method_stub(method, return_value=response_state, timeline=self.timeline,
+                                  name=f"{agent_name}.{method}", latency=latency, clock=self.clock,
+                                  snapshot=self._ledger.snapshotter.snapshot_call)
+        self._ledger.track(agent_name, method, stub)
+        return StubPatcher(module_path, method, stub)
+
+    def _stub_agent_method(self, agent_name, module_path, method, side_effect):
+        stub = create_method_stub(method, side_effect=side_effect, timeline=self.timeline, name=f"{agent_name}.{method}",
+                                  snapshot=self._ledger.snapshotter.snapshot_call)
+        self._ledger.track(agent_name, method, stub)
+        if self._patch_session is not None:
+            self._scope.stubs[self._patch_session.ensure_patched(module_path, method)] = stub
         else:
-            return patch(patch_path, return_value=response_state)
+            self._patchers.append((StubPatcher(module_path, method, stub), agent_name, method))
 
     def __enter__(self):
-        logger.debug("__enter__: called. Starting all patchers.")
+        debug_event(logger, "__enter__", patchers=len(self._patchers))
+        if self._patch_session is not None:
+            self._scope_token = self._patch_session.activate(self._scope)
         self._started_patches = self._start_all_patchers()
-        logger.debug(f"__enter__: _started_patches: {self._started_patches}")
         return self
 
     def _start_all_patchers(self):
-        return [patcher.start() for patcher, _, _ in self._patchers]
+        if self.timeline is None:
+            return [patcher.start() for patcher, _, _ in self._patchers]
+        with self.timeline.span("patch_start", "patchers"):
+            return [patcher.start() for patcher, _, _ in self._patchers]
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        logger.debug("__exit__: called. Stopping all patchers.")
+        debug_event(logger, "__exit__", patchers=len(self._patchers))
         self._stop_all_patchers()
-        logger.debug("__exit__: All patchers stopped.")
+        for writer in self._cassette_writers:
+            writer.close()
+        if self._scope_token is not None:
+            self._patch_session.deactivate(self._scope_token)
+            self._scope_token = None
 
     def _stop_all_patchers(self):
-        for patcher, _, _ in self._patchers:
+        # Reverse order so a target patched twice is restored to its real original
+        start = time.perf_counter()
+        for patcher, _, _ in reversed(self._patchers):
             patcher.stop()
+        if self.timeline is not None:
+            self.timeline.record("patch_stop", "patchers", start, time.perf_counter())
 
     def run(self, test_func):
         # logger.debug(f"run: called with test_func={test_func}")
@@ -145,52 +311,70 @@ class FixtureLibrary:
         return result
 
     def invoke_function(self, func):
-        logger.debug(f"invoke_function: called with func={func} and _input_state={self._input_state} and type of _input_state={type(self._input_state)} and type of func={type(func)}")
-        with self:
+        debug_event(logger, "invoke_function", func=func, input_state=self._input_state)
+        with self, self._invoke_span(func):
             result = func(self._input_state)
         self.results.append(result)
         return self
 
     def invoke_graph(self, graph):
-        logger.debug(f"invoke_graph: called with graph={graph} and _input_state={self._input_state} and type of _input_state={type(self._input_state)} and type of graph={type(graph)}")
-        with self:
+        debug_event(logger, "invoke_graph", graph=graph, input_state=self._input_state)
+        with self, self._invoke_span(graph):
             result = graph.invoke(self._input_state)
         self.results.append(result)
         return self
 
+    async def ainvoke_function(self, func):
+        debug_event(logger, "ainvoke_function", func=func, input_state=self._input_state)
+        with self, self._invoke_span(func):
+            result = await func(self._input_state)
+        self.results.append(result)
+        return self
+
     async def ainvoke_graph(self, graph):
-        logger.debug(f"invoke_graph: called with graph={graph} and _input_state={self._input_state} and type of _input_state={type(self._input_state)} and type of graph={type(graph)}")
-        with self:
+        debug_event(logger, "ainvoke_graph", graph=graph, input_state=self._input_state)
+        with self, self._invoke_span(graph):
             result = await graph.ainvoke(self._input_state)
         self.results.append(result)
         return self
 
-    def cleanup(self):
-        self._stop_all_patchers()
-
-    def _get_patch_index_by_agent(self, agent_name, method=None):
+    def load_test(self, target, inputs=None, requests=None, duration=None, concurrency=None, rate=None,
+                  record=False):
         """
-        Returns the index of the patch for a given agent and method (e.g., 'invoke', 'ainvoke', 'batch').
-        If method is None, returns all indices for the agent.
+        Load-tests a sync graph or function against this fixture's mocks: agents answer
+        instantly and their calls are not recorded (unless record), so the report
+        (throughput and p50/p95/p99 latency) is the orchestrator's own capacity. inputs
+        is an iterable of states, a callable index -> state, or None to repeat
+        when_input_state's state. See run_load_test.
         """
-        indices = []
-        for i, patch_info in enumerate(self._patchers):
-            # patch_info is (patcher, agent_name, method) for agent patches, or just patcher for others
-            if isinstance(patch_info, tuple) and len(patch_info) == 3:
-                _, patch_agent_name, patch_method = patch_info
-                if patch_agent_name == agent_name:
-                    if method is None or patch_method == method:
-                        indices.append(i)
-        return indices if method is None else (indices[0] if indices else None)
+        debug_event(logger, "load_test", target=target, requests=requests, duration=duration,
+                    concurrency=concurrency, rate=rate)
+        return run_load_test(self, target, inputs, requests, duration, concurrency, rate, record)
 
-    def _was_patch_called(self, patch_index):
-        """
-        Returns True if the patch at patch_index was called during the test run.
-        """
-        if not hasattr(self, '_started_patches'):
-            raise RuntimeError("Patches have not been started. Use within a context manager.")
-        mock_obj = self._started_patches[patch_index]
-        return getattr(mock_obj, 'called', False)
+    async def aload_test(self, target, inputs=None, requests=None, duration=None, concurrency=None, rate=None,
+                         record=False):
+        """load_test for an async graph (ainvoke) or coroutine function."""
+        debug_event(logger, "aload_test", target=target, requests=requests, duration=duration,
+                    concurrency=concurrency, rate=rate)
+        return await arun_load_test(self, target, inputs, requests, duration, concurrency, rate, record)
+
+    def _invoke_span(self, target):
+        # Entered inside `with self`, so patch start/stop is not counted as orchestrator time;
+        # an invoke that raises is recorded too
+        if self.timeline is None:
+            return contextlib.nullcontext()
+        name = getattr(target, "__qualname__", None) or getattr(target, "name", None) or type(target).__name__
+        return self.timeline.span("invoke", name)
+
+    def cleanup(self):
+        self._stop_all_patchers()
+
+    def _get_agent_mock(self, agent_name, method):
+        """Returns the stub for the agent's (or tool's) method, in session or per-scenario mode."""
+        stub = self._ledger.get(agent_name, method)
+        if stub is None:
+            raise ValueError(f"No patch found for agent '{agent_name}' and method '{method}'")
+        return stub
 
     def was_agent_method_called(self, agent_name, method, expected_count=1, input_args=None):
         """
@@ -198,45 +382,62 @@ class FixtureLibrary:
         If input_args is provided, only counts calls with matching args.
         Returns True if assertion passes, else raises AssertionError.
         """
-        logger.debug(f"was_agent_method_called: called with agent_name={agent_name}, method={method}, expected_count={expected_count}, input_args={input_args}")
-        logger.debug(f"was_agent_method_called: The self._started_patches are: {self._started_patches}")
-        idx = self._get_patch_index_by_agent(agent_name, method)
-        if idx is None:
-            raise ValueError(f"No patch found for agent '{agent_name}' and method '{method}'")
+        debug_event(logger, "was_agent_method_called", agent_name=agent_name, method=method,
+                    expected_count=expected_count, input_args=input_args)
         if not hasattr(self, '_started_patches'):
             raise RuntimeError("Patches have not been started. Use within a context manager.")
-        mock_obj = self._started_patches[idx]
-        logger.debug(f"was_agent_method_called: The mock_obj for agent '{agent_name}' and method '{method}' is: {mock_obj}")
-        # If input_args is None, count all calls
-        if input_args is None:
-            call_count = mock_obj.call_count
-        else:
-            # Filter calls by input_args
-            logger.debug(f"was_agent_method_called: Counting calls with specific input_args: {input_args} and agent_name: {agent_name}, method: {method}")
-            call_count = 0
-            for call in getattr(mock_obj, 'call_args_list', []):
-                args, kwargs = call
-                logger.debug(f"was_agent_method_called: The current call has args: {args}, kwargs: {kwargs}")
-                print(f"[DEBUG] Checking call args for agent '{agent_name}' method '{method}': {args} against input_args: {input_args}")
-                if(args and len(args) == 1 and args[0] == input_args):
-                    call_count += 1
-        assert call_count == expected_count, (
-            f"Expected {expected_count} calls to agent '{agent_name}' method '{method}', but got {call_count} (input_args={input_args})"
-        )
+        # Only raises for an agent or method that was never patched; the count comes from the ledger
+        self._get_agent_mock(agent_name, method)
+        # If input_args is None, count all calls; otherwise only single-argument calls equal to input_args,
+        # looked up by structural hash in the call ledger
+        call_count = self._ledger.count(agent_name, method, input_args)
+        debug_event(logger, "was_agent_method_called.count", agent_name=agent_name, method=method, call_count=call_count)
+        if call_count != expected_count:
+            raise AssertionError(self._invocation_mismatch(agent_name, method, expected_count, call_count, input_args))
         return True
 
+    def _invocation_mismatch(self, agent_name, method, expected_count, call_count, input_args):
+        """Failure message of was_agent_method_called: a diff against the closest call instead of the full states."""
+        message = f"Expected {expected_count} calls to agent '{agent_name}' method '{method}', but got {call_count}"
+        if input_args is None:
+            return message
+        message += " with the expected input state"
+        recorded = [call.args[0] for call in self._ledger.calls(agent_name, method) if len(call.args) == 1]
+        if call_count or not recorded:
+            return f"{message} ({len(recorded)} calls recorded)."
+        return "\n".join([message + "."] + mismatch_report(input_args, recorded))
+
     def was_api_patch_called(self, api_path):
         """
         Returns True if the patch for the given API path was called.
         """
-        for i, patcher in enumerate(self._patchers):
-            target = getattr(patcher, 'attribute', None) or getattr(patcher, 'target', None)
-            if target == api_path:
-                return self._was_patch_called(i)
-        raise ValueError(f"No patch found for API path '{api_path}'")
-
+        route_table = self._api_routes.get(api_path)
+        if route_table is None:
+            raise ValueError(f"No patch found for API path '{api_path}'")
+        return route_table.call_count > 0
 
     # Optionally, add more helpers for assertions or reporting as needed
+@pytest.fixture(scope="session")
+def discovery_registry(request):
+    """
+    Warms the process-wide discovery registry once per session for the root_path
+    (or list of root_paths) given as param. Returns {root_path: DiscoveryRegistry}.
+    """
+    root_paths = getattr(request, 'param', None) or []
+    if isinstance(root_paths, str):
+        root_paths = [root_paths]
+    return {root_path: GlobalMetadata.get_discovery(root_path) for root_path in root_paths}
+
+@pytest.fixture(scope="session")
+def patch_session(request):
+    """
+    Session-wide PatchSession: pass it to FixtureLibrary(patch_session=...) so agent and
+    tool targets are patched once and each scenario only swaps its responses.
+    """
+    session = PatchSession()
+    request.addfinalizer(session.close)
+    return session
+
 @pytest.fixture
 def scenario_feature_loader(request):
     # Allow passing root_path via request.param, fallback to default if not provided
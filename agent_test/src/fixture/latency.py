@@ -0,0 +1,170 @@
+import asyncio
+import json
+import math
+import random
+import selectors
+import time
+from abc import ABC, abstractmethod
+
+
+class LatencyModel(ABC):
+    """Draws the delay, in seconds, of one mocked agent, tool or API call. seed makes runs repeatable."""
+
+    def __init__(self, seed=None):
+        self._random = random.Random(seed)
+
+    @abstractmethod
+    def sample(self):
+        pass
+
+
+class FixedLatency(LatencyModel):
+    def __init__(self, seconds):
+        super().__init__()
+        self.seconds = seconds
+
+    def sample(self):
+        return self.seconds
+
+
+class NormalLatency(LatencyModel):
+    """Normally distributed delays, clipped at zero."""
+
+    def __init__(self, mean, stddev, seed=None):
+        super().__init__(seed)
+        self.mean = mean
+        self.stddev = stddev
+
+    def sample(self):
+        return max(0.0, self._random.gauss(self.mean, self.stddev))
+
+
+class LogNormalLatency(LatencyModel):
+    """Log-normal delays with the given median; sigma (of the log) sets the length of the tail."""
+
+    def __init__(self, median, sigma, seed=None):
+        super().__init__(seed)
+        self.median = median
+        self.sigma = sigma
+
+    def sample(self):
+        return self._random.lognormvariate(math.log(self.median), self.sigma)
+
+
+class EmpiricalLatency(LatencyModel):
+    """Delays drawn uniformly from observed samples, e.g. latencies exported from production traces."""
+
+    def __init__(self, samples, seed=None):
+        super().__init__(seed)
+        self.samples = [float(sample) for sample in samples]
+        if not self.samples or min(self.samples) < 0:
+            raise ValueError("EmpiricalLatency needs at least one sample and no negative samples.")
+
+    @classmethod
+    def from_file(cls, path, scale=1.0, seed=None):
+        """
+        Loads samples from a JSON list, or from a text file with one number per line
+        (blank lines and # comments skipped). scale converts units, e.g. 0.001 for ms.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            if path.endswith(".json"):
+                values = json.load(f)
+            else:
+                values = [line.split("#", 1)[0].strip() for line in f]
+                values = [value for value in values if value]
+        return cls([float(value) * scale for value in values], seed=seed)
+
+    def sample(self):
+        return self._random.choice(self.samples)
+
+
+def as_latency_model(latency):
+    """A LatencyModel for the latency argument of the mock_* methods: a model, seconds, or None."""
+    if latency is None or isinstance(latency, LatencyModel):
+        return latency
+    if isinstance(latency, (int, float)) and not isinstance(latency, bool):
+        return FixedLatency(latency)
+    raise TypeError(f"latency must be a LatencyModel or a number of seconds, not {latency!r}.")
+
+
+class RealClock:
+    """Mocks wait for real: time.sleep for sync calls and asyncio.sleep for async ones."""
+
+    def now(self):
+        return time.perf_counter()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    async def asleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+
+REAL_CLOCK = RealClock()
+
+
+class VirtualClock:
+    """
+    Simulated time: mock latencies advance the clock instead of waiting.
+    Coroutines started with run() execute on an event loop whose time is this clock:
+    when every task is waiting, the loop jumps straight to the next timer, so
+    concurrent ainvoke calls overlap in simulated time exactly as they would in real
+    time. slept / elapsed is then the parallelism the orchestrator achieves.
+    Sync calls (and async calls outside run()) advance the clock one after another.
+    """
+
+    def __init__(self, start=0.0):
+        self._now = start
+        self.slept = 0.0    # total latency injected, whether or not calls overlapped
+
+    def now(self):
+        return self._now
+
+    def advance(self, seconds):
+        self._now += seconds
+
+    def sleep(self, seconds):
+        self.slept += seconds
+        self.advance(seconds)
+
+    async def asleep(self, seconds):
+        self.slept += seconds
+        if getattr(asyncio.get_running_loop(), "_virtual_clock", None) is self:
+            await asyncio.sleep(seconds)
+        else:
+            self.advance(seconds)
+            await asyncio.sleep(0)
+
+    def new_event_loop(self):
+        return _VirtualTimeEventLoop(self)
+
+    def run(self, coro):
+        """asyncio.run on a loop driven by this clock."""
+        with asyncio.Runner(loop_factory=self.new_event_loop) as runner:
+            return runner.run(coro)
+
+
+class _VirtualTimeSelector(selectors.DefaultSelector):
+    """Polls without blocking and advances the clock by the time the loop would have waited for its next timer."""
+
+    def __init__(self, clock):
+        super().__init__()
+        self._clock = clock
+
+    def select(self, timeout=None):
+        if timeout is None:
+            # No timers: only real I/O (e.g. executor threads finishing) can wake the loop
+            return super().select(timeout)
+        events = super().select(0)
+        if not events and timeout > 0:
+            self._clock.advance(timeout)
+        return events
+
+
+class _VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    def __init__(self, clock):
+        self._virtual_clock = clock
+        super().__init__(_VirtualTimeSelector(clock))
+
+    def time(self):
+        return self._virtual_clock.now()
@@ -0,0 +1,216 @@
+import asyncio
+import contextvars
+import copy
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agent_test.src.common.timeline import Histogram
+
+DEFAULT_REQUESTS = 1000
+
+# Marks the end of the shared input stream for closed-loop worker threads
+_END = object()
+
+
+class LoadTestReport:
+    """Throughput and latency of a load test; latencies are in seconds."""
+
+    def __init__(self, latencies, errors, wall_time, concurrency, rate):
+        self.latency = Histogram(latencies)
+        self.errors = errors
+        self.wall_time = wall_time
+        self.concurrency = concurrency
+        self.rate = rate
+
+    @property
+    def completed(self):
+        return self.latency.count
+
+    @property
+    def requests(self):
+        return self.completed + len(self.errors)
+
+    @property
+    def throughput(self):
+        """Completed requests per second of wall time."""
+        return self.completed / self.wall_time if self.wall_time else 0.0
+
+    def percentile(self, p):
+        return self.latency.percentile(p)
+
+    def summary(self):
+        target = f"{self.rate:g} req/s" if self.rate else f"concurrency {self.concurrency or 1}"
+        lines = [
+            f"{self.requests} requests ({target}): {self.completed} completed, {len(self.errors)} failed "
+            f"in {self.wall_time:.2f}s, {self.throughput:.1f} req/s",
+            f"latency p50 {self.percentile(50) * 1e3:.3f}ms, p95 {self.percentile(95) * 1e3:.3f}ms, "
+            f"p99 {self.percentile(99) * 1e3:.3f}ms, max {self.latency.summary()['max'] * 1e3:.3f}ms",
+        ]
+        for error in self.errors[:5]:
+            lines.append(f"ERROR {error!r}")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return {
+            "requests": self.requests,
+            "completed": self.completed,
+            "failed": len(self.errors),
+            "wall_time": self.wall_time,
+            "throughput": self.throughput,
+            "concurrency": self.concurrency,
+            "rate": self.rate,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "latency": self.latency.summary(),
+            "errors": [repr(error) for error in self.errors],
+        }
+
+
+def input_stream(inputs, default_state, requests, duration):
+    """
+    The input states to send: inputs is an iterable of states, a callable index -> state,
+    or None to repeat default_state (a fresh copy per request, as orchestrators may
+    mutate their input). The stream is capped at requests states, or left
+    open (the run stops on duration) when only a duration is given.
+    """
+    if requests is None and duration is None:
+        requests = DEFAULT_REQUESTS
+    if inputs is None:
+        states = map(copy.deepcopy, itertools.repeat(default_state))
+    elif callable(inputs):
+        states = map(inputs, itertools.count())
+    else:
+        states = iter(inputs)
+    return states if requests is None else itertools.islice(states, requests)
+
+
+def run_load_test(fixture, target, inputs=None, requests=None, duration=None, concurrency=None, rate=None,
+                  record=False):
+    """
+    Drives target (a graph's invoke, or a function of the input state) with a stream of
+    input states while the fixture's mocks are active, and measures per-request latency.
+
+    Without rate the test is closed-loop: concurrency threads each send the next state as
+    soon as their previous request returns, which measures the orchestrator's capacity.
+    With rate (requests per second) the test is open-loop: requests are released on a
+    fixed schedule whatever the response times, and latency is measured from the
+    scheduled start, so time spent queueing behind a saturated orchestrator is counted.
+    concurrency (default 1) is the number of closed-loop threads; in an open-loop run it
+    bounds the requests in flight (default: the ThreadPoolExecutor's worker count).
+
+    Agents, tools and APIs answer from the configured mocks, so the latency is the
+    orchestrator's own cost plus the mocks' lookups and configured latencies. Agent and
+    tool calls are not recorded (no snapshots, call lists or timeline events) unless
+    record is set, so long duration runs use constant memory; API route tables only
+    count their calls. In session mode the fixture's ScenarioScope is carried into
+    every worker thread.
+    """
+    states = input_stream(inputs, fixture._input_state, requests, duration)
+    call = target.invoke if hasattr(target, "invoke") else target
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def send(state, scheduled):
+        try:
+            call(state)
+        except Exception as exc:  # noqa: BLE001 - counted in the report
+            with lock:
+                errors.append(exc)
+            return
+        end = time.perf_counter()
+        with lock:
+            latencies.append(end - scheduled)
+
+    with fixture, fixture._ledger.recording(record):
+        # Each worker thread runs in its own copy of the caller's context, where the scope is active
+        context = contextvars.copy_context()
+        start = time.perf_counter()
+        deadline = None if duration is None else start + duration
+        if rate is None:
+            def worker():
+                while deadline is None or time.perf_counter() < deadline:
+                    with lock:
+                        state = next(states, _END)
+                    if state is _END:
+                        return
+                    send(state, time.perf_counter())
+
+            threads = [threading.Thread(target=context.copy().run, args=(worker,)) for _ in range(concurrency or 1)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                for index, state in enumerate(states):
+                    scheduled = start + index / rate
+                    if deadline is not None and scheduled >= deadline:
+                        break
+                    _sleep_until(scheduled)
+                    executor.submit(context.copy().run, send, state, scheduled)
+        wall_time = time.perf_counter() - start
+    return LoadTestReport(latencies, errors, wall_time, concurrency, rate)
+
+
+async def arun_load_test(fixture, target, inputs=None, requests=None, duration=None, concurrency=None, rate=None,
+                         record=False):
+    """
+    run_load_test for async targets (a graph's ainvoke, or a coroutine function) on the
+    current event loop. Closed-loop runs use concurrency worker tasks; open-loop runs
+    start one task per request at its scheduled time, with at most concurrency in
+    flight when it is given.
+    """
+    states = input_stream(inputs, fixture._input_state, requests, duration)
+    call = target.ainvoke if hasattr(target, "ainvoke") else target
+    latencies = []
+    errors = []
+
+    async def send(state, scheduled):
+        try:
+            await call(state)
+        except Exception as exc:  # noqa: BLE001 - counted in the report
+            errors.append(exc)
+            return
+        latencies.append(time.perf_counter() - scheduled)
+
+    # Tasks created inside the with block inherit the context where the scope is active
+    with fixture, fixture._ledger.recording(record):
+        start = time.perf_counter()
+        deadline = None if duration is None else start + duration
+        if rate is None:
+            async def worker():
+                for state in states:
+                    await send(state, time.perf_counter())
+                    if deadline is not None and time.perf_counter() >= deadline:
+                        return
+
+            await asyncio.gather(*(worker() for _ in range(concurrency or 1)))
+        else:
+            semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+
+            async def bounded(state, scheduled):
+                if semaphore is None:
+                    return await send(state, scheduled)
+                async with semaphore:
+                    await send(state, scheduled)
+
+            tasks = []
+            for index, state in enumerate(states):
+                scheduled = start + index / rate
+                if deadline is not None and scheduled >= deadline:
+                    break
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+                tasks.append(asyncio.ensure_future(bounded(state, scheduled)))
+            await asyncio.gather(*tasks)
+        wall_time = time.perf_counter() - start
+    return LoadTestReport(latencies, errors, wall_time, concurrency, rate)
+
+
+def _sleep_until(moment):
+    delay = moment - time.perf_counter()
+    if delay > 0:
+        time.sleep(delay)
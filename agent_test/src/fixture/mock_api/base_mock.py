@@ -1,13 +1,44 @@
 from abc import ABC, abstractmethod
 
+from agent_test.src.fixture.mock_api.route_table import RouteTable
+
 class BaseAPIMock(ABC):
-    
-    @abstractmethod
+    # Async clients get an awaitable patch
+    is_async = False
+
+    def payload_fields(self, payload):
+        """
+        Return the request fields constrained by a payload. Fields the payload does
+        not name match any value. Default: {"args": (...), "kwargs": {...}} payloads.
+        """
+        return {key: payload[key] for key in ("args", "kwargs") if key in payload}
+
+    def request_fields(self, args, kwargs):
+        """
+        Return the normalized fields of an actual call, using the names of payload_fields.
+        """
+        return {"args": args, "kwargs": kwargs}
+
+    def wrap_response(self, return_value):
+        """
+        Return the object handed back to the caller for return_value.
+        """
+        return return_value
+
+    def default_response(self, return_value):
+        """
+        Return the object handed back for return_value by the default route (None payload).
+        Default: return_value itself.
+        """
+        return return_value
+
     def create_patcher(self, api_path, payload, return_value):
         """
         Return a patcher object for the given API path, payload, and return value.
         """
-        pass
+        table = RouteTable(api_path, self)
+        table.add(payload, return_value)
+        return table.create_patcher()
 
     @abstractmethod
     def get_api_type(self):
@@ -15,12 +46,3 @@ class BaseAPIMock(ABC):
         Return the API mock type.
         """
         pass
-
-    # @staticmethod
-    # def identify_patcher_type(api_type: str = "requests"):
-    #     """
-    #     Identify the patcher class based on the payload using the factory module.
-    #     """
-    #     if BaseAPIMock._api_patcher_registry is None:
-    #         BaseAPIMock._api_patcher_registry = build_api_patcher_registry()
-    #     return BaseAPIMock._api_patcher_registry.get(api_type, None)
\ No newline at end of file
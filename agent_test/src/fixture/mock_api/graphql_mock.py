@@ -1,17 +1,16 @@
-from unittest.mock import patch, Mock
 from agent_test.src.fixture.mock_api.base_mock import BaseAPIMock
 
 class GraphQLAPIMock(BaseAPIMock):
     """Mocking strategy for GraphQL clients (gql, sgqlc, etc.)."""
-    def create_patcher(self, api_path, payload, return_value):
-        if payload is None:
-            return patch(api_path, return_value=return_value)
-        def side_effect(*args, **kwargs):
-            # GraphQL calls may be matched on query string
-            if payload and args and args[0] == payload.get("query"):
-                return return_value
-            raise ValueError(f"Unexpected args: {args}, kwargs: {kwargs}")
-        return patch(api_path, side_effect=side_effect)
+    def payload_fields(self, payload):
+        # GraphQL calls are matched on the query string and, if given, its variables
+        return {key: payload[key] for key in ("query", "variables") if key in payload}
+
+    def request_fields(self, args, kwargs):
+        return {
+            "query": args[0] if args else kwargs.get("query"),
+            "variables": args[1] if len(args) > 1 else kwargs.get("variables", kwargs.get("variable_values")),
+        }
 
     def get_api_type(self):
         from agent_test.src.agent_utils.models.api_mock_type import APIMockType
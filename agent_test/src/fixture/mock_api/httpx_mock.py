@@ -1,18 +1,21 @@
-from unittest.mock import patch, Mock, AsyncMock
+from unittest.mock import Mock
 from agent_test.src.fixture.mock_api.base_mock import BaseAPIMock
+from agent_test.src.fixture.mock_api.utils import http_payload_fields, http_request_fields, json_response
 
 class HttpxAPIMock(BaseAPIMock):
     """Mocking strategy for httpx-based APIs (sync and async)."""
-    def create_patcher(self, api_path, payload, return_value):
-        if payload is None:
-            return patch(api_path, return_value=Mock(return_value=return_value))
-        def side_effect(*args, **kwargs):
-            if payload and args and args[0] == payload.get("url"):
-                mock_response = Mock()
-                mock_response.json.return_value = return_value
-                return mock_response
-            raise ValueError(f"Unexpected args: {args}, kwargs: {kwargs}")
-        return patch(api_path, side_effect=side_effect)
+    def payload_fields(self, payload):
+        return http_payload_fields(payload)
+
+    def request_fields(self, args, kwargs):
+        return http_request_fields(args, kwargs)
+
+    def wrap_response(self, return_value):
+        return json_response(return_value)
+
+    def default_response(self, return_value):
+        # The default route's original shape: a Mock returning return_value when called
+        return Mock(return_value=return_value)
 
     def get_api_type(self):
         from agent_test.src.agent_utils.models.api_mock_type import APIMockType
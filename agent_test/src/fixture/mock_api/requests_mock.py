@@ -1,25 +1,28 @@
 from typing import override
-from unittest.mock import patch, Mock
+from unittest.mock import Mock
 from agent_test.src.agent_utils.models.api_mock_type import APIMockType
 from agent_test.src.fixture.mock_api.base_mock import BaseAPIMock
+from agent_test.src.fixture.mock_api.utils import http_payload_fields, http_request_fields, json_response
 
 
 class RequestsAPIMock(BaseAPIMock):
+    def default_response(self, return_value):
+        # The default route's original shape: a Mock returning return_value when called
+        return Mock(return_value=return_value)
+
     def get_api_type(self):
         
         return APIMockType.REQUESTS
 
     """Mocking strategy for requests-based APIs."""
     @override
-    def create_patcher(self, api_path, payload, return_value):
-        def side_effect(url, params=None, **kwargs):
-            if payload and url == payload.get("url") and params == payload.get("params"):
-                mock_response = Mock()
-                mock_response.json.return_value = return_value
-                return mock_response
-            raise ValueError(f"Unexpected url/params: {url}, {params}")
+    def payload_fields(self, payload):
+        return http_payload_fields(payload)
+
+    @override
+    def request_fields(self, args, kwargs):
+        return http_request_fields(args, kwargs)
 
-        if payload is None:
-            return patch(api_path, return_value=Mock(return_value=return_value))
-        else:
-            return patch(api_path, side_effect=side_effect)
+    @override
+    def wrap_response(self, return_value):
+        return json_response(return_value)
@@ -0,0 +1,165 @@
+import time
+from collections import namedtuple
+from unittest.mock import AsyncMock, Mock, NonCallableMock, patch
+
+from agent_test.src.fixture.latency import REAL_CLOCK
+from agent_test.src.fixture.mock_api.url_router import UrlRouter, is_url_template
+from agent_test.src.fixture.mock_api.utils import freeze
+
+_NO_ROUTE = object()
+MAX_REPORTED_ROUTES = 10
+
+# A registered response and the LatencyModel delaying it (None answers immediately)
+_Route = namedtuple("_Route", ["response", "latency"])
+
+
+class APIMockMiss(ValueError):
+    """Raised when a mocked API is called with a request that matches no registered route."""
+
+
+class ResponseFactory:
+    """
+    Callable return_value: invoked on every matching call with the captured URL
+    template params as keyword arguments, and its result wrapped as the response.
+    """
+    __slots__ = ("factory",)
+
+    def __init__(self, factory):
+        self.factory = factory
+
+    def build(self, api_mock, captures):
+        return api_mock.wrap_response(self.factory(**captures))
+
+
+class RouteTable:
+    """
+    All canned responses for one patched api_path, shared by a single patch.
+    A payload constrains only the request fields it names (e.g. url and params), so
+    routes are grouped by field signature and each group is a dict keyed by the frozen
+    field values: resolving a request is one hash lookup per signature.
+    A None payload registers the default route used when nothing else matches; it
+    answers with api_mock.default_response(return_value), as such mocks always have.
+    URLs with {name} placeholders go to a UrlRouter trie, tried after the literal
+    routes. A callable return_value is a response factory that receives the captured
+    placeholders as keyword arguments. A route with a latency model answers after a
+    delay drawn from it, waited on clock (time.sleep in resolve, asyncio.sleep in aresolve).
+    """
+
+    def __init__(self, api_path, api_mock):
+        self.api_path = api_path
+        self.api_mock = api_mock
+        self._routes = {}          # field signature -> {frozen field values: _Route}
+        self._default = _NO_ROUTE
+        self._router = None       # UrlRouter, created with the first URL template
+        self.call_count = 0
+        self.misses = []
+        self.timeline = None      # Timeline recording an 'api_call' event per resolved call
+        self.clock = REAL_CLOCK   # clock the route latencies are waited on
+
+    def add(self, payload, return_value, latency=None):
+        if payload is None:
+            self._default = _Route(self.api_mock.default_response(return_value), latency)
+            return
+        if callable(return_value) and not isinstance(return_value, NonCallableMock):
+            response = _Route(ResponseFactory(return_value), latency)
+        else:
+            response = _Route(self.api_mock.wrap_response(return_value), latency)
+        fields = self.api_mock.payload_fields(payload)
+        if is_url_template(fields.get("url")):
+            if self._router is None:
+                self._router = UrlRouter()
+            self._router.add(fields["url"], fields.get("params"), fields.get("body"), "body" in fields, response)
+            return
+        signature = tuple(sorted(fields))
+        key = tuple(freeze(fields[name]) for name in signature)
+        self._routes.setdefault(signature, {})[key] = response
+        # Most specific signatures are tried first
+        self._routes = dict(sorted(self._routes.items(), key=lambda item: -len(item[0])))
+
+    def resolve(self, args, kwargs):
+        """Returns the response registered for the request, after its latency, or raises APIMockMiss."""
+        start = time.perf_counter()
+        try:
+            response, latency = self._resolve(args, kwargs)
+            if latency is not None:
+                self.clock.sleep(latency.sample())
+            return response
+        finally:
+            if self.timeline is not None:
+                self.timeline.record("api_call", self.api_path, start, time.perf_counter())
+
+    async def aresolve(self, args, kwargs):
+        """resolve for async clients: the latency is awaited, so concurrent calls overlap."""
+        start = time.perf_counter()
+        try:
+            response, latency = self._resolve(args, kwargs)
+            if latency is not None:
+                await self.clock.asleep(latency.sample())
+            return response
+        finally:
+            if self.timeline is not None:
+                self.timeline.record("api_call", self.api_path, start, time.perf_counter())
+
+    def _resolve(self, args, kwargs):
+        self.call_count += 1
+        request = self.api_mock.request_fields(args, kwargs)
+        for signature, routes in self._routes.items():
+            try:
+                response = routes.get(tuple(freeze(request.get(name)) for name in signature), _NO_ROUTE)
+            except TypeError:
+                continue
+            if response is not _NO_ROUTE:
+                return self._build(response, {})
+        if self._router is not None:
+            found = self._router.resolve(request)
+            if found is not None:
+                return self._build(*found)
+        if self._default is not _NO_ROUTE:
+            return self._build(self._default, {})
+        self.misses.append(request)
+        raise APIMockMiss(self.miss_report(request))
+
+    def _build(self, route, captures):
+        """(response, latency model) of a matched route."""
+        if isinstance(route.response, ResponseFactory):
+            return route.response.build(self.api_mock, captures), route.latency
+        return route
+
+    def miss_report(self, request):
+        lines = [f"No mocked route for {self.api_path} matched request {request}."]
+        routes = [(signature, key) for signature, keys in self._routes.items() for key in keys]
+        templates = self._router.routes() if self._router is not None else []
+        if not routes and not templates:
+            lines.append("No routes are registered for this api_path.")
+        if routes:
+            lines.append(f"Registered routes ({len(routes)}):")
+            for signature, key in routes[:MAX_REPORTED_ROUTES]:
+                mismatched = [
+                    name for name, value in zip(signature, key)
+                    if _safe_freeze(request.get(name)) != value
+                ]
+                lines.append(f"  {dict(zip(signature, key))} -> differs in {mismatched}")
+            if len(routes) > MAX_REPORTED_ROUTES:
+                lines.append(f"  ... and {len(routes) - MAX_REPORTED_ROUTES} more")
+        if templates:
+            lines.append(f"Registered URL templates ({len(templates)}):")
+            for url, params in templates[:MAX_REPORTED_ROUTES]:
+                lines.append(f"  {url} params={params}" if params else f"  {url}")
+            if len(templates) > MAX_REPORTED_ROUTES:
+                lines.append(f"  ... and {len(templates) - MAX_REPORTED_ROUTES} more")
+        return "\n".join(lines)
+
+    def create_patcher(self):
+        """A single patch of api_path that dispatches every call through this table."""
+        if self.api_mock.is_async:
+            async def dispatch(*args, **kwargs):
+                return await self.aresolve(args, kwargs)
+            return patch(self.api_path, new=AsyncMock(side_effect=dispatch))
+        return patch(self.api_path, new=Mock(side_effect=lambda *args, **kwargs: self.resolve(args, kwargs)))
+
+
+def _safe_freeze(value):
+    try:
+        return freeze(value)
+    except TypeError:
+        return value
@@ -0,0 +1,153 @@
+from urllib.parse import urlsplit
+
+from agent_test.src.fixture.mock_api.utils import freeze
+
+
+def is_url_template(value):
+    """True for strings with {name} placeholders, e.g. 'http://host/accounts/{account_id}/txns'."""
+    return isinstance(value, str) and "{" in value and "}" in value
+
+
+def url_segments(url):
+    """Splits a URL into its 'scheme://host' head followed by the non-empty path segments."""
+    parts = urlsplit(url)
+    head = f"{parts.scheme}://{parts.netloc}" if parts.netloc else ""
+    return [head] + [segment for segment in parts.path.split("/") if segment]
+
+
+def _param_name(segment):
+    """Returns the placeholder name of a '{name}' segment, None for literal segments."""
+    if segment.startswith("{") and segment.endswith("}") and segment.count("{") == 1:
+        name = segment[1:-1]
+        if name.isidentifier():
+            return name
+    if "{" in segment or "}" in segment:
+        raise ValueError(f"Unsupported URL template segment '{segment}': use a whole '{{name}}' segment.")
+    return None
+
+
+class _Node:
+    __slots__ = ("literals", "param", "routes")
+
+    def __init__(self):
+        self.literals = {}   # segment -> _Node
+        self.param = None    # _Node for any single segment
+        self.routes = []     # [_TemplateRoute, ...] ending at this node, most specific first
+
+
+class _TemplateRoute:
+    __slots__ = ("url", "names", "query", "query_captures", "body", "has_body", "response")
+
+    def __init__(self, url, names, params, body, has_body, response):
+        self.url = url
+        self.names = names          # placeholder name per captured path segment, in order
+        self.query = {}             # query param -> required frozen value
+        self.query_captures = {}    # query param -> placeholder name
+        for name, value in (params or {}).items():
+            capture = _param_name(value) if is_url_template(value) else None
+            if capture is None:
+                self.query[name] = freeze(value)
+            else:
+                self.query_captures[name] = capture
+        self.body = body
+        self.has_body = has_body
+        self.response = response
+
+    @property
+    def specificity(self):
+        return 2 * len(self.query) + len(self.query_captures) + (1 if self.has_body else 0)
+
+    def same_constraints(self, other):
+        return (
+            self.query == other.query and self.query_captures == other.query_captures
+            and self.has_body == other.has_body and self.body == other.body
+        )
+
+    def match(self, captured, request):
+        """Returns the path and query captures if the request satisfies this route, else None."""
+        query = request.get("params") or {}
+        for name, expected in self.query.items():
+            # Inline query strings always parse to str, so compare '7' and 7 alike
+            if name not in query or (freeze(query[name]) != expected and str(query[name]) != str(expected)):
+                return None
+        if self.has_body and freeze(request.get("body")) != freeze(self.body):
+            return None
+        captures = dict(zip(self.names, captured))
+        for name, capture in self.query_captures.items():
+            if name not in query:
+                return None
+            captures[capture] = query[name]
+        return captures
+
+
+class UrlRouter:
+    """
+    Segment trie over URL templates such as 'http://host/accounts/{account_id}/txns'.
+    Literal segments are dict lookups and each node has at most one placeholder child,
+    so resolving a URL costs one step per segment no matter how many templates are
+    registered. Literal segments win over placeholders; the router backtracks to the
+    placeholder branch only when the literal branch has no matching route.
+    Query params named by a route must be present with the same value; a '{name}'
+    value captures the param instead.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+
+    def add(self, url, params, body, has_body, response):
+        node = self._root
+        names = []
+        for segment in url_segments(url):
+            name = _param_name(segment)
+            if name is None:
+                node = node.literals.setdefault(segment, _Node())
+            else:
+                names.append(name)
+                if node.param is None:
+                    node.param = _Node()
+                node = node.param
+        route = _TemplateRoute(url, names, params, body, has_body, response)
+        # A route with the same constraints replaces the old one; the most specific is tried first
+        node.routes = [existing for existing in node.routes if not existing.same_constraints(route)]
+        node.routes.append(route)
+        node.routes.sort(key=lambda existing: -existing.specificity)
+
+    def resolve(self, request):
+        """Returns (response, captures) for the request, or None when no template matches."""
+        url = request.get("url")
+        if not isinstance(url, str):
+            return None
+        return self._walk(self._root, url_segments(url), 0, [], request)
+
+    def _walk(self, node, segments, position, captured, request):
+        if position == len(segments):
+            for route in node.routes:
+                captures = route.match(captured, request)
+                if captures is not None:
+                    return route.response, captures
+            return None
+        segment = segments[position]
+        child = node.literals.get(segment)
+        if child is not None:
+            found = self._walk(child, segments, position + 1, captured, request)
+            if found is not None:
+                return found
+        if node.param is not None and position > 0:
+            captured.append(segment)
+            found = self._walk(node.param, segments, position + 1, captured, request)
+            captured.pop()
+            return found
+        return None
+
+    def routes(self):
+        """Registered templates as (url, {query param: value}), for miss reports."""
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            found.extend((route.url, dict(route.query, **{k: f"{{{v}}}" for k, v in route.query_captures.items()}))
+                         for route in node.routes)
+            stack.extend(node.literals.values())
+            if node.param is not None:
+                stack.append(node.param)
+        return found
@@ -1,19 +1,24 @@
-from unittest.mock import patch, Mock
+from unittest.mock import Mock
 from agent_test.src.fixture.mock_api.base_mock import BaseAPIMock
+from agent_test.src.fixture.mock_api.utils import http_payload_fields, http_request_fields
 
 class UrllibAPIMock(BaseAPIMock):
     """Mocking strategy for urllib/urllib3-based APIs."""
-    def create_patcher(self, api_path, payload, return_value):
-        if payload is None:
-            return patch(api_path, return_value=Mock(return_value=return_value))
-        def side_effect(*args, **kwargs):
-            # args[0] is usually the URL
-            if payload and args and args[0] == payload.get("url"):
-                mock_response = Mock()
-                mock_response.read.return_value = return_value
-                return mock_response
-            raise ValueError(f"Unexpected args: {args}, kwargs: {kwargs}")
-        return patch(api_path, side_effect=side_effect)
+    def payload_fields(self, payload):
+        return http_payload_fields(payload)
+
+    def request_fields(self, args, kwargs):
+        # args[0] is usually the URL (urlopen(url, data) / urllib3 request(method, url) via kwargs)
+        return http_request_fields(args, kwargs)
+
+    def wrap_response(self, return_value):
+        mock_response = Mock()
+        mock_response.read.return_value = return_value
+        return mock_response
+
+    def default_response(self, return_value):
+        # The default route's original shape: a Mock returning return_value when called
+        return Mock(return_value=return_value)
 
     def get_api_type(self):
         from agent_test.src.agent_utils.models.api_mock_type import APIMockType
@@ -0,0 +1,64 @@
+from unittest.mock import Mock
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
+BODY_KEYS = ("json", "data", "content", "body")
+
+
+def freeze(value):
+    """
+    Normalizes a request field into a hashable key: dicts become frozensets of items,
+    lists and tuples become tuples (JSON payloads cannot express tuples), sets frozensets.
+    """
+    if isinstance(value, dict):
+        return frozenset((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    return value
+
+
+def split_url(url, params=None):
+    """Moves an inline query string into params so both spellings of a request match the same route."""
+    if not isinstance(url, str) or "?" not in url:
+        return url, params
+    parts = urlsplit(url)
+    merged = dict(parse_qsl(parts.query, keep_blank_values=True))
+    if isinstance(params, dict):
+        merged.update(params)
+    return urlunsplit(parts._replace(query="")), merged
+
+
+def http_payload_fields(payload):
+    """Route fields named by an HTTP payload: url, params and body (json/data/content/body)."""
+    fields = {}
+    if "url" in payload:
+        fields["url"], params = split_url(payload["url"], payload.get("params"))
+        if "params" in payload or params is not None:
+            fields["params"] = params
+    elif "params" in payload:
+        fields["params"] = payload["params"]
+    for key in BODY_KEYS:
+        if key in payload:
+            fields["body"] = payload[key]
+            break
+    return fields
+
+
+def http_request_fields(args, kwargs, body_position=1):
+    """Normalized url/params/body of a requests/httpx/urllib style call."""
+    url = args[0] if args else kwargs.get("url")
+    url, params = split_url(url, kwargs.get("params"))
+    body = args[body_position] if len(args) > body_position else None
+    for key in BODY_KEYS:
+        if kwargs.get(key) is not None:
+            body = kwargs[key]
+            break
+    return {"url": url, "params": params, "body": body}
+
+
+def json_response(return_value):
+    """Mock response whose json() returns return_value."""
+    mock_response = Mock()
+    mock_response.json.return_value = return_value
+    return mock_response
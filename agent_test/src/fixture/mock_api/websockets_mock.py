@@ -1,16 +1,14 @@
-from unittest.mock import patch, AsyncMock
 from agent_test.src.fixture.mock_api.base_mock import BaseAPIMock
 
 class WebsocketsAPIMock(BaseAPIMock):
     """Mocking strategy for websockets APIs (async)."""
-    def create_patcher(self, api_path, payload, return_value):
-        if payload is None:
-            return patch(api_path, new_callable=AsyncMock, return_value=return_value)
-        async def side_effect(*args, **kwargs):
-            if payload and args and args[0] == payload.get("url"):
-                return return_value
-            raise ValueError(f"Unexpected args: {args}, kwargs: {kwargs}")
-        return patch(api_path, new_callable=AsyncMock, side_effect=side_effect)
+    is_async = True
+
+    def payload_fields(self, payload):
+        return {"url": payload["url"]} if "url" in payload else {}
+
+    def request_fields(self, args, kwargs):
+        return {"url": args[0] if args else kwargs.get("uri", kwargs.get("url"))}
 
     def get_api_type(self):
         from agent_test.src.agent_utils.models.api_mock_type import APIMockType
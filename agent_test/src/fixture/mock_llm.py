@@ -0,0 +1,306 @@
+import itertools
+import json
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from unittest.mock import patch
+
+# Stands in for OPENAI_API_KEY while the fake is active, so clients built without a key can be created
+PLACEHOLDER_API_KEY = "sk-agent-test-scripted"
+
+# Ids of scripted tool calls; unique across the process like the API's "call_..." ids
+_tool_call_ids = itertools.count(1)
+
+
+class LLMScriptError(ValueError):
+    """Raised when the scripted LLM has no reply for a prompt."""
+
+
+class LLMReply:
+    """
+    One scripted LLM answer: message content and/or tool calls. A dict or list
+    content is sent as its JSON text (e.g. routing JSON {"next_agent": "a1"}); tool
+    calls are {"name": ..., "args": {...}} dicts or (name, args) pairs.
+    """
+
+    def __init__(self, content=None, tool_calls=None):
+        if isinstance(content, (dict, list)):
+            content = json.dumps(content)
+        self.content = content or ""
+        self.tool_calls = [_tool_call(call) for call in tool_calls or []]
+
+    def __repr__(self):
+        return f"LLMReply(content={self.content!r}, tool_calls={self.tool_calls!r})"
+
+
+def _tool_call(call):
+    if isinstance(call, (tuple, list)):
+        name, args = call
+        call = {"name": name, "args": args}
+    return {"name": call["name"], "args": call.get("args") or {}, "id": call.get("id") or f"call_{next(_tool_call_ids)}"}
+
+
+def as_reply(value, prompt):
+    """
+    The LLMReply for a scripted value: an LLMReply, a string (content), a dict whose only
+    keys are "tool_calls" and optionally "content" (tool calls), any other dict or list
+    (JSON content), or a callable taking the prompt and returning one of these.
+    """
+    if callable(value) and not isinstance(value, LLMReply):
+        value = value(prompt)
+    if isinstance(value, LLMReply):
+        return value
+    if isinstance(value, dict) and "tool_calls" in value and set(value) <= {"tool_calls", "content"}:
+        return LLMReply(value.get("content"), value["tool_calls"])
+    if isinstance(value, (str, dict, list)) or value is None:
+        return LLMReply(value)
+    raise TypeError(f"Unsupported scripted LLM reply: {value!r}")
+
+
+def prompt_matches(pattern, prompt):
+    """A substring, compiled regex or predicate matched against the prompt text."""
+    if isinstance(pattern, re.Pattern):
+        return pattern.search(prompt) is not None
+    if callable(pattern):
+        return bool(pattern(prompt))
+    return pattern in prompt
+
+
+def _excerpt(prompt, limit=200):
+    prompt = " ".join(prompt.split())
+    return prompt if len(prompt) <= limit else prompt[:limit] + "..."
+
+
+class LLMScript(ABC):
+    """
+    Scripted responder standing in for the LLM. Every prompt it answers is kept in
+    prompts, in call order; the prompt is the text of all the request's messages.
+    """
+
+    def __init__(self):
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def respond(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+            return as_reply(self._next(prompt), prompt)
+
+    @abstractmethod
+    def _next(self, prompt):
+        """The scripted value answering prompt."""
+
+
+class SequenceScript(LLMScript):
+    """Answers the n-th call with the n-th reply, whatever the prompt."""
+
+    def __init__(self, replies):
+        super().__init__()
+        self.replies = list(replies)
+
+    def _next(self, prompt):
+        n = len(self.prompts)
+        if n > len(self.replies):
+            raise LLMScriptError(
+                f"The scripted LLM was called {n} times but only {len(self.replies)} replies are scripted. "
+                f"Prompt: {_excerpt(prompt)}"
+            )
+        return self.replies[n - 1]
+
+
+class RuleScript(LLMScript):
+    """
+    Answers with the reply of the first (pattern, reply) rule whose pattern matches
+    the prompt, or with default when none does.
+    """
+
+    def __init__(self, rules, default=None):
+        super().__init__()
+        self.rules = list(rules.items()) if isinstance(rules, dict) else list(rules)
+        self.default = default
+
+    def _next(self, prompt):
+        for pattern, reply in self.rules:
+            if prompt_matches(pattern, prompt):
+                return reply
+        if self.default is None:
+            raise LLMScriptError(f"No scripted LLM rule matches the prompt: {_excerpt(prompt)}")
+        return self.default
+
+
+class StateMachineScript(LLMScript):
+    """
+    Answers from the rules of the current state: {state: [(pattern, reply, next_state), ...]}.
+    The first rule whose pattern matches the prompt gives the reply and moves to
+    next_state (None stays in the current state).
+    """
+
+    def __init__(self, states, initial):
+        super().__init__()
+        if initial not in states:
+            raise ValueError(f"Initial state '{initial}' is not one of {sorted(states)}.")
+        self.states = states
+        self.state = initial
+
+    def _next(self, prompt):
+        for pattern, reply, next_state in self.states.get(self.state, []):
+            if prompt_matches(pattern, prompt):
+                if next_state is not None:
+                    self.state = next_state
+                return reply
+        raise LLMScriptError(f"No scripted LLM transition from state '{self.state}' matches the prompt: {_excerpt(prompt)}")
+
+
+class _FunctionScript(LLMScript):
+    def __init__(self, function):
+        super().__init__()
+        self.function = function
+
+    def _next(self, prompt):
+        return self.function(prompt)
+
+
+def as_llm_script(script):
+    """A list is a SequenceScript, a dict a RuleScript ({pattern: reply}) and a callable answers each prompt."""
+    if isinstance(script, LLMScript):
+        return script
+    if isinstance(script, (list, tuple)):
+        return SequenceScript(script)
+    if isinstance(script, dict):
+        return RuleScript(script)
+    if callable(script):
+        return _FunctionScript(script)
+    raise TypeError(f"Unsupported LLM script: {script!r}")
+
+
+def _content_text(content):
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            part if isinstance(part, str) else str(part.get("text", "")) for part in content
+        )
+    return "" if content is None else str(content)
+
+
+def prompt_text(messages):
+    """The text of a chat request: OpenAI message dicts or langchain messages, one per line."""
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(
+        _content_text(message.get("content") if isinstance(message, dict) else getattr(message, "content", message))
+        for message in messages or []
+    )
+
+
+def chat_completion(reply, model):
+    """An openai ChatCompletion carrying reply."""
+    from openai.types.chat import ChatCompletion
+    message = {"role": "assistant", "content": reply.content or (None if reply.tool_calls else "")}
+    if reply.tool_calls:
+        message["tool_calls"] = [
+            {"id": call["id"], "type": "function",
+             "function": {"name": call["name"], "arguments": json.dumps(call["args"])}}
+            for call in reply.tool_calls
+        ]
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-agent-test", "object": "chat.completion", "created": 0, "model": model or "scripted",
+        "choices": [{"index": 0, "finish_reason": "tool_calls" if reply.tool_calls else "stop", "message": message}],
+    })
+
+
+def chat_result(reply):
+    """A langchain ChatResult whose AIMessage carries reply."""
+    from langchain_core.messages import AIMessage
+    from langchain_core.outputs import ChatGeneration, ChatResult
+    message = AIMessage(content=reply.content, tool_calls=[dict(call, type="tool_call") for call in reply.tool_calls])
+    return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def chat_chunk(reply):
+    """The whole reply as the single chunk of a stream."""
+    from langchain_core.messages import AIMessageChunk
+    from langchain_core.outputs import ChatGenerationChunk
+    chunks = [
+        {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": i, "type": "tool_call_chunk"}
+        for i, call in enumerate(reply.tool_calls)
+    ]
+    return ChatGenerationChunk(message=AIMessageChunk(content=reply.content, tool_call_chunks=chunks))
+
+
+def llm_patchers(script):
+    """
+    Patchers answering OpenAI chat completions (sync and async clients) and langchain's
+    ChatOpenAI (invoke/ainvoke/stream, with or without bind_tools) from script, with
+    no network call. Only the installed libraries are patched.
+    """
+    return scoped_llm_patchers(lambda: script)
+
+
+def scoped_llm_patchers(resolve):
+    """
+    llm_patchers answering from the script returned by resolve() at call time; calls
+    for which it returns None go to the original methods. A PatchSession installs
+    these once and resolves the script of the active ScenarioScope.
+    """
+    patchers = [patch.dict(os.environ, {"OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or PLACEHOLDER_API_KEY})]
+    try:
+        from openai.resources.chat.completions import AsyncCompletions, Completions
+    except ImportError:
+        pass
+    else:
+        original_create, original_acreate = Completions.create, AsyncCompletions.create
+
+        def create(client, *args, **kwargs):
+            script = resolve()
+            if script is None:
+                return original_create(client, *args, **kwargs)
+            return chat_completion(script.respond(prompt_text(kwargs.get("messages"))), kwargs.get("model"))
+
+        async def acreate(client, *args, **kwargs):
+            script = resolve()
+            if script is None:
+                return await original_acreate(client, *args, **kwargs)
+            return chat_completion(script.respond(prompt_text(kwargs.get("messages"))), kwargs.get("model"))
+        patchers.append(patch.object(Completions, "create", create))
+        patchers.append(patch.object(AsyncCompletions, "create", acreate))
+    try:
+        from langchain_openai.chat_models.base import BaseChatOpenAI
+    except ImportError:
+        pass
+    else:
+        original_generate, original_agenerate = BaseChatOpenAI._generate, BaseChatOpenAI._agenerate
+        original_stream, original_astream = BaseChatOpenAI._stream, BaseChatOpenAI._astream
+
+        def generate(llm, messages, stop=None, run_manager=None, **kwargs):
+            script = resolve()
+            if script is None:
+                return original_generate(llm, messages, stop=stop, run_manager=run_manager, **kwargs)
+            return chat_result(script.respond(prompt_text(messages)))
+
+        async def agenerate(llm, messages, stop=None, run_manager=None, **kwargs):
+            script = resolve()
+            if script is None:
+                return await original_agenerate(llm, messages, stop=stop, run_manager=run_manager, **kwargs)
+            return chat_result(script.respond(prompt_text(messages)))
+
+        def stream(llm, messages, stop=None, run_manager=None, **kwargs):
+            script = resolve()
+            if script is None:
+                yield from original_stream(llm, messages, stop=stop, run_manager=run_manager, **kwargs)
+                return
+            yield chat_chunk(script.respond(prompt_text(messages)))
+
+        async def astream(llm, messages, stop=None, run_manager=None, **kwargs):
+            script = resolve()
+            if script is None:
+                async for chunk in original_astream(llm, messages, stop=stop, run_manager=run_manager, **kwargs):
+                    yield chunk
+                return
+            yield chat_chunk(script.respond(prompt_text(messages)))
+        patchers.append(patch.object(BaseChatOpenAI, "_generate", generate))
+        patchers.append(patch.object(BaseChatOpenAI, "_agenerate", agenerate))
+        patchers.append(patch.object(BaseChatOpenAI, "_stream", stream))
+        patchers.append(patch.object(BaseChatOpenAI, "_astream", astream))
+    return patchers
@@ -0,0 +1,212 @@
+import pkgutil
+import threading
+from contextvars import ContextVar
+
+from agent_test.src.fixture.agent_stub import StubPatcher, create_method_stub
+from agent_test.src.fixture.asgi_transport import module_patchers, runnable_patchers
+from agent_test.src.fixture.mock_llm import scoped_llm_patchers
+
+# Scope of the scenario running in the current task/thread; set by PatchSession.activate
+_current_scope = ContextVar("agent_test_scenario_scope", default=None)
+# Keys of the LLM and HTTP patches among a session's patchers
+LLM_PATCH_PATH = "<llm>"
+APPS_PATCH_PATH = "<apps>"
+
+
+class ScenarioScope:
+    """
+    Per-scenario view of a PatchSession: the recording stub answering each patch path,
+    the API route tables, the scripted LLM and the in-process apps of one scenario. While a scope is active in a context
+    (an asyncio task, or a thread), the session dispatchers route calls made from that
+    context to it, so concurrent scenarios neither see nor record each other's calls.
+    """
+    __slots__ = ("stubs", "api_routes", "llm", "apps")
+
+    def __init__(self):
+        self.stubs = {}        # patch_path -> stub returning the scenario's response
+        self.api_routes = {}   # api_path -> RouteTable
+        self.llm = None        # LLMScript answering the scenario's LLM calls
+        self.apps = None       # InProcessApps serving the scenario's HTTP calls
+
+
+def _scope_llm():
+    scope = _current_scope.get()
+    return scope.llm if scope is not None else None
+
+
+def _scope_apps():
+    scope = _current_scope.get()
+    return scope.apps if scope is not None else None
+
+
+class _PatcherGroup:
+    """Patchers stopped together, in reverse order of start."""
+
+    def __init__(self, patchers):
+        self._patchers = patchers
+
+    def stop(self):
+        for patcher in reversed(self._patchers):
+            patcher.stop()
+
+
+class PatchSession:
+    """
+    Keeps agent and tool targets patched across many scenarios.
+    Each target (e.g. 'pkg.orchestrator_code.agent1.invoke') is patched once with a
+    dispatcher. Calls made while a ScenarioScope is active are answered and recorded
+    by that scope's stub for the target, which lets scenarios sharing the session run
+    concurrently, either as asyncio tasks or in threads: a thread starts with an empty
+    context, so a scope activated in a worker thread only applies to calls made from
+    that thread. Other calls fall through to the original method, recorded by the
+    session stub of the target (get_mock).
+    """
+
+    def __init__(self):
+        self._patchers = {}    # patch_path -> started patcher
+        self._mocks = {}       # patch_path -> session stub recording the calls made outside any scope
+        # Scenarios in different threads may patch the same target at the same time
+        self._lock = threading.Lock()
+        # Scope activated by begin_scenario in this context, reset by end_scenario
+        self._scenario_token = ContextVar(f"agent_test_session_scenario_{id(self)}", default=None)
+
+    def ensure_patched(self, module_path, method):
+        """Patches module_path.method with a dispatcher unless already patched. Returns the patch path."""
+        patch_path = f"{module_path}.{method}"
+        if patch_path in self._mocks:
+            return patch_path
+        with self._lock:
+            if patch_path not in self._mocks:
+                original = getattr(pkgutil.resolve_name(module_path), method)
+                dispatch, session_stub = self._make_dispatcher(patch_path, method, original)
+                patcher = StubPatcher(module_path, method, dispatch)
+                patcher.start()
+                self._mocks[patch_path] = session_stub
+                self._patchers[patch_path] = patcher
+        return patch_path
+
+    def ensure_api_patched(self, api_path, api_mock):
+        """
+        Patches api_path (e.g. 'orchestrator_code.httpx.post') with a dispatcher that
+        resolves calls through the active scope's RouteTable for api_path.
+        """
+        if api_path in self._mocks:
+            return api_path
+        with self._lock:
+            if api_path not in self._mocks:
+                module_path, method = api_path.rsplit(".", 1)
+                original = getattr(pkgutil.resolve_name(module_path), method)
+                patcher = StubPatcher(module_path, method, self._make_api_dispatcher(api_path, api_mock, original))
+                self._mocks[api_path] = patcher.start()
+                self._patchers[api_path] = patcher
+        return api_path
+
+    def ensure_llm_patched(self):
+        """
+        Patches the OpenAI and ChatOpenAI completion methods once with dispatchers
+        answering from the active scope's LLM script; calls made outside any scope, or
+        from a scope without a script, reach the real LLM.
+        """
+        if LLM_PATCH_PATH in self._patchers:
+            return
+        with self._lock:
+            if LLM_PATCH_PATH not in self._patchers:
+                self._patchers[LLM_PATCH_PATH] = self._start_group(scoped_llm_patchers(_scope_llm))
+
+    def ensure_apps_patched(self, apps, agent_info_dict):
+        """
+        Patches httpx's module functions, requests sessions and the clients of the
+        RemoteRunnables apps serves once, with dispatchers sending to the active scope's
+        InProcessApps; calls made outside any scope, or from a scope not serving the
+        URL, go to the network as before. Clients are closed by close().
+        """
+        with self._lock:
+            if APPS_PATCH_PATH not in self._patchers:
+                self._patchers[APPS_PATCH_PATH] = self._start_group(module_patchers(_scope_apps))
+            for agent_path in apps.served_runnables(agent_info_dict):
+                patch_path = f"{agent_path}.<clients>"
+                if patch_path not in self._patchers:
+                    self._patchers[patch_path] = self._start_group(runnable_patchers(_scope_apps, [agent_path]))
+
+    @staticmethod
+    def _start_group(patchers):
+        for patcher in patchers:
+            patcher.start()
+        return _PatcherGroup(patchers)
+
+    def _make_dispatcher(self, patch_path, method, original):
+        """
+        Returns (dispatcher, session stub). The dispatcher is installed on the target and
+        hands calls to the active scope's stub; calls made outside any scope go to the
+        session stub, which records them and calls the original method.
+        """
+        session_stub = create_method_stub(method, side_effect=original)
+        if method in ["ainvoke"]:
+            async def dispatch(*args, **kwargs):
+                scope = _current_scope.get()
+                stub = scope.stubs.get(patch_path) if scope is not None else None
+                return await (stub or session_stub)(*args, **kwargs)
+            return dispatch, session_stub
+
+        def dispatch(*args, **kwargs):
+            scope = _current_scope.get()
+            stub = scope.stubs.get(patch_path) if scope is not None else None
+            return (stub or session_stub)(*args, **kwargs)
+        return dispatch, session_stub
+
+    def _make_api_dispatcher(self, api_path, api_mock, original):
+        def route_table():
+            scope = _current_scope.get()
+            return scope.api_routes.get(api_path) if scope is not None else None
+
+        if api_mock.is_async:
+            async def dispatch(*args, **kwargs):
+                table = route_table()
+                if table is None:
+                    return await original(*args, **kwargs)
+                return await table.aresolve(args, kwargs)
+        else:
+            def dispatch(*args, **kwargs):
+                table = route_table()
+                if table is None:
+                    return original(*args, **kwargs)
+                return table.resolve(args, kwargs)
+        return dispatch
+
+    def begin_scenario(self, responses):
+        """
+        Activates, in the current context, a ScenarioScope answering each patch path of
+        the {patch_path: response} table, replacing the one of the previous begin_scenario.
+        Returns the scope, whose stubs record the scenario's calls.
+        """
+        self.end_scenario()
+        scope = ScenarioScope()
+        for patch_path, response in responses.items():
+            scope.stubs[patch_path] = create_method_stub(patch_path.rsplit(".", 1)[1], return_value=response)
+        self._scenario_token.set(self.activate(scope))
+        return scope
+
+    def end_scenario(self):
+        """Deactivates the scope of begin_scenario. Its stubs keep their call history for assertions."""
+        token = self._scenario_token.get()
+        if token is not None:
+            self._scenario_token.set(None)
+            self.deactivate(token)
+
+    def activate(self, scope):
+        """Makes scope the active scenario of the current context. Returns the token for deactivate."""
+        return _current_scope.set(scope)
+
+    def deactivate(self, token):
+        _current_scope.reset(token)
+
+    def get_mock(self, patch_path):
+        return self._mocks.get(patch_path)
+
+    def close(self):
+        """Stops every session patch."""
+        with self._lock:
+            for patcher in reversed(list(self._patchers.values())):
+                patcher.stop()
+            self._patchers = {}
+            self._mocks = {}
@@ -0,0 +1,223 @@
+import reprlib
+from collections import Counter, namedtuple
+from collections.abc import Mapping
+from difflib import SequenceMatcher
+
+from pydantic import BaseModel
+
+from agent_test.src.fixture.call_ledger import structural_hash
+from agent_test.src.fixture.state_snapshot import Snapshotter
+
+# One difference between an expected and a recorded state. kind is "changed",
+# "missing" (expected, not in the call) or "unexpected" (in the call, not expected);
+# path is the tuple of keys, indices and model fields leading to it.
+Difference = namedtuple("Difference", ["path", "kind", "expected", "actual"])
+
+MAX_DIFFERENCES = 20
+# Longest differing middle of two lists aligned with difflib; beyond it items are compared by position
+MAX_ALIGNMENT = 100_000
+# Levels of nesting compared when ranking recorded calls by similarity
+SIMILARITY_DEPTH = 3
+
+_repr = reprlib.Repr()
+_repr.maxstring = 80
+_repr.maxother = 80
+_repr.maxlevel = 3
+_repr.maxdict = _repr.maxlist = _repr.maxtuple = 6
+
+
+def _equal(expected, actual):
+    try:
+        return expected is actual or expected == actual
+    except Exception:
+        return False
+
+
+def diff_states(expected, actual, limit=MAX_DIFFERENCES):
+    """
+    The differing paths between two nested dict/list/tuple/pydantic states, at most
+    limit + 1 of them (the extra one tells that some were left out). Equal subtrees
+    are skipped with a single == and list items are aligned by structural hash, so
+    an item inserted or removed in a long message history is one difference, not
+    one per shifted item.
+    """
+    differences = []
+    _diff(expected, actual, (), differences, limit + 1)
+    return differences
+
+
+def _diff(expected, actual, path, out, limit):
+    if len(out) >= limit or _equal(expected, actual):
+        return
+    if isinstance(expected, Mapping) and isinstance(actual, Mapping):
+        _diff_mapping(expected, actual, path, out, limit)
+    elif isinstance(expected, BaseModel) and type(expected) is type(actual):
+        _diff_mapping(expected.__dict__, actual.__dict__, path, out, limit, field=True)
+    elif isinstance(expected, (list, tuple)) and isinstance(actual, (list, tuple)):
+        _diff_sequence(expected, actual, path, out, limit)
+    else:
+        out.append(Difference(path, "changed", expected, actual))
+
+
+def _diff_mapping(expected, actual, path, out, limit, field=False):
+    # Model fields are tagged so they print as .name rather than ["name"]
+    step = (lambda key: _Field(key)) if field else (lambda key: key)
+    for key, item in expected.items():
+        if len(out) >= limit:
+            return
+        if key not in actual:
+            out.append(Difference(path + (step(key),), "missing", item, None))
+        else:
+            _diff(item, actual[key], path + (step(key),), out, limit)
+    for key, item in actual.items():
+        if len(out) >= limit:
+            return
+        if key not in expected:
+            out.append(Difference(path + (step(key),), "unexpected", None, item))
+
+
+def _diff_sequence(expected, actual, path, out, limit):
+    # Common prefix and suffix first: histories usually differ only at their end
+    start = 0
+    end_expected, end_actual = len(expected), len(actual)
+    while start < end_expected and start < end_actual and _equal(expected[start], actual[start]):
+        start += 1
+    while end_expected > start and end_actual > start and _equal(expected[end_expected - 1], actual[end_actual - 1]):
+        end_expected -= 1
+        end_actual -= 1
+    expected_items, actual_items = expected[start:end_expected], actual[start:end_actual]
+    if max(len(expected_items), len(actual_items)) <= MAX_ALIGNMENT:
+        matcher = SequenceMatcher(None, [_hash(item) for item in expected_items],
+                                  [_hash(item) for item in actual_items], autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            # Equal hashes almost always mean equal items; _diff checks
+            _diff_aligned(expected_items[i1:i2], actual_items[j1:j2], start + i1, start + j1, path, out, limit)
+        return
+    _diff_aligned(expected_items, actual_items, start, start, path, out, limit)
+
+
+def _diff_aligned(expected, actual, expected_start, actual_start, path, out, limit):
+    for i, (expected_item, actual_item) in enumerate(zip(expected, actual)):
+        _diff(expected_item, actual_item, path + (expected_start + i,), out, limit)
+    for i in range(len(actual), len(expected)):
+        if len(out) >= limit:
+            return
+        out.append(Difference(path + (expected_start + i,), "missing", expected[i], None))
+    for i in range(len(expected), len(actual)):
+        if len(out) >= limit:
+            return
+        out.append(Difference(path + (actual_start + i,), "unexpected", None, actual[i]))
+
+
+def _hash(value):
+    try:
+        return structural_hash(value)
+    except Exception:
+        return id(value)
+
+
+class _Field(str):
+    """A pydantic model field in a diff path."""
+
+
+def format_path(path, root="state"):
+    """path as Python-like access: state["messages"][3]["content"], or .field for model fields."""
+    parts = [root]
+    for step in path:
+        parts.append(f".{step}" if isinstance(step, _Field) else f"[{step!r}]")
+    return "".join(parts)
+
+
+def format_difference(difference, root="state"):
+    path = format_path(difference.path, root)
+    if difference.kind == "missing":
+        return f"{path}: missing, expected {_repr.repr(difference.expected)}"
+    if difference.kind == "unexpected":
+        return f"{path}: unexpected {_repr.repr(difference.actual)}"
+    return f"{path}: expected {_repr.repr(difference.expected)}, got {_repr.repr(difference.actual)}"
+
+
+class _Hashes:
+    """Structural hashes and item-hash counts memoized by object for one search (snapshots memoize their own hash)."""
+
+    def __init__(self):
+        self._memo = {}
+        self._counters = {}
+
+    def __call__(self, value):
+        entry = self._memo.get(id(value))
+        if entry is None or entry[0] is not value:
+            entry = self._memo[id(value)] = (value, _hash(value))
+        return entry[1]
+
+    def counter(self, items):
+        entry = self._counters.get(id(items))
+        if entry is None or entry[0] is not items:
+            entry = self._counters[id(items)] = (items, Counter(map(self, items)))
+        return entry[1]
+
+
+def similarity(expected, actual, depth=SIMILARITY_DEPTH, hashes=None):
+    """
+    Rough 0..1 similarity of two states: the share of keys/fields (recursively, up to
+    depth levels) and of list items (as a multiset of item hashes) they have in common.
+    Keys are weighted by the size of their values, so a long message history counts
+    for more than a scalar field next to it.
+    """
+    hashes = hashes or _Hashes()
+    if expected is actual or hashes(expected) == hashes(actual):
+        return 1.0
+    if depth == 0:
+        return 0.0
+    if isinstance(expected, BaseModel) and type(expected) is type(actual):
+        expected, actual = expected.__dict__, actual.__dict__
+    if isinstance(expected, Mapping) and isinstance(actual, Mapping):
+        total = score = 0.0
+        for key, item in expected.items():
+            weight = _weight(item)
+            if key in actual:
+                weight = max(weight, _weight(actual[key]))
+                score += weight * similarity(item, actual[key], depth - 1, hashes)
+            total += weight
+        total += sum(_weight(item) for key, item in actual.items() if key not in expected)
+        return score / total if total else 1.0
+    if isinstance(expected, (list, tuple)) and isinstance(actual, (list, tuple)):
+        if not expected or not actual:
+            return 0.0
+        shared = hashes.counter(expected) & Counter(map(hashes, actual))
+        return sum(shared.values()) / max(len(expected), len(actual))
+    return 0.0
+
+
+def _weight(value):
+    return len(value) or 1 if isinstance(value, (Mapping, list, tuple)) else 1
+
+
+def closest_call(expected, recorded):
+    """Index of the recorded state most similar to expected (the latest on ties), or None if there are none."""
+    hashes = _Hashes()
+    best, best_score = None, -1.0
+    for index, state in enumerate(recorded):
+        score = similarity(expected, state, hashes=hashes)
+        if score >= best_score:
+            best, best_score = index, score
+    return best
+
+
+def mismatch_report(expected, recorded, limit=MAX_DIFFERENCES):
+    """
+    Lines describing how expected differs from the closest of the recorded states:
+    which call it is and each differing path, instead of both states in full.
+    """
+    # Snapshotting expected memoizes its subtree hashes for the ranking and the diff
+    expected = Snapshotter().snapshot(expected)
+    index = closest_call(expected, recorded)
+    if index is None:
+        return ["No calls with a single input state were recorded."]
+    differences = diff_states(expected, recorded[index], limit)
+    lines = [f"Closest recorded call (#{index + 1} of {len(recorded)}) differs at "
+             f"{len(differences) if len(differences) <= limit else f'more than {limit}'} path(s):"]
+    lines.extend("  " + format_difference(difference) for difference in differences[:limit])
+    if len(differences) > limit:
+        lines.append("  ...")
+    return lines
@@ -0,0 +1,173 @@
+import copy
+
+from pydantic import BaseModel
+
+
+def _immutable(self, *args, **kwargs):
+    raise TypeError(f"'{type(self).__name__}' is a snapshot of a recorded call and cannot be modified.")
+
+
+# Immutable leaf types, kept by reference without further checks
+_ATOMIC = frozenset({str, int, float, bool, bytes, type(None)})
+# Containers remembered across snapshots before the cache is trimmed to the latest one
+MAX_CACHED_CONTAINERS = 100_000
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict recorded as a call-time snapshot. It compares, prints and serializes
+    like the dict it was taken from; its structural hash is computed once and reused.
+    """
+    __slots__ = ("_hash",)
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            from agent_test.src.fixture.call_ledger import structural_hash
+            self._hash = structural_hash(dict(self))
+            return self._hash
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
+class FrozenList(list):
+    """Read-only list counterpart of FrozenDict."""
+    __slots__ = ("_hash",)
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = clear = extend = insert = pop = remove = reverse = sort = _immutable
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            from agent_test.src.fixture.call_ledger import structural_hash
+            self._hash = structural_hash(list(self))
+            return self._hash
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+
+def thaw(value):
+    """A plain, mutable deep copy of a snapshot."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(thaw(item) for item in value)
+    return value
+
+
+class Snapshotter:
+    """
+    Takes call-time snapshots of agent inputs with structural sharing. dicts, lists,
+    tuples, sets and pydantic models are snapshotted as FrozenDict/FrozenList/tuple/
+    frozenset/model copies; other objects are kept by reference.
+
+    Containers are remembered with their last snapshot. When a later call passes the
+    same container again, it is compared with that snapshot (a C-level ==) and the
+    snapshot is reused if nothing changed; otherwise only this container is copied and
+    its children are looked up the same way. A message history that grows between
+    calls therefore costs one new list, sharing every old message with the earlier
+    snapshots, instead of a deep copy of the whole state.
+    """
+
+    def __init__(self):
+        # id(container) -> (container, snapshot); holding the container keeps its id from being reused
+        self._cache = {}
+
+    def snapshot(self, value):
+        visited = {}
+        result = self._snapshot(value, visited)
+        self._remember(visited)
+        return result
+
+    def snapshot_call(self, args, kwargs):
+        """Snapshots of a call's positional and keyword arguments."""
+        visited = {}
+        args = tuple(self._snapshot(arg, visited) for arg in args)
+        if kwargs:
+            kwargs = {key: self._snapshot(value, visited) for key, value in kwargs.items()}
+        self._remember(visited)
+        return args, kwargs
+
+    def _remember(self, visited):
+        if len(self._cache) + len(visited) > MAX_CACHED_CONTAINERS:
+            # Bounds the memory held: only the latest snapshot's containers are kept
+            self._cache = visited
+        else:
+            self._cache.update(visited)
+
+    def _snapshot(self, value, visited):
+        if type(value) in _ATOMIC or isinstance(value, (FrozenDict, FrozenList)):
+            return value
+        if isinstance(value, dict):
+            return self._container(value, visited, self._dict)
+        if isinstance(value, list):
+            return self._container(value, visited, self._list)
+        if type(value) is tuple:
+            items = tuple(self._snapshot(item, visited) for item in value)
+            return value if all(a is b for a, b in zip(items, value)) else items
+        if isinstance(value, set):
+            return frozenset(value)
+        if isinstance(value, BaseModel):
+            return self._container(value, visited, self._model)
+        return value
+
+    def _container(self, value, visited, snapshot):
+        key = id(value)
+        entry = visited.get(key)
+        if entry is not None:
+            # Seen earlier in this snapshot; None while its own children are being snapshotted (a cycle)
+            return value if entry[1] is None else entry[1]
+        entry = self._cache.get(key)
+        previous = entry[1] if entry is not None and entry[0] is value else None
+        if previous is not None and _equal(previous, value):
+            visited[key] = entry
+            return previous
+        visited[key] = (value, None)
+        result = snapshot(value, visited, previous)
+        visited[key] = (value, result)
+        return result
+
+    def _dict(self, value, visited, previous=None):
+        return FrozenDict({key: self._snapshot(item, visited) for key, item in value.items()})
+
+    def _list(self, value, visited, previous=None):
+        if previous is not None and len(previous) < len(value) and _equal(previous, value[:len(previous)]):
+            # Only appended to since the last snapshot: the old items are shared as they are
+            return FrozenList(previous + [self._snapshot(item, visited) for item in value[len(previous):]])
+        return FrozenList([self._snapshot(item, visited) for item in value])
+
+    def _model(self, value, visited, previous=None):
+        model = copy.copy(value)
+        # Assigning a field of the snapshot fails: its __dict__ is frozen too
+        object.__setattr__(model, "__dict__", self._dict(value.__dict__, visited))
+        return model
+
+
+def _equal(snapshot, value):
+    try:
+        return snapshot == value
+    except Exception:
+        # e.g. RecursionError on a cyclic structure, or a leaf whose __eq__ raises
+        return False
@@ -0,0 +1,31 @@
+import pytest
+from agent_test.src.agent_utils.models.agent_info import AgentInfo
+from agent_test.src.agent_utils.models.discovery_registry import DiscoveryRegistry
+
+def _info(name, module, agent_type):
+    return AgentInfo(agent_name=name, agent_path=f"{module}.{name}", agent_type=agent_type, agent_module_path=module)
+
+def test_registry_indexes_by_name_type_and_module():
+    registry = DiscoveryRegistry("pkg")
+    registry.add_module("pkg.a", [_info("agent1", "pkg.a", "RemoteRunnable")], [_info("tool1", "pkg.a", "tool")])
+    registry.add_module("pkg.b", [_info("agent2", "pkg.b", "RunnableLambda")], [])
+    assert registry.get_agent("agent1").agent_module_path == "pkg.a"
+    assert registry.get_tool("tool1").agent_name == "tool1"
+    assert [i.agent_name for i in registry.by_type("RunnableLambda")] == ["agent2"]
+    assert [i.agent_name for i in registry.by_module("pkg.a")] == ["agent1", "tool1"]
+    assert registry.modules == ["pkg.a", "pkg.b"]
+
+def test_registry_later_module_wins_name_clash():
+    registry = DiscoveryRegistry("pkg")
+    registry.add_module("pkg.a", [_info("agent1", "pkg.a", "RemoteRunnable")], [])
+    registry.add_module("pkg.b", [_info("agent1", "pkg.b", "RemoteRunnable")], [])
+    assert registry.get_agent("agent1").agent_module_path == "pkg.b"
+
+def test_frozen_registry_is_read_only():
+    registry = DiscoveryRegistry("pkg")
+    registry.add_module("pkg.a", [_info("agent1", "pkg.a", "RemoteRunnable")], [])
+    registry.freeze()
+    with pytest.raises(TypeError):
+        registry.agents["agent2"] = registry.agents["agent1"]
+    with pytest.raises(RuntimeError):
+        registry.add_module("pkg.b", [], [])
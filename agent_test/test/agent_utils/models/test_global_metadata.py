@@ -9,3 +9,31 @@ def test_identify_patcher_type_default():
     result = GlobalMetadata.identify_patcher_type(APIMockType.REQUESTS)
     # Could be None or a patcher class depending on registry
     assert result is None or callable(result)
+
+def test_get_discovery_is_shared_and_frozen():
+    GlobalMetadata.clear_discovery("examples.langgraph.prompt_agentic.synchronous")
+    first = GlobalMetadata.get_discovery("examples.langgraph.prompt_agentic.synchronous")
+    second = GlobalMetadata.get_discovery("examples.langgraph.prompt_agentic.synchronous")
+    assert first is second
+    assert first.frozen
+    assert "agent1" in first.agents
+
+def test_get_discovery_is_keyed_by_options():
+    root_path = "examples.langgraph.prompt_agentic.synchronous"
+    GlobalMetadata.clear_discovery(root_path)
+    imported = GlobalMetadata.get_discovery(root_path, static=False)
+    assert GlobalMetadata.get_discovery(root_path, static=True) is not imported
+    assert GlobalMetadata.get_discovery(root_path, static=False) is imported
+
+def test_failed_discovery_is_not_cached(monkeypatch):
+    from agent_test.src.agent_utils import remoterunnable_utils
+
+    def failing_scan(*args):
+        raise ImportError("broken package")
+        yield
+    GlobalMetadata.clear_discovery("examples.langgraph.prompt_agentic.synchronous")
+    monkeypatch.setattr(remoterunnable_utils, "_scan_package", failing_scan)
+    failed = GlobalMetadata.get_discovery("examples.langgraph.prompt_agentic.synchronous")
+    assert not failed.complete and not failed.agents
+    monkeypatch.undo()
+    assert "agent1" in GlobalMetadata.get_discovery("examples.langgraph.prompt_agentic.synchronous").agents
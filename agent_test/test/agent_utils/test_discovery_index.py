@@ -0,0 +1,58 @@
+import os
+from agent_test.src.agent_utils.discovery_index import DiscoveryIndex
+from agent_test.src.agent_utils.models.agent_info import AgentInfo
+
+def _agent(name):
+    return AgentInfo(agent_name=name, agent_path=f"pkg.mod.{name}", agent_type="RemoteRunnable", agent_module_path="pkg.mod")
+
+def test_index_round_trip(tmp_path):
+    source = tmp_path / "mod.py"
+    source.write_text("agent1 = None\n")
+    index_path = str(tmp_path / "cache" / "index.json")
+    index = DiscoveryIndex(index_path)
+    index.store("pkg.mod", str(source), [_agent("agent1")], [])
+    index.save()
+    agents, tools = DiscoveryIndex(index_path).lookup("pkg.mod", str(source))
+    assert [a.agent_name for a in agents] == ["agent1"]
+    assert tools == []
+
+def test_index_invalidated_on_source_change(tmp_path):
+    source = tmp_path / "mod.py"
+    source.write_text("agent1 = None\n")
+    index = DiscoveryIndex(str(tmp_path / "index.json"))
+    index.store("pkg.mod", str(source), [_agent("agent1")], [])
+    source.write_text("agent1 = None\nagent2 = None\n")
+    assert index.lookup("pkg.mod", str(source)) is None
+
+def test_index_survives_touch_without_content_change(tmp_path):
+    source = tmp_path / "mod.py"
+    source.write_text("agent1 = None\n")
+    index = DiscoveryIndex(str(tmp_path / "index.json"))
+    index.store("pkg.mod", str(source), [_agent("agent1")], [])
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert index.lookup("pkg.mod", str(source)) is not None
+
+def test_index_skips_modules_reexporting_members(tmp_path):
+    source = tmp_path / "mod.py"
+    source.write_text("from pkg.other import agent1\n")
+    index = DiscoveryIndex(str(tmp_path / "index.json"))
+    index.store("pkg.mod", str(source), [_agent("agent1")], [])
+    assert index.lookup("pkg.mod", str(source)) is None
+    source.write_text("from pkg.other import agent1\nagent2 = None\n")
+    index.store("pkg.mod", str(source), [_agent("agent2")], [])
+    assert index.lookup("pkg.mod", str(source)) is not None
+
+def test_index_invalidated_when_imported_local_module_changes(tmp_path):
+    package = tmp_path / "pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "config.py").write_text("URL = 'http://a'\n")
+    (package / "factory.py").write_text("from .config import URL\n")
+    source = package / "mod.py"
+    source.write_text("from pkg.factory import URL\nagent1 = RemoteRunnable(URL)\n")
+    index = DiscoveryIndex(str(tmp_path / "index.json"))
+    index.store("pkg.mod", str(source), [_agent("agent1")], [])
+    assert index.lookup("pkg.mod", str(source)) is not None
+    (package / "config.py").write_text("URL = 'http://b'\n")
+    assert index.lookup("pkg.mod", str(source)) is None
@@ -21,3 +21,32 @@ def test_find_async_nodes_in_graph():
     async_nodes = remoterunnable_utils.find_async_nodes_in_graph(graph)
     assert "a" in async_nodes
     assert "b" not in async_nodes
+
+def test_find_all_remoterunnables_with_index(tmp_path, monkeypatch):
+    monkeypatch.setenv("AGENT_TEST_CACHE_DIR", str(tmp_path))
+    package = "examples.langgraph.prompt_agentic.synchronous"
+    cold = remoterunnable_utils.find_all_remoterunnables(package, use_index=True)
+    assert (tmp_path / "discovery_index.json").exists()
+    warm = remoterunnable_utils.find_all_remoterunnables(package, use_index=True)
+    assert warm == cold
+    assert "agent1" in warm
+
+def test_discover_package_returns_agents_and_tools():
+    registry = remoterunnable_utils.discover_package("examples.langgraph.prompt_agentic.synchronous_other")
+    assert "get_account_balance_api" in registry.agents
+    assert "call_get_user_metadata" in registry.tools
+    assert registry.get_agent("txn_details_runnable").agent_type == "TxnDetailsRunnable"
+
+def test_discover_package_static_matches_import_mode():
+    package = "examples.langgraph.prompt_agentic.synchronous_other"
+    static = remoterunnable_utils.discover_package(package, static=True)
+    imported = remoterunnable_utils.discover_package(package, static=False)
+    assert static.agents == imported.agents
+    assert static.tools == imported.tools
+
+def test_discover_package_parallel_matches_serial():
+    package = "examples.langgraph.prompt_agentic.synchronous_other"
+    parallel = remoterunnable_utils.discover_package(package, workers=2)
+    serial = remoterunnable_utils.discover_package(package, workers=0)
+    assert list(parallel.agents.items()) == list(serial.agents.items())
+    assert parallel.modules == serial.modules
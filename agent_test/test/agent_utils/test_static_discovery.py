@@ -0,0 +1,48 @@
+from agent_test.src.agent_utils.static_discovery import scan_source
+
+SOURCE = '''
+from langserve import RemoteRunnable
+from langchain_core.runnables import Runnable
+from langchain.tools import tool
+from pydantic import BaseModel
+
+agent1 = RemoteRunnable("http://localhost:8001/agent1/process")
+
+class State(BaseModel):
+    value: str
+
+class Custom(Runnable):
+    def invoke(self, state):
+        return state
+
+custom = Custom()
+
+@tool
+def lookup(x: int) -> int:
+    """doc"""
+    return x
+'''
+
+def test_scan_source_finds_runnables_and_tools():
+    agents, tools = scan_source("pkg.mod", SOURCE)
+    assert {a.agent_name: a.agent_type for a in agents} == {
+        "agent1": "RemoteRunnable",
+        "custom": "Custom",
+        "lookup": "StructuredTool",
+    }
+    assert [t.agent_name for t in tools] == ["lookup"]
+    assert agents[0].agent_path == "pkg.mod.agent1"
+
+def test_scan_source_is_ambiguous_for_unknown_library_calls():
+    source = "from langgraph.graph import StateGraph\nbuilder = StateGraph(dict)\ngraph = builder.compile()\n"
+    assert scan_source("pkg.mod", source) is None
+
+def test_scan_source_is_ambiguous_for_package_reexports():
+    assert scan_source("pkg.mod", "from .other import agent1\n") is None
+    assert scan_source("pkg.mod", "from langserve import *\n") is None
+
+def test_scan_source_is_ambiguous_for_tool_subclasses_and_imported_instances():
+    source = "from langchain_core.tools import BaseTool\nclass Lookup(BaseTool):\n    name: str = 'lookup'\nlookup = Lookup()\n"
+    assert scan_source("pkg.mod", source) is None
+    assert scan_source("pkg.mod", "from langchain_community.tools import shared_search\n") is None
+    assert scan_source("pkg.mod", "from langserve import add_routes\n") == ([], [])
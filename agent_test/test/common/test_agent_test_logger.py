@@ -1,6 +1,7 @@
+import json
 import logging
 import pytest
-from agent_test.src.common.agent_test_logger import AgentTestLogger
+from agent_test.src.common.agent_test_logger import AgentTestLogger, StructuredFormatter, debug_event
 
 def test_get_logger_is_singleton():
     logger1 = AgentTestLogger.get_logger("test_logger")
@@ -11,3 +12,41 @@ def test_set_logger_sets_custom_logger():
     custom_logger = logging.getLogger("custom_logger")
     AgentTestLogger.set_logger(custom_logger)
     assert AgentTestLogger.get_logger() is custom_logger
+
+class Exploding:
+    def __repr__(self):
+        raise AssertionError("fields must not be formatted when debug is off")
+
+def test_debug_events_are_not_formatted_below_debug_level():
+    logger = logging.getLogger("agent_test_logger.lazy")
+    logger.setLevel(logging.WARNING)
+    debug_event(logger, "mock_agent_response", response_state=Exploding())
+
+def test_debug_events_keep_structured_fields(caplog):
+    logger = logging.getLogger("agent_test_logger.structured")
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        debug_event(logger, "mock_api_call", api_path="httpx.post", payload={"url": "http://x"})
+    [record] = caplog.records
+    assert record.event == "mock_api_call"
+    assert record.fields == {"api_path": "httpx.post", "payload": {"url": "http://x"}}
+    assert json.loads(StructuredFormatter().format(record))["fields"]["payload"] == {"url": "http://x"}
+    assert "api_path='httpx.post'" in record.getMessage()
+
+def test_library_logger_defaults_to_warning():
+    assert AgentTestLogger.get_logger().getEffectiveLevel() >= logging.WARNING
+
+def test_structured_fields_do_not_overwrite_the_envelope(caplog):
+    logger = logging.getLogger("agent_test_logger.envelope")
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        debug_event(logger, "when_input_state", level="custom", time=0)
+    data = json.loads(StructuredFormatter().format(caplog.records[0]))
+    assert data["level"] == "DEBUG"
+    assert data["fields"] == {"level": "custom", "time": 0}
+
+def test_invalid_level_falls_back_to_warning(monkeypatch):
+    monkeypatch.setattr(AgentTestLogger, "_logger", None)
+    monkeypatch.setattr(AgentTestLogger, "_handler", None)
+    monkeypatch.setenv("AGENT_TEST_LOG_LEVEL", "verbose")
+    with pytest.warns(UserWarning, match="Invalid AGENT_TEST_LOG_LEVEL 'VERBOSE'"):
+        logger = AgentTestLogger.get_logger("agent_test_logger.invalid_level")
+    assert logger.level == logging.WARNING
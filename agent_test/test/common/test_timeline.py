@@ -0,0 +1,21 @@
+import pytest
+from agent_test.src.common.timeline import Histogram, Timeline
+
+def test_timeline_queries_and_histograms():
+    timeline = Timeline()
+    timeline.record("invoke", "run", 0.0, 1.0)
+    timeline.record("agent_call", "agent1.invoke", 0.1, 0.3)
+    timeline.record("agent_call", "agent1.invoke", 0.2, 0.4)
+    timeline.record("api_call", "httpx.post", 0.6, 0.7)
+    assert [event.name for event in timeline.events("agent_call")] == ["agent1.invoke", "agent1.invoke"]
+    assert timeline.total("agent_call") == pytest.approx(0.4)
+    histogram = timeline.histograms("agent_call")[("agent_call", "agent1.invoke")]
+    assert histogram.count == 2 and histogram.percentile(50) == pytest.approx(0.2)
+    # Overlapping agent calls cover 0.1-0.4, plus 0.1 of API time
+    assert timeline.dependency_time() == pytest.approx(0.4)
+    assert timeline.orchestrator_overhead() == pytest.approx(0.6)
+
+def test_histogram_buckets_are_powers_of_two_microseconds():
+    histogram = Histogram([0.0000015, 0.000003, 0.0000031])
+    assert histogram.buckets() == {0.000002: 1, 0.000004: 2}
+    assert histogram.summary()["max"] == 0.0000031
@@ -0,0 +1,16 @@
+import os
+import pytest
+from agent_test.src.common.workers import resolve_workers
+
+def test_resolve_workers_prefers_argument_then_env_then_default(monkeypatch):
+    monkeypatch.delenv("AGENT_TEST_X_WORKERS", raising=False)
+    assert resolve_workers(None, "AGENT_TEST_X_WORKERS") == 0
+    assert resolve_workers(None, "AGENT_TEST_X_WORKERS", default=-1) == (os.cpu_count() or 1)
+    monkeypatch.setenv("AGENT_TEST_X_WORKERS", "3")
+    assert resolve_workers(None, "AGENT_TEST_X_WORKERS", default=-1) == 3
+    assert resolve_workers(2, "AGENT_TEST_X_WORKERS") == 2
+
+def test_resolve_workers_rejects_non_integer_env_value(monkeypatch):
+    monkeypatch.setenv("AGENT_TEST_X_WORKERS", "many")
+    with pytest.raises(ValueError, match="'many' from AGENT_TEST_X_WORKERS"):
+        resolve_workers(None, "AGENT_TEST_X_WORKERS")
@@ -0,0 +1,43 @@
+import json
+import pytest
+from agent_test.src.fixture.data_loader.feature_loader import FeatureLoader
+from agent_test.src.fixture.data_loader.jsonl_feature_loader import DuplicateScenarioError, JSONLFeatureLoader
+
+@pytest.fixture
+def jsonl_file(tmp_path):
+    path = tmp_path / "scenarios.jsonl"
+    lines = [json.dumps({"id": "s0", "n": 0}), "", json.dumps({"n": 1}), json.dumps({"id": "s2", "n": 2})]
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+def test_jsonl_loader_streams_scenarios(jsonl_file):
+    entries = JSONLFeatureLoader().iter_entries(jsonl_file)
+    assert next(entries) == (0, 0, {"id": "s0", "n": 0})
+    assert [scenario["n"] for _, _, scenario in entries] == [1, 2]
+
+def test_jsonl_loader_returns_lists(jsonl_file):
+    loader = JSONLFeatureLoader()
+    assert [scenario["n"] for scenario in loader.parse(jsonl_file)] == [0, 1, 2]
+    assert loader.load_all(jsonl_file) == loader.parse(jsonl_file)
+
+def test_duplicate_scenario_ids_raise(tmp_path):
+    path = tmp_path / "duplicates.jsonl"
+    path.write_text(json.dumps({"id": "a"}) + "\n" + json.dumps({"id": "a"}) + "\n")
+    loader = JSONLFeatureLoader(index_dir=str(tmp_path / "index"))
+    with pytest.raises(DuplicateScenarioError, match="'a' is used by scenarios 0 and 1"):
+        loader.load_scenario(str(path), "a")
+
+def test_jsonl_loader_loads_one_scenario_by_id(jsonl_file, tmp_path):
+    loader = JSONLFeatureLoader(index_dir=str(tmp_path / "index"))
+    assert loader.load_scenario(jsonl_file, "s2") == {"id": "s2", "n": 2}
+    assert loader.load_scenario(jsonl_file, 1) == {"n": 1}
+    assert len(list((tmp_path / "index").iterdir())) == 1
+    with open(jsonl_file, "a") as f:
+        f.write(json.dumps({"id": "s3", "n": 3}) + "\n")
+    assert loader.load_scenario(jsonl_file, "s3") == {"id": "s3", "n": 3}
+    with pytest.raises(KeyError):
+        loader.load_scenario(jsonl_file, "missing")
+
+def test_feature_loader_iterates_jsonl(jsonl_file):
+    loader = FeatureLoader("jsonl", root_path="pkg", file_list=[jsonl_file])
+    assert [scenario["root_path"] for scenario in loader.iter_all()] == ["pkg"] * 3
@@ -0,0 +1,76 @@
+import json
+from types import SimpleNamespace
+import pytest
+from agent_test.src.agent_utils.models.api_mock_type import APIMockType
+from agent_test.src.agent_utils.models.global_metadata import GlobalMetadata
+from agent_test.src.fixture.data_loader import scenario_compiler
+from agent_test.src.fixture.data_loader.scenario_compiler import ScenarioCompileError, ScenarioCompiler, literal
+
+SCENARIO = {
+    "root_path": "examples.langgraph.simple_graph.synchronous",
+    "mock_api_calls": [{"api_path": "httpx.post", "payload": {"url": "http://x"}, "return_value": {}, "api_type": "HTTPX"}],
+    "input_state": {"messages": []},
+    "agent_responses": [{"agent_name": "agent1", "response_state": {"messages": []}}],
+    "expect_agent_invocations": [{"agent_name": "agent2", "state": {"messages": []}}],
+}
+
+def test_compiler_resolves_and_caches_json_scenarios(tmp_path, monkeypatch):
+    path = tmp_path / "test_scenarios.json"
+    path.write_text(json.dumps([SCENARIO]))
+    compiler = ScenarioCompiler(cache_dir=str(tmp_path / "cache"), resolve_agents=True)
+    [compiled] = compiler.load(str(path))
+    assert compiled["mock_api_calls"][0]["api_type"] is APIMockType.HTTPX
+    assert compiled["expect_agent_invocations"][0] == {"agent_name": "agent2", "state": {"messages": []}, "agent_type": "invoke", "ntimes": 1}
+    monkeypatch.setattr(ScenarioCompiler, "compile", lambda *args: pytest.fail("warm run must not recompile"))
+    assert compiler.load(str(path)) == [compiled]
+
+def test_compiler_rejects_invalid_scenarios(tmp_path):
+    compiler = ScenarioCompiler(cache_dir=str(tmp_path / "cache"), resolve_agents=True)
+    bad_type = dict(SCENARIO, mock_api_calls=[dict(SCENARIO["mock_api_calls"][0], api_type="FTP")])
+    unknown_agent = dict(SCENARIO, agent_responses=[{"agent_name": "agent9", "response_state": {}}])
+    for index, scenario in enumerate([bad_type, unknown_agent, {"agent_responses": []}]):
+        path = tmp_path / f"bad{index}.json"
+        path.write_text(json.dumps([scenario]))
+        with pytest.raises(ScenarioCompileError):
+            compiler.load(str(path))
+
+def test_compiled_feature_primes_step_literals(tmp_path, monkeypatch):
+    path = tmp_path / "chain.feature"
+    path.write_text(
+        "Feature: Chain\n"
+        "  Scenario: hello\n"
+        "    Given agent agent1 will respond with '{'messages': [{'role': 'agent1'}]}'\n"
+        "    When the user sends '{\"messages\": []}' and invokes the 'run' orchestrator\n"
+    )
+    monkeypatch.setattr(scenario_compiler, "_literals", {})
+    feature = ScenarioCompiler(cache_dir=str(tmp_path / "cache")).load(str(path))
+    assert feature.scenarios[0][0] == "hello" and len(feature.scenarios[0][1]) == 2
+    assert "{'messages': [{'role': 'agent1'}]}" in scenario_compiler._literals
+    assert literal('{"messages": []}') == {"messages": []}
+
+def test_literal_returns_a_fresh_value_each_call():
+    state = literal('{"messages": [{"role": "user", "content": "hello"}]}')
+    state["messages"].append({"role": "api1"})
+    assert literal('{"messages": [{"role": "user", "content": "hello"}]}') == {"messages": [{"role": "user", "content": "hello"}]}
+
+def test_warm_cache_rechecks_agent_names(tmp_path, monkeypatch):
+    path = tmp_path / "test_scenarios.json"
+    path.write_text(json.dumps([SCENARIO]))
+    compiler = ScenarioCompiler(cache_dir=str(tmp_path / "cache"), resolve_agents=True)
+    compiler.load(str(path))
+    registry = GlobalMetadata.get_discovery(SCENARIO["root_path"])
+    monkeypatch.setattr(GlobalMetadata, "get_discovery",
+                        lambda root_path, **options: SimpleNamespace(agents={"agent1": None}, tools=registry.tools))
+    with pytest.raises(ScenarioCompileError, match="unknown agents \\['agent2'\\]"):
+        compiler.load(str(path))
+
+def test_cache_writable_by_others_is_ignored(tmp_path, monkeypatch):
+    path = tmp_path / "test_scenarios.json"
+    path.write_text(json.dumps([SCENARIO]))
+    compiler = ScenarioCompiler(cache_dir=str(tmp_path / "cache"))
+    compiler.load(str(path))
+    [cache_file] = (tmp_path / "cache").iterdir()
+    cache_file.chmod(0o666)
+    compiled = []
+    monkeypatch.setattr(ScenarioCompiler, "compile", lambda *args: compiled)
+    assert compiler.load(str(path)) is compiled
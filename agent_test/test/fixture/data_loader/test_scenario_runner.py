@@ -0,0 +1,73 @@
+import json
+import pytest
+from agent_test.src.fixture.data_loader.jsonl_feature_loader import JSONLFeatureLoader
+from agent_test.src.fixture.data_loader.scenario_runner import iter_tasks, main, run_scenarios
+
+ORCHESTRATOR = "examples.langgraph.simple_graph.synchronous.orchestrator_code:orchestrator_graph.invoke"
+
+def _scenario(content, expected_content):
+    return {
+        "root_path": "examples.langgraph.simple_graph.synchronous",
+        "mock_api_calls": [{
+            "api_path": "httpx.post",
+            "payload": {"url": "http://127.0.0.1:8004/api1/getdata1"},
+            "return_value": {"content": "hello"},
+            "api_type": "HTTPX",
+        }],
+        "input_state": {"messages": [{"role": "user", "content": "hello"}]},
+        "agent_responses": [
+            {"agent_name": "agent1", "response_state": {"messages": [{"role": "agent1", "content": content}]}},
+            {"agent_name": "agent2", "response_state": {"messages": [{"role": "agent2", "content": "response2"}]}},
+            {"agent_name": "agent3", "response_state": {"messages": [{"role": "agent3", "content": "response3"}]}},
+        ],
+        "expect_agent_invocations": [
+            {"agent_name": "agent2", "state": {"messages": [{"role": "agent1", "content": expected_content}]}},
+        ],
+    }
+
+@pytest.fixture
+def scenario_files(tmp_path):
+    (tmp_path / "test_scenarios1.json").write_text(json.dumps([_scenario("a", "a"), _scenario("b", "b")]))
+    (tmp_path / "test_scenarios2.json").write_text(json.dumps([_scenario("c", "not c")]))
+    return str(tmp_path / "test_scenarios*.json")
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_run_scenarios_aggregates_pass_fail_and_timing(scenario_files, workers):
+    report = run_scenarios(scenario_files, ORCHESTRATOR, workers=workers)
+    assert [(r.index, r.passed) for r in report.results] == [(0, True), (1, True), (0, False)]
+    assert report.failed[0].source.endswith("test_scenarios2.json")
+    assert "AssertionError" in report.failed[0].error
+    assert all(r.duration > 0 for r in report.results)
+    assert "3 scenarios: 2 passed, 1 failed" in report.summary()
+
+def test_scenario_runner_cli_writes_json_report(scenario_files, tmp_path):
+    out = tmp_path / "report.json"
+    assert main([scenario_files, "--orchestrator", ORCHESTRATOR, "--workers", "1", "--json", str(out)]) == 1
+    assert json.loads(out.read_text())["passed"] == 2
+
+def test_run_scenarios_in_thread_mode(scenario_files):
+    report = run_scenarios(scenario_files, ORCHESTRATOR, workers=3, mode="thread")
+    assert [(r.index, r.passed) for r in report.results] == [(0, True), (1, True), (0, False)]
+
+def test_run_scenarios_streams_jsonl_and_selects_ids(tmp_path):
+    path = tmp_path / "regression.jsonl"
+    scenarios = [dict(_scenario(c, e), id=f"case-{c}") for c, e in [("a", "a"), ("b", "x"), ("c", "c")]]
+    path.write_text("\n".join(json.dumps(scenario) for scenario in scenarios) + "\n")
+    report = run_scenarios(str(path), ORCHESTRATOR, workers=0)
+    assert [r.passed for r in report.results] == [True, False, True]
+    report = run_scenarios(str(path), ORCHESTRATOR, workers=0, scenario_ids=["case-c"])
+    assert [(r.index, r.passed) for r in report.results] == [(2, True)]
+
+
+def test_iter_tasks_reads_the_jsonl_index_once(tmp_path, monkeypatch):
+    path = tmp_path / "regression.jsonl"
+    path.write_text("\n".join(json.dumps({"id": f"case-{n}"}) for n in range(4)) + "\n")
+    calls = []
+    build_index = JSONLFeatureLoader.build_index
+    def counting_build_index(self, source):
+        calls.append(source)
+        return build_index(self, source)
+    monkeypatch.setattr(JSONLFeatureLoader, "build_index", counting_build_index)
+    tasks = list(iter_tasks(str(path), scenario_ids=["case-3", "case-1"]))
+    assert [(index, scenario["id"]) for _, index, scenario in tasks] == [(1, "case-1"), (3, "case-3")]
+    assert calls == [str(path)]
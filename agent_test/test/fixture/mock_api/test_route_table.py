@@ -0,0 +1,36 @@
+import pytest
+from agent_test.src.fixture.mock_api.custom_mock import CustomAPIMock
+from agent_test.src.fixture.mock_api.httpx_mock import HttpxAPIMock
+from agent_test.src.fixture.mock_api.route_table import APIMockMiss, RouteTable
+
+def test_route_table_dispatches_many_payloads_for_one_path():
+    table = RouteTable("httpx.post", HttpxAPIMock())
+    table.add({"url": "http://api/a", "params": {"input": "hello"}}, {"content": "hello"})
+    table.add({"url": "http://api/a", "params": {"input": "world"}}, {"content": "world"})
+    table.add({"url": "http://api/b"}, {"content": "b"})
+    assert table.resolve(("http://api/a",), {"params": {"input": "world"}}).json() == {"content": "world"}
+    assert table.resolve(("http://api/a?input=hello",), {}).json() == {"content": "hello"}
+    assert table.resolve(("http://api/b",), {"params": {"any": "thing"}}).json() == {"content": "b"}
+    assert table.call_count == 3
+
+def test_route_table_miss_report_names_differing_fields():
+    table = RouteTable("httpx.post", HttpxAPIMock())
+    table.add({"url": "http://api/a", "params": {"input": "hello"}}, {"content": "hello"})
+    with pytest.raises(APIMockMiss) as excinfo:
+        table.resolve(("http://api/a",), {"params": {"input": "nope"}})
+    assert "differs in ['params']" in str(excinfo.value)
+    assert len(table.misses) == 1
+
+def test_route_table_args_payload_and_default_route():
+    table = RouteTable("module.func", CustomAPIMock())
+    table.add({"args": [1, 2]}, "matched")
+    table.add(None, "default")
+    assert table.resolve((1, 2), {}) == "matched"
+    assert table.resolve((3,), {}) == "default"
+
+def test_http_default_route_keeps_its_mock_shape():
+    table = RouteTable("httpx.post", HttpxAPIMock())
+    table.add({"url": "http://api/a"}, {"content": "a"})
+    table.add(None, {"content": "default"})
+    assert table.resolve(("http://api/a",), {}).json() == {"content": "a"}
+    assert table.resolve(("http://api/other",), {})() == {"content": "default"}
@@ -0,0 +1,42 @@
+import pytest
+from agent_test.src.fixture.mock_api.httpx_mock import HttpxAPIMock
+from agent_test.src.fixture.mock_api.route_table import APIMockMiss, RouteTable
+from agent_test.src.fixture.mock_api.url_router import UrlRouter
+
+def test_url_template_captures_path_params_for_response_factory():
+    table = RouteTable("httpx.get", HttpxAPIMock())
+    table.add(
+        {"url": "http://bank/accounts/{account_id}/txns"},
+        lambda account_id: {"account": account_id},
+    )
+    assert table.resolve(("http://bank/accounts/ACC123/txns",), {}).json() == {"account": "ACC123"}
+    assert table.resolve(("http://bank/accounts/ACC9/txns/",), {}).json() == {"account": "ACC9"}
+    with pytest.raises(APIMockMiss) as excinfo:
+        table.resolve(("http://bank/accounts/ACC123",), {})
+    assert "http://bank/accounts/{account_id}/txns" in str(excinfo.value)
+
+def test_url_template_query_matching_and_captures():
+    table = RouteTable("httpx.get", HttpxAPIMock())
+    table.add({"url": "http://bank/accounts/{account_id}/txns", "params": {"page": 2}}, {"page": 2})
+    table.add(
+        {"url": "http://bank/accounts/{account_id}/txns?page={page}"},
+        lambda account_id, page: {"account": account_id, "page": page},
+    )
+    assert table.resolve(("http://bank/accounts/A/txns?page=2",), {}).json() == {"page": 2}
+    assert table.resolve(("http://bank/accounts/A/txns",), {"params": {"page": 5}}).json() == {"account": "A", "page": 5}
+    with pytest.raises(APIMockMiss):
+        table.resolve(("http://bank/accounts/A/txns",), {})
+
+def test_url_router_prefers_literal_segments_and_backtracks():
+    router = UrlRouter()
+    router.add("http://h/users/{user_id}/profile", None, None, False, "template")
+    router.add("http://h/users/me/settings", None, None, False, "literal")
+    assert router.resolve({"url": "http://h/users/me/settings"}) == ("literal", {})
+    assert router.resolve({"url": "http://h/users/me/profile"}) == ("template", {"user_id": "me"})
+    assert router.resolve({"url": "http://other/users/me/profile"}) is None
+
+def test_url_router_scales_to_many_templates():
+    router = UrlRouter()
+    for i in range(2000):
+        router.add(f"http://h/svc{i}/items/{{item_id}}", None, None, False, i)
+    assert router.resolve({"url": "http://h/svc1999/items/42"}) == (1999, {"item_id": "42"})
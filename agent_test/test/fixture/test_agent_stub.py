@@ -0,0 +1,35 @@
+import asyncio
+from langchain_core.tools import tool
+from agent_test.src.fixture.agent_stub import AgentMethodStub, AsyncAgentMethodStub, StubPatcher
+
+@tool
+def lookup_tool(x: int) -> int:
+    """Returns x."""
+    return x
+
+def test_stub_records_calls():
+    stub = AgentMethodStub(return_value={"ok": True})
+    assert stub({"n": 1}) == {"ok": True}
+    stub({"n": 2}, config=None)
+    assert stub.called and stub.call_count == 2
+    args, kwargs = stub.call_args_list[0]
+    assert args == ({"n": 1},) and dict(kwargs) == {}
+    assert stub.call_args.kwargs == {"config": None}
+    stub.reset_mock()
+    assert not stub.called
+
+def test_async_stub_awaits_side_effect():
+    async def side_effect(state):
+        return state["n"] * 2
+    stub = AsyncAgentMethodStub(side_effect=side_effect)
+    assert asyncio.run(stub({"n": 3})) == 6
+    assert stub.call_count == 1
+
+def test_stub_patcher_patches_pydantic_tool():
+    stub = AgentMethodStub(return_value=42)
+    patcher = StubPatcher(f"{__name__}.lookup_tool", "invoke", stub)
+    assert patcher.start() is stub
+    assert lookup_tool.invoke({"x": 1}) == 42
+    patcher.stop()
+    patcher.stop()
+    assert lookup_tool.invoke({"x": 1}) == 1
@@ -0,0 +1,88 @@
+import asyncio
+import httpx
+import pytest
+import requests
+from fastapi import FastAPI
+from agent_test.src.fixture.asgi_transport import InProcessApps, origin
+from agent_test.src.fixture.fixture_class import FixtureLibrary
+from examples.langgraph.simple_graph.asynchronous import orchestrator_code
+
+ROOT_PATH = "examples.langgraph.simple_graph.asynchronous"
+APPS = {
+    "http://localhost:8001": "examples.common.worker1.main:app",
+    "http://localhost:8002": "examples.common.worker2.main:app",
+    "http://127.0.0.1:8004": "examples.common.api1.api_code:app",
+}
+
+def test_origin_treats_loopback_hosts_alike():
+    assert origin("http://127.0.0.1:8004/api1/getdata1") == origin("http://localhost:8004") == "http://localhost:8004"
+    assert origin("https://example.com/x") == "https://example.com:443"
+
+def test_workers_and_api_run_in_process():
+    def orchestrator(state):
+        state = orchestrator_code.agent1.invoke(state)
+        state = asyncio.run(orchestrator_code.agent2.ainvoke(state))
+        api = httpx.post("http://127.0.0.1:8004/api1/getdata1", params={"input": "hello"}).json()
+        legacy = requests.post("http://localhost:8004/api1/getdata1", params={"input": "hello"}).json()
+        return state, api, legacy
+
+    fixture = (
+        FixtureLibrary(root_path=ROOT_PATH)
+        .serve_in_process(APPS)
+        .when_input_state({"messages": [{"role": "user", "content": "hello"}]})
+        .invoke_function(orchestrator)
+    )
+    state, api, legacy = fixture.results[0]
+    # The real worker logic ran: each worker marks the last message with its id
+    assert state["messages"][-1] == {"role": "user", "content": "hello", "1": "INVOKED", "2": "INVOKED"}
+    assert api == legacy == {"role": "api1", "content": "hello"}
+    # Patches are undone on exit
+    assert isinstance(orchestrator_code.agent1.sync_client._transport, httpx.HTTPTransport)
+
+def test_unserved_origin_is_not_rerouted():
+    fixture = FixtureLibrary(root_path=ROOT_PATH).serve_in_process({"http://localhost:8001": FastAPI()})
+    with fixture:
+        # agent2 (port 8002) keeps its network client
+        assert isinstance(orchestrator_code.agent2.sync_client._transport, httpx.HTTPTransport)
+        assert not isinstance(orchestrator_code.agent1.sync_client._transport, httpx.HTTPTransport)
+
+def test_unknown_origin_raises_connect_error():
+    apps = InProcessApps({"http://localhost:8001": FastAPI()})
+    client = httpx.Client(transport=apps.sync_transport)
+    with pytest.raises(httpx.ConnectError, match="No in-process app serves http://localhost:9999"):
+        client.get("http://localhost:9999/x")
+
+def test_clients_are_closed_on_exit():
+    fixture = FixtureLibrary(root_path=ROOT_PATH).serve_in_process(APPS)
+    with fixture:
+        sync_client = orchestrator_code.agent1.sync_client
+        async_client = orchestrator_code.agent1.async_client
+    assert sync_client.is_closed and async_client.is_closed
+
+def test_session_scenarios_reach_their_own_apps():
+    from agent_test.src.fixture.patch_session import PatchSession
+    first, second = FastAPI(), FastAPI()
+    first.get("/who")(lambda: "first")
+    second.get("/who")(lambda: "second")
+    original_get = httpx.get
+    session = PatchSession()
+    fixtures = [
+        FixtureLibrary(root_path=ROOT_PATH, patch_session=session).serve_in_process({"http://localhost:8001": app})
+        for app in (first, second)
+    ]
+
+    async def scenario(fixture):
+        with fixture:
+            await asyncio.sleep(0)
+            return orchestrator_code.agent1.sync_client.get("http://localhost:8001/who").json(), httpx.get("http://localhost:8001/who").json()
+
+    async def both():
+        return await asyncio.gather(*(scenario(fixture) for fixture in fixtures))
+    try:
+        assert asyncio.run(both()) == [("first", "first"), ("second", "second")]
+        client = orchestrator_code.agent1.sync_client
+    finally:
+        session.close()
+    assert httpx.get is original_get
+    assert client.is_closed
+    assert isinstance(orchestrator_code.agent1.sync_client._transport, httpx.HTTPTransport)
@@ -0,0 +1,31 @@
+from agent_test.src.fixture.agent_stub import AgentMethodStub
+from agent_test.src.fixture.call_ledger import CallLedger, structural_hash
+
+def test_structural_hash_consistent_with_equality():
+    assert structural_hash({"a": [1, {"b": 2}], "c": 3}) == structural_hash({"c": 3, "a": [1, {"b": 2}]})
+    assert structural_hash({"a": 1}) == structural_hash({"a": 1.0})
+    assert structural_hash([1, 2]) != structural_hash((1, 2))
+
+def test_ledger_counts_by_input_state():
+    ledger = CallLedger()
+    stub = AgentMethodStub(return_value=None)
+    ledger.track("agent1", "invoke", stub)
+    stub({"messages": [{"content": "hello"}]})
+    stub({"messages": [{"content": "other"}]})
+    stub({"messages": [{"content": "hello"}]})
+    assert ledger.count("agent1", "invoke") == 3
+    assert ledger.count("agent1", "invoke", {"messages": [{"content": "hello"}]}) == 2
+    stub({"messages": [{"content": "hello"}]})
+    assert ledger.count("agent1", "invoke", {"messages": [{"content": "hello"}]}) == 3
+    assert ledger.count("agent2", "invoke", {"messages": []}) == 0
+
+def test_ledger_index_rebuilt_after_reset():
+    ledger = CallLedger()
+    stub = AgentMethodStub()
+    ledger.track("agent1", "invoke", stub)
+    stub({"n": 1})
+    assert ledger.count("agent1", "invoke", {"n": 1}) == 1
+    stub.reset_mock()
+    stub({"n": 2})
+    assert ledger.count("agent1", "invoke", {"n": 1}) == 0
+    assert ledger.count("agent1", "invoke", {"n": 2}) == 1
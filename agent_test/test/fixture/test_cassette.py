@@ -0,0 +1,114 @@
+import asyncio
+import importlib
+import os
+import uuid
+import pytest
+from agent_test.src.fixture.cassette import (
+    Cassette, CassetteMiss, CassettePlayer, CassetteWriter, load_cassette, request_key,
+)
+from agent_test.src.fixture.fixture_class import FixtureLibrary
+
+WORKERS = '''
+from langchain_core.runnables import RunnableLambda
+
+CALLS = []
+
+def _answer(name):
+    def process(state):
+        CALLS.append((name, state))
+        return {"messages": state["messages"] + [{"role": name, "content": "seen " + state["messages"][-1]["content"]}]}
+    return process
+
+agent1 = RunnableLambda(_answer("agent1"))
+agent2 = RunnableLambda(_answer("agent2"))
+'''
+
+@pytest.fixture
+def workers(tmp_path, monkeypatch):
+    name = f"cassette_workers_{uuid.uuid4().hex[:8]}"
+    (tmp_path / name).mkdir()
+    (tmp_path / name / "__init__.py").write_text("")
+    (tmp_path / name / "agents.py").write_text(WORKERS)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return name, importlib.import_module(f"{name}.agents")
+
+def _orchestrator(agents):
+    def run(state):
+        state = agents.agent1.invoke(state)
+        [state] = agents.agent2.batch([state])
+        return asyncio.run(agents.agent1.ainvoke(state))
+    return run
+
+def test_request_key_is_stable():
+    assert request_key("a", "invoke", {"x": 1, "y": [1, 2]}) == request_key("a", "invoke", {"y": [1, 2], "x": 1})
+    assert request_key("a", "invoke", {"x": 1}) != request_key("a", "batch", {"x": 1})
+    assert len(request_key("a", "invoke", None)) == 32
+
+def test_record_then_replay(workers, tmp_path):
+    package, agents = workers
+    path = str(tmp_path / "agents.cassette")
+    state = {"messages": [{"role": "user", "content": "hi"}]}
+
+    recorded = FixtureLibrary(root_path=package).record_cassette(path).when_input_state(state)
+    recorded.invoke_function(_orchestrator(agents))
+    assert len(agents.CALLS) == 3
+    assert os.path.exists(path + ".idx")
+    assert len(Cassette(path)) == 3
+
+    agents.CALLS.clear()
+    replayed = FixtureLibrary(root_path=package).replay_cassette(path).when_input_state(state)
+    replayed.invoke_function(_orchestrator(agents))
+    assert agents.CALLS == []
+    assert replayed.results == recorded.results
+    replayed.expect_agent_invocation("agent1", state, "invoke", ntimes=1)
+
+def test_replay_miss_and_index_rebuild(workers, tmp_path):
+    package, agents = workers
+    path = str(tmp_path / "agents.cassette")
+    writer = CassetteWriter(path)
+    writer.record("agent1", "invoke", {"n": 1}, {"answer": "first"})
+    writer.record("agent1", "invoke", {"n": 1}, {"answer": "second"})
+    writer.close()
+    os.remove(path + ".idx")
+
+    fixture = FixtureLibrary(root_path=package).replay_cassette(path)
+    with fixture:
+        # A request recorded twice replays its responses in order, then repeats the last
+        assert [agents.agent1.invoke({"n": 1}) for _ in range(3)] == [
+            {"answer": "first"}, {"answer": "second"}, {"answer": "second"}
+        ]
+        with pytest.raises(CassetteMiss, match="2 agent1.invoke calls recorded"):
+            agents.agent1.invoke({"n": 2})
+
+def test_outdated_cassette_stays_readable_until_released(tmp_path):
+    path = str(tmp_path / "calls.cassette")
+    writer = CassetteWriter(path)
+    writer.record("agent1", "invoke", {"n": 1}, {"r": 1})
+    writer.close()
+    first = load_cassette(path)
+    assert load_cassette(path) is first
+    writer.record("agent1", "invoke", {"n": 2}, {"r": 2})
+    writer.close()
+    second = load_cassette(path)
+    assert second is not first
+    # A player holding the old copy keeps replaying from it
+    assert CassettePlayer(first).response("agent1", "invoke", {"n": 1}) == {"r": 1}
+    file = first._file
+    del first
+    assert file.closed and not second._file.closed
+
+def test_agents_and_miss_counts_come_from_the_index(tmp_path, monkeypatch):
+    path = str(tmp_path / "calls.cassette")
+    writer = CassetteWriter(path)
+    writer.record("agent1", "invoke", {"n": 1}, {"r": 1})
+    writer.record("agent1", "invoke", {"n": 2}, {"r": 2})
+    writer.record("agent2", "ainvoke", {"n": 1}, {"r": 3})
+    writer.close()
+    cassette = Cassette(path)
+
+    def no_decode(offset):
+        raise AssertionError("no record should be decoded")
+    monkeypatch.setattr(cassette, "record_at", no_decode)
+    assert cassette.agents() == {"agent1": {"invoke"}, "agent2": {"ainvoke"}}
+    assert cassette.count("agent1", "invoke") == 2
+    cassette.close()
@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from agent_test.src.agent_utils.models.api_mock_type import APIMockType
+from agent_test.src.fixture.concurrent_runner import ainvoke_concurrently, invoke_threaded, run_concurrently
+from agent_test.src.fixture.fixture_class import FixtureLibrary
+from agent_test.src.fixture.patch_session import PatchSession
+from examples.langgraph.simple_graph.asynchronous import orchestrator_code
+from examples.langgraph.simple_graph.asynchronous.orchestrator_code import builder, build_orchestrator_graph
+
+ROOT_PATH = "examples.langgraph.simple_graph.asynchronous"
+
+def _scenario(session, content):
+    return (
+        FixtureLibrary(root_path=ROOT_PATH, patch_session=session)
+        .mock_api_call("httpx.post", {"url": "http://127.0.0.1:8004/api1/getdata1"}, {"content": "hello"}, APIMockType.HTTPX)
+        .when_input_state({"messages": [{"role": "user", "content": "hello"}]})
+        .mock_agent_response("agent1", {"messages": [{"role": "agent1", "content": content}]})
+        .mock_agent_response("agent2", {"messages": [{"role": "agent2", "content": f"{content}-2"}]})
+        .mock_agent_response("agent3", {"messages": [{"role": "agent3", "content": "response3"}]})
+    )
+
+def test_concurrent_scenarios_are_isolated_per_task():
+    session = PatchSession()
+    try:
+        fixtures = [_scenario(session, f"response{i}") for i in range(8)]
+        outcomes = run_concurrently(fixtures, build_orchestrator_graph(builder), max_concurrency=4)
+        for i, (fixture, outcome) in enumerate(zip(fixtures, outcomes)):
+            assert outcome is fixture
+            fixture.expect_agent_invocation(
+                "agent2", {"messages": [{"role": "agent1", "content": f"response{i}"}]}, "ainvoke", ntimes=1
+            )
+            fixture.expect_agent_invocation(
+                "agent3", {"messages": [{"role": "agent2", "content": f"response{i}-2"}]}, "batch", ntimes=1
+            )
+    finally:
+        session.close()
+
+def test_concurrency_is_bounded_and_overlapping():
+    session = PatchSession()
+    in_flight = []
+    peak = []
+
+    async def orchestrator(state):
+        in_flight.append(state)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.05)
+        result = await orchestrator_code.agent2.ainvoke(state)
+        in_flight.remove(state)
+        return result
+
+    try:
+        fixtures = [
+            FixtureLibrary(root_path=ROOT_PATH, patch_session=session)
+            .when_input_state({"n": i})
+            .mock_agent_response("agent2", {"n": i})
+            for i in range(6)
+        ]
+        outcomes = run_concurrently(fixtures, orchestrator, max_concurrency=3)
+        assert max(peak) == 3
+        assert [fixture.results for fixture in outcomes] == [[{"n": i}] for i in range(6)]
+    finally:
+        session.close()
+
+def test_concurrent_scenarios_require_a_shared_session():
+    with pytest.raises(ValueError):
+        asyncio.run(ainvoke_concurrently([FixtureLibrary(root_path=ROOT_PATH)], build_orchestrator_graph(builder)))
+
+def test_threaded_scenarios_are_isolated_per_thread():
+    from examples.langgraph.simple_graph.synchronous.orchestrator_code import orchestrator_graph
+    session = PatchSession()
+    try:
+        fixtures = [
+            FixtureLibrary(root_path="examples.langgraph.simple_graph.synchronous", patch_session=session)
+            .mock_api_call("httpx.post", {"url": "http://127.0.0.1:8004/api1/getdata1"}, {"content": "hello"}, APIMockType.HTTPX)
+            .when_input_state({"messages": [{"role": "user", "content": "hello"}]})
+            .mock_agent_response("agent1", {"messages": [{"role": "agent1", "content": f"response{i}"}]})
+            .mock_agent_response("agent2", {"messages": [{"role": "agent2", "content": "response2"}]})
+            .mock_agent_response("agent3", {"messages": [{"role": "agent3", "content": "response3"}]})
+            for i in range(8)
+        ]
+        outcomes = invoke_threaded(fixtures, orchestrator_graph, max_workers=4)
+        for i, (fixture, outcome) in enumerate(zip(fixtures, outcomes)):
+            assert outcome is fixture
+            fixture.expect_agent_invocation(
+                "agent2", {"messages": [{"role": "agent1", "content": f"response{i}"}]}, "invoke", ntimes=1
+            )
+        assert session.get_mock("examples.langgraph.simple_graph.synchronous.orchestrator_code.agent1.invoke").call_count == 0
+    finally:
+        session.close()
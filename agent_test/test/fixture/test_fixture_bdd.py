@@ -0,0 +1,39 @@
+import ast
+from types import SimpleNamespace
+from pytest_bdd.scenario import scenario_wrapper_template_registry
+from agent_test.src.fixture import fixture_bdd
+from agent_test.src.fixture.data_loader import scenario_compiler
+from agent_test.src.fixture.data_loader.scenario_compiler import ScenarioCompiler, literal
+
+FEATURE = (
+    "Feature: Chain\n"
+    "  Scenario: hello\n"
+    "    Given agent agent1 will respond with '{\"messages\": [{\"role\": \"agent1\"}]}'\n"
+    "    When the user sends '{\"messages\": []}' and invokes the run orchestrator\n"
+)
+
+def test_feature_file_of_a_bdd_scenario():
+    def scenario_wrapper():
+        pass
+    scenario_wrapper_template_registry[scenario_wrapper] = SimpleNamespace(feature=SimpleNamespace(filename="a.feature"))
+    assert fixture_bdd.feature_file(SimpleNamespace(node=SimpleNamespace(function=scenario_wrapper))) == "a.feature"
+    assert fixture_bdd.feature_file(SimpleNamespace(node=SimpleNamespace())) is None
+
+def test_warm_process_never_evaluates_step_literals(tmp_path, monkeypatch):
+    path = tmp_path / "chain.feature"
+    path.write_text(FEATURE)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(scenario_compiler, "_literals", {})
+    monkeypatch.setattr(fixture_bdd, "_primed_features", set())
+    fixture_bdd.prime_feature_literals(str(path))
+    # A fresh process: nothing parsed yet, only the compiled cache on disk
+    monkeypatch.setattr(scenario_compiler, "_literals", {})
+    monkeypatch.setattr(fixture_bdd, "_primed_features", set())
+
+    def no_eval(text):
+        raise AssertionError(f"ast.literal_eval called for {text!r}")
+    monkeypatch.setattr(ast, "literal_eval", no_eval)
+    fixture_bdd.prime_feature_literals(str(path))
+    assert literal('{"messages": [{"role": "agent1"}]}') == {"messages": [{"role": "agent1"}]}
+    assert literal('{"messages": []}') == {"messages": []}
+    assert ScenarioCompiler().load(str(path)).scenarios[0][0] == "hello"
@@ -12,3 +12,77 @@ def test_when_input_state_sets_state():
     fixture = FixtureLibrary(root_path="orchestrator")
     fixture.when_input_state({"foo": "bar"})
     assert fixture._input_state == {"foo": "bar"}
+
+def test_fixturelibrary_borrows_shared_discovery():
+    first = FixtureLibrary(root_path="examples.langgraph.prompt_agentic.synchronous")
+    second = FixtureLibrary(root_path="examples.langgraph.prompt_agentic.synchronous")
+    assert first.discovery is second.discovery
+    assert "agent1" in first.agent_info_dict
+
+def test_fixturelibrary_session_mode_reuses_patches():
+    from agent_test.src.agent_utils.models.api_mock_type import APIMockType
+    from agent_test.src.fixture.patch_session import PatchSession
+    from examples.langgraph.simple_graph.synchronous.orchestrator_code import orchestrator_graph
+    session = PatchSession()
+    try:
+        for content in ["response1", "responseA"]:
+            fixture = (
+                FixtureLibrary(root_path="examples.langgraph.simple_graph.synchronous", patch_session=session)
+                .mock_api_call("httpx.post", {"url": "http://127.0.0.1:8004/api1/getdata1"}, {"content": "hello"}, APIMockType.HTTPX)
+                .when_input_state({"messages": [{"role": "user", "content": "hello"}]})
+                .mock_agent_response("agent1", {"messages": [{"role": "agent1", "content": content}]})
+                .mock_agent_response("agent2", {"messages": [{"role": "agent2", "content": "response2"}]})
+                .mock_agent_response("agent3", {"messages": [{"role": "agent3", "content": "response3"}]})
+                .invoke_graph(orchestrator_graph)
+            )
+            fixture.expect_agent_invocation("agent2", {"messages": [{"role": "agent1", "content": content}]}, "invoke", ntimes=1)
+    finally:
+        session.close()
+
+def test_mock_api_call_shares_one_patch_per_api_path():
+    import httpx
+    from agent_test.src.agent_utils.models.api_mock_type import APIMockType
+    fixture = (
+        FixtureLibrary(root_path="orchestrator")
+        .mock_api_call("httpx.post", {"url": "http://api/a"}, {"content": "a"}, APIMockType.HTTPX)
+        .mock_api_call("httpx.post", {"url": "http://api/b"}, {"content": "b"}, APIMockType.HTTPX)
+    )
+    assert len(fixture._patchers) == 1
+    with fixture:
+        assert httpx.post("http://api/a").json() == {"content": "a"}
+        assert httpx.post("http://api/b").json() == {"content": "b"}
+    assert fixture.was_api_patch_called("httpx.post")
+
+def test_instrumented_fixture_records_scenario_timeline():
+    from agent_test.src.agent_utils.models.api_mock_type import APIMockType
+    from examples.langgraph.simple_graph.synchronous.orchestrator_code import orchestrator_graph
+    fixture = (
+        FixtureLibrary(root_path="examples.langgraph.simple_graph.synchronous", instrument=True)
+        .mock_api_call("httpx.post", {"url": "http://127.0.0.1:8004/api1/getdata1"}, {"content": "hello"}, APIMockType.HTTPX)
+        .when_input_state({"messages": [{"role": "user", "content": "hello"}]})
+        .mock_agent_response("agent1", {"messages": [{"role": "agent1", "content": "response1"}]})
+        .mock_agent_response("agent2", {"messages": [{"role": "agent2", "content": "response2"}]})
+        .mock_agent_response("agent3", {"messages": [{"role": "agent3", "content": "response3"}]})
+        .invoke_graph(orchestrator_graph)
+    )
+    timeline = fixture.timeline
+    assert {event.kind for event in timeline.events()} == {
+        "discovery", "patch_start", "patch_stop", "agent_call", "api_call", "invoke"
+    }
+    assert set(timeline.histograms("agent_call")) == {
+        ("agent_call", "agent1.invoke"), ("agent_call", "agent2.invoke"), ("agent_call", "agent3.batch")
+    }
+    assert 0 < timeline.orchestrator_overhead() < timeline.total("invoke")
+    # The invoke span lies inside the patched window
+    (invoke,) = timeline.events("invoke")
+    assert timeline.events("patch_start")[0].end <= invoke.start
+    assert invoke.end <= timeline.events("patch_stop")[0].start
+    assert FixtureLibrary(root_path="examples.langgraph.simple_graph.synchronous").timeline is None
+
+def test_failed_invoke_is_recorded_on_the_timeline():
+    def failing(state):
+        raise RuntimeError("boom")
+    fixture = FixtureLibrary(root_path="examples.langgraph.simple_graph.synchronous", instrument=True)
+    with pytest.raises(RuntimeError, match="boom"):
+        fixture.invoke_function(failing)
+    assert [event.name for event in fixture.timeline.events("invoke")] == [failing.__qualname__]
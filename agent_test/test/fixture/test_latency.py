@@ -0,0 +1,88 @@
+import asyncio
+import time
+import pytest
+from agent_test.src.agent_utils.models.api_mock_type import APIMockType
+from agent_test.src.fixture.fixture_class import FixtureLibrary
+from agent_test.src.fixture.latency import (
+    EmpiricalLatency, FixedLatency, LogNormalLatency, NormalLatency, VirtualClock, as_latency_model,
+)
+from agent_test.src.fixture.mock_api.aiohttp_mock import AiohttpAPIMock
+from agent_test.src.fixture.mock_api.route_table import RouteTable
+from examples.langgraph.simple_graph.asynchronous import orchestrator_code
+
+ROOT_PATH = "examples.langgraph.simple_graph.asynchronous"
+
+def test_models_are_seeded_and_non_negative():
+    assert NormalLatency(0.1, 0.05, seed=1).sample() == NormalLatency(0.1, 0.05, seed=1).sample()
+    assert all(NormalLatency(0.0, 1.0, seed=2).sample() >= 0 for _ in range(100))
+    model = LogNormalLatency(0.2, 0.5, seed=3)
+    samples = sorted(model.sample() for _ in range(1001))
+    assert samples[500] == pytest.approx(0.2, rel=0.15)
+    assert as_latency_model(0.5).sample() == 0.5
+    assert as_latency_model(None) is None
+    with pytest.raises(TypeError):
+        as_latency_model("fast")
+
+def test_empirical_latency_from_file(tmp_path):
+    path = tmp_path / "latencies.txt"
+    path.write_text("# ms\n120\n\n80  # slow day\n")
+    model = EmpiricalLatency.from_file(str(path), scale=0.001, seed=0)
+    assert {model.sample() for _ in range(50)} == {0.12, 0.08}
+    (tmp_path / "latencies.json").write_text("[0.5]")
+    assert EmpiricalLatency.from_file(str(tmp_path / "latencies.json")).sample() == 0.5
+    with pytest.raises(ValueError):
+        EmpiricalLatency([])
+
+def test_virtual_clock_overlaps_concurrent_ainvoke_calls():
+    clock = VirtualClock()
+    fixture = (
+        FixtureLibrary(root_path=ROOT_PATH, clock=clock)
+        .mock_agent_response("agent2", {"messages": []}, latency=FixedLatency(2.0))
+    )
+
+    async def fan_out(state):
+        return await asyncio.gather(*(orchestrator_code.agent2.ainvoke(state) for _ in range(10)))
+
+    start = time.perf_counter()
+    clock.run(fixture.when_input_state({"messages": []}).ainvoke_function(fan_out))
+    assert time.perf_counter() - start < 1
+    # Ten 2s calls in parallel take 2s of simulated time: parallelism 10
+    assert clock.now() == pytest.approx(2.0)
+    assert clock.slept / clock.now() == pytest.approx(10.0)
+    fixture.expect_agent_invocation("agent2", {"messages": []}, "ainvoke", ntimes=10)
+
+def test_sync_mocks_advance_the_virtual_clock_in_sequence():
+    clock = VirtualClock()
+    fixture = (
+        FixtureLibrary(root_path=ROOT_PATH, clock=clock)
+        .mock_agent_response("agent1", {"messages": []}, latency=0.25)
+        .mock_api_call("httpx.post", {"url": "http://api/x"}, {"ok": True}, APIMockType.HTTPX, latency=1.0)
+    )
+
+    def orchestrator(state):
+        orchestrator_code.agent1.invoke(state)
+        orchestrator_code.agent1.batch(state)
+        return orchestrator_code.httpx.post("http://api/x").json()
+
+    fixture.when_input_state({}).invoke_function(orchestrator)
+    assert fixture.results == [{"ok": True}]
+    assert clock.now() == pytest.approx(1.5)
+
+def test_async_api_mock_awaits_its_latency():
+    clock = VirtualClock()
+    table = RouteTable("aiohttp.ClientSession.get", AiohttpAPIMock())
+    table.clock = clock
+    table.add({"url": "http://api/slow"}, {"body": 1}, FixedLatency(3.0))
+    table.add({"url": "http://api/fast"}, {"body": 2})
+
+    async def calls():
+        return await asyncio.gather(table.aresolve(("http://api/slow",), {}), table.aresolve(("http://api/fast",), {}))
+
+    assert clock.run(calls()) == [{"body": 1}, {"body": 2}]
+    assert clock.now() == pytest.approx(3.0)
+
+def test_real_clock_sleeps():
+    fixture = FixtureLibrary(root_path=ROOT_PATH).mock_agent_response("agent2", {"n": 1}, latency=0.05)
+    start = time.perf_counter()
+    asyncio.run(fixture.when_input_state({}).ainvoke_function(lambda state: orchestrator_code.agent2.ainvoke(state)))
+    assert time.perf_counter() - start >= 0.05
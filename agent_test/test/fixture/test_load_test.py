@@ -0,0 +1,90 @@
+import asyncio
+import time
+from agent_test.src.agent_utils.models.api_mock_type import APIMockType
+from agent_test.src.fixture.fixture_class import FixtureLibrary
+from agent_test.src.fixture.load_test import input_stream
+from agent_test.src.fixture.patch_session import PatchSession
+from examples.langgraph.simple_graph.asynchronous import orchestrator_code as async_code
+from examples.langgraph.simple_graph.synchronous import orchestrator_code as sync_code
+
+def _sync_scenario(**options):
+    return (
+        FixtureLibrary(root_path="examples.langgraph.simple_graph.synchronous", **options)
+        .mock_api_call("examples.langgraph.simple_graph.synchronous.orchestrator_code.httpx.post", {"url": "http://127.0.0.1:8004/api1/getdata1", "params": {"input": "hello"}},
+                       {"content": "hello"}, APIMockType.HTTPX)
+        .when_input_state({"messages": [{"role": "user", "content": "hello"}]})
+        .mock_agent_response("agent1", {"messages": [{"role": "agent1", "content": "response1"}]})
+        .mock_agent_response("agent2", {"messages": [{"role": "agent2", "content": "response2"}]})
+        .mock_agent_response("agent3", {"messages": [{"role": "agent3", "content": "response3"}]})
+    )
+
+def test_input_stream_sources():
+    assert list(input_stream(None, {"a": 1}, 3, None)) == [{"a": 1}] * 3
+    assert list(input_stream(lambda i: {"n": i}, None, 3, None)) == [{"n": 0}, {"n": 1}, {"n": 2}]
+    assert list(input_stream([{"x": 1}, {"x": 2}], None, 5, None)) == [{"x": 1}, {"x": 2}]
+    assert len(list(input_stream(None, {}, None, None))) == 1000
+
+def test_closed_loop_load_test_on_graph():
+    graph = sync_code.build_orchestrator_graph(sync_code.builder)
+    fixture = _sync_scenario()
+    report = fixture.load_test(graph, requests=40, concurrency=4, record=True)
+    assert report.completed == 40 and not report.errors
+    assert report.throughput > 0
+    assert 0 < report.percentile(50) <= report.percentile(95) <= report.percentile(99)
+    assert set(report.to_dict()) >= {"throughput", "p50", "p95", "p99"}
+    # The mocks stay configured: every request reached agent1
+    fixture.expect_agent_invocation(
+        "agent1", {"messages": [{"role": "user", "content": "hello"}, {"content": "hello"}]}, "invoke", ntimes=40
+    )
+
+def test_load_test_does_not_record_calls_by_default():
+    graph = sync_code.build_orchestrator_graph(sync_code.builder)
+    fixture = _sync_scenario(instrument=True)
+    report = fixture.load_test(graph, requests=20)
+    assert report.completed == 20
+    assert fixture._ledger.count("agent1", "invoke") == 0
+    assert not fixture.timeline.events("agent_call")
+    # Recording is back on for the scenarios that follow
+    fixture.invoke_graph(graph)
+    assert fixture._ledger.count("agent1", "invoke") == 1
+
+def test_open_loop_load_test_counts_queueing_and_errors():
+    calls = []
+
+    def orchestrator(state):
+        calls.append(state)
+        if state["n"] == 3:
+            raise RuntimeError("boom")
+        time.sleep(0.01)
+        return sync_code.agent1.invoke(state)
+
+    fixture = _sync_scenario()
+    report = fixture.load_test(orchestrator, inputs=lambda i: {"n": i}, requests=10, rate=200, concurrency=1)
+    assert report.requests == 10 and report.completed == 9
+    assert [repr(error) for error in report.errors] == [repr(RuntimeError("boom"))]
+    # One worker at 200 req/s cannot keep up with 10ms requests, so latency grows with the backlog
+    assert report.latency.summary()["max"] > 0.03
+    assert "req/s" in report.summary()
+
+def test_async_load_test_in_session_mode():
+    session = PatchSession()
+    try:
+        fixture = (
+            FixtureLibrary(root_path="examples.langgraph.simple_graph.asynchronous", patch_session=session)
+            .mock_agent_response("agent2", {"messages": [{"role": "agent2", "content": "response2"}]})
+        )
+
+        async def orchestrator(state):
+            await asyncio.sleep(0)
+            return await async_code.agent2.ainvoke(state)
+
+        report = asyncio.run(fixture.aload_test(orchestrator, inputs=lambda i: {"n": i}, requests=30, concurrency=5,
+                                                    record=True))
+        assert report.completed == 30 and not report.errors
+        fixture.expect_agent_invocation("agent2", {"n": 29}, "ainvoke", ntimes=1)
+    finally:
+        session.close()
+
+def test_duration_bounds_an_open_stream():
+    report = _sync_scenario().load_test(lambda state: state, duration=0.05)
+    assert report.completed > 0 and report.wall_time < 1
@@ -0,0 +1,110 @@
+import asyncio
+import re
+import openai
+import pytest
+from langchain_core.messages import HumanMessage
+from langchain_openai import ChatOpenAI
+from agent_test.src.fixture.fixture_class import FixtureLibrary
+from agent_test.src.fixture.mock_llm import LLMReply, LLMScriptError, RuleScript, StateMachineScript
+from agent_test.src.fixture.patch_session import PatchSession
+
+ROOT_PATH = "examples.langgraph.simple_graph.asynchronous"
+
+def _ask(prompt):
+    client = openai.OpenAI(api_key="sk-test")
+    response = client.chat.completions.create(model="gpt-4.1-nano", messages=[{"role": "user", "content": prompt}])
+    return response.choices[0].message
+
+def test_rule_table_routes_from_the_prompt():
+    routing = {
+        re.compile(r"'agent': 'a2'"): {"next_agent": "end"},
+        "'agent': 'a1'": {"next_agent": "a2"},
+        lambda prompt: "History: []" in prompt: {"next_agent": "a1"},
+    }
+    fixture = FixtureLibrary(root_path=ROOT_PATH).mock_llm_response(routing)
+    with fixture:
+        assert _ask("History: []").content == '{"next_agent": "a1"}'
+        assert _ask("History: [{'agent': 'a1'}]").content == '{"next_agent": "a2"}'
+        assert _ask("History: [{'agent': 'a1'}, {'agent': 'a2'}]").content == '{"next_agent": "end"}'
+        with pytest.raises(LLMScriptError, match="No scripted LLM rule matches the prompt: unrelated"):
+            _ask("unrelated")
+    fixture.expect_llm_calls(4)
+
+def test_sequence_emits_tool_calls_to_chat_openai():
+    fixture = FixtureLibrary(root_path=ROOT_PATH).mock_llm_response([
+        {"tool_calls": [("lookup", {"user_id": "U1"})]},
+        LLMReply("The balance is 1000."),
+    ])
+    llm = ChatOpenAI(model="gpt-5", openai_api_key="sk-test").bind_tools([])
+    with fixture:
+        first = llm.invoke([HumanMessage(content="What is the balance?")])
+        assert [(call["name"], call["args"]) for call in first.tool_calls] == [("lookup", {"user_id": "U1"})]
+        assert asyncio.run(llm.ainvoke("and now?")).content == "The balance is 1000."
+        with pytest.raises(LLMScriptError, match="called 3 times but only 2 replies"):
+            llm.invoke("once more")
+    assert fixture.llm.prompts[:2] == ["What is the balance?", "and now?"]
+
+def test_state_machine_follows_transitions():
+    script = StateMachineScript({
+        "start": [("hello", "hi", "greeted")],
+        "greeted": [("bye", "goodbye", "done"), ("", "still here", None)],
+    }, initial="start")
+    assert [script.respond(prompt).content for prompt in ["hello", "what?", "bye"]] == ["hi", "still here", "goodbye"]
+    assert script.state == "done"
+    with pytest.raises(LLMScriptError, match="from state 'done'"):
+        script.respond("hello")
+
+def test_openai_tool_calls_and_callable_replies():
+    fixture = FixtureLibrary(root_path=ROOT_PATH).mock_llm_response(
+        RuleScript([("weather", lambda prompt: {"tool_calls": [{"name": "forecast", "args": {"q": prompt}}]})],
+                   default="no idea")
+    )
+    with fixture:
+        message = _ask("weather in Paris")
+        assert message.tool_calls[0].function.name == "forecast"
+        assert message.tool_calls[0].function.arguments == '{"q": "weather in Paris"}'
+        assert _ask("anything").content == "no idea"
+
+def test_drives_the_prompt_agentic_orchestrator(monkeypatch):
+    from examples.langgraph.prompt_agentic.synchronous.orchestrator_code import run_llm_orchestrator
+    monkeypatch.setattr(openai, "api_key", "sk-test")
+    fixture = (
+        FixtureLibrary(root_path="examples.langgraph.prompt_agentic.synchronous")
+        .serve_in_process({"http://127.0.0.1:8004": "examples.common.api1.api_code:app"})
+        .mock_llm_response(RuleScript([
+            ("'agent': 'a2'", {"next_agent": "end"}),
+            ("'agent': 'a1'", {"next_agent": "a2"}),
+        ], default={"next_agent": "a1"}))
+        .mock_agent_response("agent1", {"messages": [{"role": "agent1", "content": "response1"}]})
+        .mock_agent_response("agent2", {"messages": [{"role": "agent2", "content": "response2"}]})
+        .when_input_state({"messages": [{"role": "user", "content": "hello"}]})
+        .invoke_function(run_llm_orchestrator)
+        .expect_agent_invocation("agent2", {"messages": [{"role": "agent1", "content": "response1"}]})
+        .expect_llm_calls(3)
+    )
+    assert list(fixture.results[0]) == ["api1", "a1", "a2"]
+
+def test_session_scenarios_answer_from_their_own_script():
+    from openai.resources.chat.completions import Completions
+    original = Completions.create
+    session = PatchSession()
+    first = FixtureLibrary(root_path=ROOT_PATH, patch_session=session).mock_llm_response(["first"])
+    second = FixtureLibrary(root_path=ROOT_PATH, patch_session=session).mock_llm_response(["second"])
+
+    async def scenario(fixture):
+        with fixture:
+            await asyncio.sleep(0)
+            response = await openai.AsyncOpenAI(api_key="sk-test").chat.completions.create(
+                model="gpt-4.1-nano", messages=[{"role": "user", "content": "hi"}])
+            return response.choices[0].message.content
+
+    async def both():
+        return await asyncio.gather(scenario(first), scenario(second))
+    try:
+        assert asyncio.run(both()) == ["first", "second"]
+        assert Completions.create is not original
+    finally:
+        session.close()
+    assert Completions.create is original
+    first.expect_llm_calls(1)
+    second.expect_llm_calls(1)
@@ -0,0 +1,57 @@
+import asyncio
+from agent_test.src.fixture.patch_session import PatchSession
+
+class DummyAgent:
+    def invoke(self, state):
+        return "original"
+
+    async def ainvoke(self, state):
+        return "original"
+
+dummy_agent = DummyAgent()
+
+def test_patch_session_swaps_responses_without_repatching():
+    session = PatchSession()
+    patch_path = session.ensure_patched(f"{__name__}.dummy_agent", "invoke")
+    mock = session.get_mock(patch_path)
+    try:
+        session.begin_scenario({patch_path: "first"})
+        assert dummy_agent.invoke({"n": 1}) == "first"
+        scope = session.begin_scenario({patch_path: "second"})
+        assert session.ensure_patched(f"{__name__}.dummy_agent", "invoke") == patch_path
+        assert dummy_agent.invoke({"n": 2}) == "second"
+        assert scope.stubs[patch_path].call_count == 1
+        session.end_scenario()
+        assert dummy_agent.invoke({"n": 3}) == "original"
+        assert session.get_mock(patch_path) is mock
+        assert mock.call_count == 1
+    finally:
+        session.close()
+    assert dummy_agent.invoke({}) == "original"
+
+def test_patch_session_falls_through_without_response():
+    session = PatchSession()
+    patch_path = session.ensure_patched(f"{__name__}.dummy_agent", "ainvoke")
+    try:
+        session.begin_scenario({})
+        assert asyncio.run(dummy_agent.ainvoke({})) == "original"
+        session.begin_scenario({patch_path: "mocked"})
+        assert asyncio.run(dummy_agent.ainvoke({})) == "mocked"
+    finally:
+        session.close()
+
+def test_patch_session_routes_calls_to_the_active_scope():
+    from agent_test.src.fixture.agent_stub import create_method_stub
+    from agent_test.src.fixture.patch_session import ScenarioScope
+    session = PatchSession()
+    patch_path = session.ensure_patched(f"{__name__}.dummy_agent", "invoke")
+    scope = ScenarioScope()
+    scope.stubs[patch_path] = create_method_stub("invoke", return_value="scoped")
+    try:
+        token = session.activate(scope)
+        assert dummy_agent.invoke({"n": 1}) == "scoped"
+        session.deactivate(token)
+        assert dummy_agent.invoke({"n": 2}) == "original"
+        assert scope.stubs[patch_path].call_count == 1
+    finally:
+        session.close()
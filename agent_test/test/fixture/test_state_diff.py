@@ -0,0 +1,73 @@
+from typing import Optional
+import pytest
+from pydantic import BaseModel
+from agent_test.src.fixture.fixture_class import FixtureLibrary
+from agent_test.src.fixture.state_diff import Difference, closest_call, diff_states, format_difference, mismatch_report
+from examples.langgraph.simple_graph.asynchronous import orchestrator_code
+
+ROOT_PATH = "examples.langgraph.simple_graph.asynchronous"
+
+class Account(BaseModel):
+    account_id: str
+    balance: Optional[float] = None
+
+def _history(n):
+    return [{"role": "user", "content": f"m{i}"} for i in range(n)]
+
+def test_diff_reports_minimal_paths():
+    expected = {"messages": _history(1000), "user": "U1", "accounts": [Account(account_id="A1", balance=1.0)]}
+    actual = {"messages": _history(1000), "accounts": [Account(account_id="A1", balance=2.0)], "extra": True}
+    del actual["messages"][10]
+    actual["messages"][500]["content"] = "edited"
+    actual["messages"].append({"role": "agent1"})
+
+    differences = diff_states(expected, actual)
+    # The removed message shifts every later one, but only the real changes are reported
+    assert [format_difference(difference) for difference in differences] == [
+        "state['messages'][10]: missing, expected {'content': 'm10', 'role': 'user'}",
+        "state['messages'][501]['content']: expected 'm501', got 'edited'",
+        "state['messages'][999]: unexpected {'role': 'agent1'}",
+        "state['user']: missing, expected 'U1'",
+        "state['accounts'][0].balance: expected 1.0, got 2.0",
+        "state['extra']: unexpected True",
+    ]
+    assert diff_states(expected, expected) == []
+
+def test_diff_stops_after_limit():
+    differences = diff_states(list(range(100)), [-1] * 100, limit=5)
+    assert len(differences) == 6
+    assert differences[0] == Difference((0,), "changed", 0, -1)
+
+def test_closest_call_weighs_large_branches():
+    expected = {"messages": _history(200), "user": "U1"}
+    recorded = [
+        {"messages": _history(50), "user": "U1"},
+        {"messages": _history(199), "user": "U2"},
+        {"messages": [], "user": "U1"},
+    ]
+    assert closest_call(expected, recorded) == 1
+    assert closest_call(expected, []) is None
+    assert mismatch_report(expected, recorded)[0] == "Closest recorded call (#2 of 3) differs at 2 path(s):"
+
+def test_failed_expectation_pinpoints_the_difference():
+    def orchestrator(state):
+        orchestrator_code.agent1.invoke({"messages": _history(5)})
+        return orchestrator_code.agent1.invoke(state)
+
+    state = {"messages": _history(3000)}
+    state["messages"][1234]["content"] = "typo"
+    fixture = (
+        FixtureLibrary(root_path=ROOT_PATH)
+        .mock_agent_response("agent1", {"messages": []})
+        .when_input_state(state)
+        .invoke_function(orchestrator)
+    )
+    with pytest.raises(AssertionError) as error:
+        fixture.expect_agent_invocation("agent1", {"messages": _history(3000)})
+    assert str(error.value).splitlines() == [
+        "Expected 1 calls to agent 'agent1' method 'invoke', but got 0 with the expected input state.",
+        "Closest recorded call (#2 of 2) differs at 1 path(s):",
+        "  state['messages'][1234]['content']: expected 'm1234', got 'typo'",
+    ]
+    with pytest.raises(AssertionError, match=r"but got 2$"):
+        fixture.was_agent_method_called("agent1", "invoke", expected_count=1)
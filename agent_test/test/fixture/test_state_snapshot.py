@@ -0,0 +1,64 @@
+import copy
+import pickle
+from typing import Optional
+import pytest
+from pydantic import BaseModel
+from agent_test.src.fixture.call_ledger import structural_hash
+from agent_test.src.fixture.fixture_class import FixtureLibrary
+from agent_test.src.fixture.state_snapshot import FrozenDict, FrozenList, Snapshotter, thaw
+from examples.langgraph.simple_graph.asynchronous import orchestrator_code
+
+ROOT_PATH = "examples.langgraph.simple_graph.asynchronous"
+
+class Account(BaseModel):
+    account_id: str
+    txns: Optional[list] = None
+
+def test_snapshots_share_unchanged_subtrees():
+    snapshotter = Snapshotter()
+    state = {"messages": [{"role": "user", "content": "hi"}], "accounts": [Account(account_id="A1", txns=["T1"])]}
+    first = snapshotter.snapshot(state)
+    state["messages"].append({"role": "agent1", "content": "done"})
+    state["accounts"][0].txns.append("T2")
+    second = snapshotter.snapshot(state)
+
+    assert first == {"messages": [{"role": "user", "content": "hi"}], "accounts": [Account(account_id="A1", txns=["T1"])]}
+    assert second == state
+    # The first message was not touched: both snapshots hold the same frozen copy of it
+    assert second["messages"][0] is first["messages"][0]
+    assert snapshotter.snapshot(state) is second
+
+def test_snapshots_are_read_only_but_copyable():
+    snapshot = Snapshotter().snapshot({"messages": [{"content": "hi"}], "tags": {"a"}})
+    with pytest.raises(TypeError, match="cannot be modified"):
+        snapshot["messages"].append({})
+    with pytest.raises(TypeError):
+        snapshot["messages"][0]["content"] = "changed"
+    assert isinstance(snapshot, FrozenDict) and isinstance(snapshot["messages"], FrozenList)
+    assert snapshot["tags"] == frozenset({"a"})
+    assert copy.deepcopy(snapshot) is snapshot
+    assert pickle.loads(pickle.dumps(snapshot)) == snapshot
+    thawed = thaw(snapshot)
+    thawed["messages"].append({})
+    assert type(thawed["messages"]) is list
+    assert structural_hash(snapshot) == structural_hash({"tags": {"a"}, "messages": [{"content": "hi"}]})
+
+def test_expectations_see_the_state_at_call_time():
+    def orchestrator(state):
+        orchestrator_code.agent1.invoke(state)
+        # Mutated in place after the call, as call_api1 does
+        state["messages"].append({"role": "api1", "content": "later"})
+        state["messages"][0]["content"] = "edited"
+        orchestrator_code.agent1.invoke(state)
+        return state
+
+    (
+        FixtureLibrary(root_path=ROOT_PATH)
+        .mock_agent_response("agent1", {"messages": []})
+        .when_input_state({"messages": [{"role": "user", "content": "hello"}]})
+        .invoke_function(orchestrator)
+        .expect_agent_invocation("agent1", {"messages": [{"role": "user", "content": "hello"}]})
+        .expect_agent_invocation(
+            "agent1", {"messages": [{"role": "user", "content": "edited"}, {"role": "api1", "content": "later"}]}
+        )
+    )